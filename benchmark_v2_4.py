@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 V2.4 热路径微基准测试
+覆盖每个请求都会经过的组件：会话查询、认证中间件的公开路径判断、测试模式文本审核（1KB-1MB）、
+PublishRequest/PublishResponse 校验和响应序列化
+
+结果保存到基准文件，之后每次运行与其对比，超过阈值即判定为性能回退（退出码1）
+
+用法:
+    python benchmark_v2_4.py --save-baseline      # 记录当前结果为基准
+    python benchmark_v2_4.py                      # 与基准对比
+    python benchmark_v2_4.py --filter text_audit --threshold 0.3
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import logging
+import asyncio
+import argparse
+import platform
+import statistics
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from wp_publisher.auth import SESSIONS, SessionManager, is_public_path
+from wp_publisher.clients import BaiduAIClient
+from wp_publisher.models import PublishRequest, PublishResponse, UserRole
+from wp_publisher.settings import get_settings
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline_v2_4.json")
+
+# 每组测量的目标时长（秒）和重复次数
+TARGET_SECONDS = 0.2
+REPEAT = 5
+
+TEXT_SIZES = {"1KB": 1024, "10KB": 10 * 1024, "100KB": 100 * 1024, "1MB": 1024 * 1024}
+
+
+class Benchmark:
+    """单个基准：sync 函数或返回协程的函数，每次调用计为一次操作"""
+
+    def __init__(self, name: str, func: Callable[[], Any], is_async: bool = False):
+        self.name = name
+        self.func = func
+        self.is_async = is_async
+
+    def _run_loops(self, loops: int, loop: asyncio.AbstractEventLoop) -> float:
+        """执行 loops 次，返回总耗时（秒）"""
+        func = self.func
+        if self.is_async:
+            async def batch():
+                start = time.perf_counter()
+                for _ in range(loops):
+                    await func()
+                return time.perf_counter() - start
+            return loop.run_until_complete(batch())
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        return time.perf_counter() - start
+
+    def measure(self, loop: asyncio.AbstractEventLoop) -> Dict[str, Any]:
+        """自动确定循环次数（类似 timeit.autorange），重复测量取中位数和最小值"""
+        loops = 1
+        while True:
+            elapsed = self._run_loops(loops, loop)
+            if elapsed >= TARGET_SECONDS / 10 or loops >= 10 ** 7:
+                break
+            loops *= 10
+        loops = max(1, int(loops * TARGET_SECONDS / max(elapsed, 1e-9)))
+
+        per_op = []
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(REPEAT):
+                per_op.append(self._run_loops(loops, loop) / loops)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return {
+            "loops": loops,
+            "median_us": round(statistics.median(per_op) * 1e6, 3),
+            "min_us": round(min(per_op) * 1e6, 3),
+            "stdev_us": round(statistics.pstdev(per_op) * 1e6, 3),
+        }
+
+
+def make_text(size: int) -> str:
+    """生成指定字节数（UTF-8）的中文HTML文本，末尾不含敏感词，走完整扫描路径"""
+    paragraph = "<p>这是一段用于基准测试的正文内容，包含常见的中文标点和HTML标签。</p>"
+    unit = len(paragraph.encode("utf-8"))
+    return paragraph * max(1, size // unit)
+
+
+def build_benchmarks() -> List[Benchmark]:
+    """构建全部基准"""
+    benchmarks: List[Benchmark] = []
+
+    # 会话查询：命中、未命中
+    SESSIONS.clear()
+    for i in range(1000):
+        SessionManager.create_session(f"user{i}", UserRole.OUTSOURCE)
+    session_id = SessionManager.create_session("admin", UserRole.ADMIN)
+    benchmarks.append(Benchmark("session.get_hit", lambda: SessionManager.get_session(session_id)))
+    benchmarks.append(Benchmark("session.get_miss", lambda: SessionManager.get_session("missing-session-id")))
+
+    # 认证中间件的公开路径判断：公开路径和需要登录的路径各一半
+    paths = ["/static/js/app_v2_4.js", "/health", "/publish", "/api/publish/history", "/", "/api/stats/monthly"]
+
+    def check_paths():
+        for path in paths:
+            is_public_path(path)
+    benchmarks.append(Benchmark("auth.public_path_check_x6", check_paths))
+
+    # 测试模式文本审核
+    client = BaiduAIClient(replace(get_settings(), test_mode=True, enable_ai_check=True))
+    for label, size in TEXT_SIZES.items():
+        text = make_text(size)
+        benchmarks.append(Benchmark(f"text_audit.test_mode_{label}", lambda text=text: client.text_audit(text),
+                                    is_async=True))
+
+    # 请求/响应模型
+    request_body = {
+        "title": "基准测试文章标题",
+        "content": make_text(4 * 1024),
+        "publish_type": "normal",
+        "sites": ["default"],
+    }
+    benchmarks.append(Benchmark("pydantic.publish_request_validate",
+                                lambda: PublishRequest.model_validate(request_body)))
+
+    response_body = {
+        "status": "success",
+        "message": "文章发布成功",
+        "post_id": 12345,
+        "audit_result": {"conclusionType": 1, "message": "测试模式：内容审核通过"},
+        "site_results": {"default": {"status": "success", "post_id": 12345, "elapsed_ms": 123.4}},
+    }
+    benchmarks.append(Benchmark("pydantic.publish_response_validate",
+                                lambda: PublishResponse.model_validate(response_body)))
+
+    response = PublishResponse.model_validate(response_body)
+    # FastAPI 对 response_model 路由的处理：jsonable_encoder 后由响应类渲染（路由默认使用 ORJSONResponse）
+    benchmarks.append(Benchmark("serialize.publish_response_jsonresponse",
+                                lambda: JSONResponse(content=jsonable_encoder(response))))
+    benchmarks.append(Benchmark("serialize.publish_response_orjsonresponse",
+                                lambda: ORJSONResponse(content=jsonable_encoder(response))))
+    benchmarks.append(Benchmark("serialize.publish_response_model_dump_json",
+                                lambda: response.model_dump_json()))
+
+    return benchmarks
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> bool:
+    """打印对比表格，返回是否全部在阈值内"""
+    base_results = baseline.get("results", {})
+    print(f"\n📊 与基准对比（基准时间: {baseline.get('created_at', '未知')}，阈值 +{threshold:.0%}）")
+    print("=" * 92)
+    print(f"{'基准项':<46}{'基准(µs)':>12}{'当前(µs)':>12}{'变化':>10}  结果")
+    print("-" * 92)
+    ok = True
+    for name, result in results.items():
+        base = base_results.get(name)
+        if base is None:
+            print(f"{name:<46}{'-':>12}{result['median_us']:>12}{'-':>10}  🆕 新增")
+            continue
+        change = result["median_us"] / base["median_us"] - 1 if base["median_us"] else 0.0
+        if change > threshold:
+            status = "❌ 回退"
+            ok = False
+        elif change < -threshold:
+            status = "🚀 提升"
+        else:
+            status = "✅"
+        print(f"{name:<46}{base['median_us']:>12}{result['median_us']:>12}{change:>+10.1%}  {status}")
+    print("=" * 92)
+    return ok
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="WordPress发布系统V2.4热路径微基准测试")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="基准文件路径")
+    parser.add_argument("--save-baseline", action="store_true", help="将本次结果保存为基准")
+    parser.add_argument("--threshold", type=float, default=0.2, help="中位数变慢超过该比例判定为回退（默认0.2）")
+    parser.add_argument("--filter", help="只运行名称包含该字符串的基准")
+    args = parser.parse_args()
+
+    print("⏱️ WordPress 软文发布中间件 V2.4 微基准测试")
+    print(f"🐍 Python {platform.python_version()} / {platform.machine()}")
+    print("=" * 92)
+
+    # 基准测试期间不输出业务日志
+    logging.disable(logging.CRITICAL)
+
+    loop = asyncio.new_event_loop()
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        for benchmark in build_benchmarks():
+            if args.filter and args.filter not in benchmark.name:
+                continue
+            result = benchmark.measure(loop)
+            results[benchmark.name] = result
+            print(f"{benchmark.name:<46}{result['median_us']:>12} µs/op  (min {result['min_us']}, "
+                  f"±{result['stdev_us']}, {result['loops']} 次/组)")
+    finally:
+        loop.close()
+        SESSIONS.clear()
+
+    if args.save_baseline:
+        baseline = load_baseline(args.baseline) or {}
+        merged = {**baseline.get("results", {}), **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "created_at": datetime.now().isoformat(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": merged,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 基准已保存: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"\n⚠️ 未找到基准文件 {args.baseline}，请先运行 --save-baseline")
+        return 0
+    if not compare(results, baseline, args.threshold):
+        print("\n❌ 检测到性能回退")
+        return 1
+    print("\n✅ 未发现性能回退")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
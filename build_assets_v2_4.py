@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 V2.4 静态资源构建
+压缩 static/ 下的 JS 和 CSS，按内容哈希命名写入 static/dist/，同时生成 .gz 和 .br 预压缩文件，
+最后写入清单 static/dist/manifest.json，模板通过 asset_url() 引用带哈希的文件名
+
+用法:
+    python build_assets_v2_4.py            # 部署前运行，之后重启（或 HUP 重载）服务
+    python build_assets_v2_4.py --no-minify
+
+上一次构建的文件会保留一轮，重载期间仍在使用旧页面的浏览器不会 404
+压缩依赖 rjsmin / rcssmin / brotli，未安装时跳过对应步骤（CSS 使用内置的简单压缩）
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from wp_publisher.assets import DIST_DIR, MANIFEST_NAME, ENCODINGS
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+
+# 文件名中内容哈希的长度
+HASH_LENGTH = 10
+
+
+def minify_css_basic(css: str) -> str:
+    """未安装 rcssmin 时的保守压缩：去注释、合并空白、去掉括号和分隔符两侧的空格"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def get_minifiers(enabled: bool) -> Dict[str, Optional[Callable[[str], str]]]:
+    """文件后缀 → 压缩函数（None 表示原样输出）"""
+    if not enabled:
+        return {".js": None, ".css": None}
+    return {
+        ".js": (lambda s: rjsmin.jsmin(s, keep_bang_comments=True)) if rjsmin else None,
+        ".css": (lambda s: rcssmin.cssmin(s, keep_bang_comments=True)) if rcssmin else minify_css_basic,
+    }
+
+
+def compress(data: bytes, encoding: str) -> Optional[bytes]:
+    """生成预压缩内容；缺少依赖时返回 None"""
+    if encoding == "gzip":
+        # 固定 mtime，相同内容每次构建得到相同的文件
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=11, mode=brotli.MODE_TEXT)
+    return None
+
+
+def write_file(path: Path, data: bytes):
+    """先写临时文件再替换，运行中的服务不会读到写了一半的文件"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def read_manifest(dist_dir: Path) -> Dict[str, str]:
+    """读取上一次构建的清单"""
+    try:
+        with open(dist_dir / MANIFEST_NAME, "r", encoding="utf-8") as f:
+            return json.load(f)["files"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def build(static_dir: Path, minify: bool = True) -> Dict[str, str]:
+    """构建全部资源，返回新清单"""
+    dist_dir = static_dir / DIST_DIR
+    previous = read_manifest(dist_dir)
+    minifiers = get_minifiers(minify)
+    manifest: Dict[str, str] = {}
+    total_source = total_output = 0
+
+    for source in sorted(static_dir.rglob("*")):
+        if source.suffix not in minifiers or not source.is_file() or dist_dir in source.parents:
+            continue
+        relative = source.relative_to(static_dir).as_posix()
+        text = source.read_text(encoding="utf-8")
+        minifier = minifiers[source.suffix]
+        data = (minifier(text) if minifier else text).encode("utf-8")
+
+        digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+        output_relative = f"{DIST_DIR}/{Path(relative).with_suffix('').as_posix()}.{digest}{source.suffix}"
+        output = static_dir / output_relative
+        write_file(output, data)
+
+        sizes = [f"{source.stat().st_size / 1024:.1f}KB → {len(data) / 1024:.1f}KB"]
+        for encoding, suffix in ENCODINGS:
+            compressed = compress(data, encoding)
+            # 压缩后不更小的文件不生成，直接发送原文件
+            if compressed is not None and len(compressed) < len(data):
+                write_file(output.with_name(output.name + suffix), compressed)
+                sizes.append(f"{encoding} {len(compressed) / 1024:.1f}KB")
+
+        manifest[relative] = output_relative
+        total_source += source.stat().st_size
+        total_output += len(data)
+        print(f"  {relative:<32} {output_relative:<44} {'  '.join(sizes)}")
+
+    write_file(dist_dir / MANIFEST_NAME, json.dumps({
+        "created_at": datetime.now().isoformat(),
+        "files": manifest,
+    }, ensure_ascii=False, indent=2).encode("utf-8"))
+
+    removed = prune(dist_dir, static_dir, set(manifest.values()) | set(previous.values()))
+    print(f"\n📦 {len(manifest)} 个文件  {total_source / 1024:.1f}KB → {total_output / 1024:.1f}KB  "
+          f"清理旧文件 {removed} 个")
+    return manifest
+
+
+def prune(dist_dir: Path, static_dir: Path, keep: set) -> int:
+    """删除本次和上一次构建都未引用的文件（含其 .gz/.br）"""
+    suffixes = tuple(suffix for _, suffix in ENCODINGS)
+    removed = 0
+    for path in dist_dir.rglob("*"):
+        if not path.is_file() or path.name == MANIFEST_NAME:
+            continue
+        relative = path.relative_to(static_dir).as_posix()
+        base = relative[:-len(path.suffix)] if relative.endswith(suffixes) else relative
+        if base not in keep:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="WordPress发布系统V2.4静态资源构建")
+    parser.add_argument("--static-dir", default=str(STATIC_DIR), help="静态资源目录")
+    parser.add_argument("--no-minify", action="store_true", help="不压缩代码，只生成哈希文件名和预压缩文件")
+    args = parser.parse_args()
+
+    static_dir = Path(args.static_dir).resolve()
+    if not static_dir.is_dir():
+        print(f"❌ 静态资源目录不存在: {static_dir}")
+        return 1
+
+    print("🏗️ WordPress 软文发布中间件 V2.4 静态资源构建")
+    print(f"📁 {static_dir} → {static_dir / DIST_DIR}")
+    if not args.no_minify and rjsmin is None:
+        print("⚠️ 未安装 rjsmin，JS 不压缩")
+    if not args.no_minify and rcssmin is None:
+        print("⚠️ 未安装 rcssmin，CSS 使用内置的简单压缩")
+    if brotli is None:
+        print("⚠️ 未安装 brotli，跳过 .br 文件")
+    print("=" * 60)
+
+    build(static_dir, minify=not args.no_minify)
+    print("✅ 构建完成，重启或重载服务后生效")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,8 +7,12 @@ WordPress 软文发布中间件 V2.4 部署脚本
 
 import os
 import sys
+import time
+import socket
 import subprocess
 import shutil
+import urllib.error
+import urllib.request
 from pathlib import Path
 from datetime import datetime
 
@@ -18,9 +22,19 @@ class V2_4_Deployer:
     def __init__(self):
         self.project_root = Path(__file__).parent
         self.backup_dir = self.project_root / "backups"
+        # 新版本在临时端口上启动后做功能测试和延迟基准对比（不连接正在运行的旧版本）
+        self.test_port = int(os.environ.get("DEPLOY_TEST_PORT", "0")) or self.free_port()
+        self.test_url = f"http://127.0.0.1:{self.test_port}"
+        self.startup_timeout = float(os.environ.get("DEPLOY_STARTUP_TIMEOUT", "30"))
+        # 部署门禁专用的延迟基准（测试模式下的新版本，与手动对生产环境测得的基准分开保存）
+        self.baseline_file = self.project_root / "deploy_latency_baseline_v2_4.json"
+        self.save_baseline = os.environ.get("DEPLOY_SAVE_BASELINE", "").lower() in ("1", "true", "yes")
         self.required_files = [
-            "main_v2_4.py",
-            "start_v2_4.py", 
+            "main_v2_4_final.py",
+            "wp_publisher/app.py",
+            "start_v2_4.py",
+            "gunicorn_conf.py",
+            "build_assets_v2_4.py",
             "requirements.txt",
             "templates/index_v2_4.html",
             "templates/admin_dashboard.html",
@@ -80,9 +94,11 @@ class V2_4_Deployer:
         # 备份关键文件
         backup_files = [
             ".env",
-            "main_v2_4.py",
+            "main_v2_4_final.py",
+            "wp_publisher/",
             "templates/",
-            "static/"
+            "static/",
+            "data/"  # 发布统计汇总
         ]
         
         for item in backup_files:
@@ -140,23 +156,48 @@ class V2_4_Deployer:
         print("🧪 运行测试...")
         
         try:
-            # 语法检查
+            # 语法检查（含 wp_publisher 包）
             result = subprocess.run([
-                sys.executable, "-m", "py_compile", "main_v2_4.py"
+                sys.executable, "-m", "compileall", "-q", "main_v2_4_final.py", "start_v2_4.py", "gunicorn_conf.py",
+                "wp_publisher"
             ], capture_output=True, text=True)
             
             if result.returncode != 0:
                 print("❌ 语法检查失败:")
-                print(result.stderr)
+                print(result.stdout or result.stderr)
                 return False
                 
             print("✅ 语法检查通过")
             
-            # 如果存在测试文件，运行测试
-            test_file = self.project_root / "test_v2_4.py"
-            if test_file.exists():
-                print("运行功能测试...")
-                # 这里可以添加测试运行逻辑
+            test_file = self.project_root / "final_production_test_v2_4.py"
+            if not test_file.exists():
+                print(f"❌ 缺少测试脚本: {test_file.name}")
+                return False
+            
+            # 在临时端口上启动新版本，功能测试 + 与已保存基准的延迟对比
+            server = self.start_test_server()
+            try:
+                if not self.wait_until_ready(server):
+                    print(f"❌ 新版本未能在 {self.startup_timeout:.0f} 秒内于 {self.test_url} 启动")
+                    return False
+                
+                command = [
+                    sys.executable, str(test_file), "--url", self.test_url,
+                    "--baseline", str(self.baseline_file), "--skip-publish"
+                ]
+                if self.save_baseline or not self.baseline_file.exists():
+                    print(f"⚠️ 将本次延迟分布记录为部署基准: {self.baseline_file.name}")
+                    command.append("--save-baseline")
+                
+                print(f"运行新版本测试（{self.test_url}，含延迟回退检查）...")
+                result = subprocess.run(command, cwd=self.project_root)
+                if result.returncode != 0:
+                    print("❌ 新版本测试未通过（功能失败或延迟回退）")
+                    return False
+                
+                print("✅ 新版本测试通过")
+            finally:
+                self.stop_test_server(server)
                 
             return True
             
@@ -164,6 +205,71 @@ class V2_4_Deployer:
             print(f"❌ 测试失败: {e}")
             return False
     
+    def build_assets(self):
+        """构建静态资源（压缩、内容哈希文件名、.gz/.br 预压缩）"""
+        print("🏗️ 构建静态资源...")
+        result = subprocess.run([sys.executable, "build_assets_v2_4.py"], cwd=self.project_root)
+        if result.returncode != 0:
+            print("❌ 静态资源构建失败")
+            return False
+        return True
+    
+    @staticmethod
+    def free_port() -> int:
+        """向系统申请一个空闲端口"""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+    
+    def start_test_server(self) -> subprocess.Popen:
+        """以测试模式启动新版本（不连接 WordPress 和百度，不影响线上服务）"""
+        env = os.environ.copy()
+        env.update({
+            "TEST_MODE": "true",
+            "PORT": str(self.test_port),
+            # final_production_test_v2_4.py 使用的管理员账号
+            "ADMIN_USER": "admin",
+            "ADMIN_PASS": "Admin@2024#Secure!",
+            "LOG_PER_PROCESS": "true",
+        })
+        # 单进程运行，不写入线上工作进程共用的指标目录
+        env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+        return subprocess.Popen([
+            sys.executable, "-m", "uvicorn", "main_v2_4_final:app",
+            "--host", "127.0.0.1", "--port", str(self.test_port), "--log-level", "warning"
+        ], cwd=self.project_root, env=env)
+    
+    def wait_until_ready(self, server: subprocess.Popen) -> bool:
+        """等待新版本的健康检查返回 200；进程退出或超时返回 False"""
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                print(f"❌ 新版本进程已退出（返回码 {server.returncode}）")
+                return False
+            if self.service_running():
+                return True
+            time.sleep(0.5)
+        return False
+    
+    @staticmethod
+    def stop_test_server(server: subprocess.Popen):
+        """停止临时端口上的新版本"""
+        if server.poll() is None:
+            server.terminate()
+            try:
+                server.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                server.kill()
+                server.wait()
+    
+    def service_running(self) -> bool:
+        """检查测试地址上的服务是否可用"""
+        try:
+            with urllib.request.urlopen(f"{self.test_url}/health", timeout=3) as response:
+                return response.status == 200
+        except (urllib.error.URLError, OSError):
+            return False
+    
     def setup_systemd_service(self):
         """设置systemd服务（Linux环境）"""
         if os.name != 'posix':
@@ -181,7 +287,14 @@ Type=simple
 User=www-data
 WorkingDirectory={self.project_root}
 Environment=PATH={sys.executable}
+# 工作进程数和回收阈值，参见 start_v2_4.py --help
+Environment=WEB_CONCURRENCY={os.cpu_count() or 1}
+Environment=MAX_REQUESTS=10000
 ExecStart={sys.executable} start_v2_4.py
+# 启动脚本会 exec 为 gunicorn 主进程：HUP 平滑重启工作进程，TERM 等待进行中的请求完成后退出
+ExecReload=/bin/kill -HUP $MAINPID
+KillMode=mixed
+TimeoutStopSec=45
 Restart=always
 RestartSec=10
 
@@ -237,11 +350,25 @@ server {
     add_header X-Content-Type-Options nosniff;
     add_header X-XSS-Protection "1; mode=block";
     
-    # 静态文件
+    # 构建后的静态文件（文件名带内容哈希，可永久缓存；直接发送构建时生成的 .gz 文件）
+    location /static/dist/ {
+        alias /path/to/wordpress-publisher/static/dist/;
+        gzip_static on;
+        add_header Cache-Control "public, max-age=31536000, immutable";
+    }
+    
+    # 其他静态文件（未构建的原始文件），每次向服务器确认是否修改
     location /static/ {
         alias /path/to/wordpress-publisher/static/;
-        expires 1y;
-        add_header Cache-Control "public, immutable";
+        add_header Cache-Control "no-cache";
+    }
+    
+    # 监控指标只供内网 Prometheus 抓取（应用本身还会校验 METRICS_TOKEN / METRICS_ALLOW_IPS）
+    location = /metrics {
+        allow 127.0.0.1;
+        deny all;
+        proxy_pass http://127.0.0.1:8001;
+        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
     }
     
     # 代理到FastAPI应用
@@ -293,12 +420,17 @@ server {
             print("❌ 部署失败: 配置验证未通过")
             return False
             
-        # 4. 运行测试
+        # 4. 构建静态资源
+        if not self.build_assets():
+            print("❌ 部署失败: 静态资源构建失败")
+            return False
+            
+        # 5. 运行测试
         if not self.run_tests():
             print("❌ 部署失败: 测试未通过")
             return False
             
-        # 5. 创建服务配置
+        # 6. 创建服务配置
         self.setup_systemd_service()
         self.create_nginx_config()
         
@@ -314,6 +446,7 @@ server {
         print()
         print("🔧 常用命令:")
         print("  启动服务: python start_v2_4.py")
+        print("  构建静态资源: python build_assets_v2_4.py")
         print("  查看日志: tail -f logs/app.log")
         print("  健康检查: curl http://localhost:8001/health")
         print()
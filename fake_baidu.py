@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+百度AI内容审核本地替身服务器 - 用于离线压测审核链路和复现线上故障
+实现 OAuth 令牌接口和 text_censor/v2/user_defined，可配置敏感词表、令牌有效期、QPS/每日配额和慢响应
+
+用法:
+    python fake_baidu.py --port 8091 --token-ttl 60 --qps 10 --slow-rate 0.05 --slow-ms 3000
+    # 中间件 .env 中设置 BAIDU_LIVE_AUDIT=true、BAIDU_API_BASE=http://127.0.0.1:8091，BAIDU_API_KEY/BAIDU_SECRET_KEY 与下方参数一致
+
+敏感词表文件每行一个词，可在词后用空格或制表符附加违规类型，例如:
+    违规内容 政治敏感
+    测试敏感词
+"""
+
+import time
+import random
+import asyncio
+import secrets
+import argparse
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+import uvicorn
+
+# 默认敏感词表（与测试模式一致）
+DEFAULT_WORDS = {"测试敏感词": "违禁违规", "违规内容": "违禁违规", "政治敏感": "政治敏感"}
+
+# 违规类型 → 百度返回的 type/subType
+SUBTYPES = {"政治敏感": (12, 3), "违禁违规": (12, 2), "低俗辱骂": (12, 5), "文本色情": (12, 1)}
+
+# 百度接口的错误码和提示
+ERRORS = {
+    "token_invalid": (110, "Access token invalid or no longer valid"),
+    "token_expired": (111, "Access token expired"),
+    "daily_limit": (17, "Open api daily request limit reached"),
+    "qps_limit": (18, "Open api qps request limit reached"),
+    "internal": (282000, "internal error"),
+}
+
+
+def load_words(path: Optional[str]) -> Dict[str, str]:
+    """读取敏感词表：{词: 违规类型}"""
+    if not path:
+        return dict(DEFAULT_WORDS)
+    words = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if parts and not parts[0].startswith("#"):
+                words[parts[0]] = parts[1] if len(parts) > 1 else "违禁违规"
+    return words
+
+
+class FakeBaiduConfig:
+    """替身服务器配置"""
+
+    def __init__(
+        self,
+        api_key: str = "fake_api_key",
+        secret_key: str = "fake_secret_key",
+        words: Optional[Dict[str, str]] = None,
+        token_ttl: int = 2592000,
+        qps: float = 0.0,
+        daily_quota: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_ms: float = 0.0,
+        error_rate: float = 0.0,
+    ):
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.words = words if words is not None else dict(DEFAULT_WORDS)
+        # 令牌有效期（秒），设置较短的值可以复现令牌过期后的刷新流程
+        self.token_ttl = token_ttl
+        # 审核接口每秒请求上限（超出返回错误码18），0 表示不限制
+        self.qps = qps
+        # 审核接口总请求上限（超出返回错误码17），0 表示不限制
+        self.daily_quota = daily_quota
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        # 以 slow_rate 的比例额外延迟 slow_ms，模拟偶发的慢响应
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        # 随机返回内部错误（错误码282000）的比例
+        self.error_rate = error_rate
+
+
+class FakeBaiduState:
+    """令牌、配额和调用统计"""
+
+    def __init__(self):
+        # 令牌 → 过期时间（monotonic）
+        self.tokens: Dict[str, float] = {}
+        self.qps_window: Tuple[int, int] = (0, 0)
+        self.audit_calls = 0
+        self.stats: Counter = Counter()
+
+
+def scan_text(text: str, words: Dict[str, str]) -> Dict[str, List[Tuple[str, List[List[int]]]]]:
+    """按违规类型汇总命中的词和位置：{违规类型: [(词, [[起, 止], ...]), ...]}"""
+    hits: Dict[str, List[Tuple[str, List[List[int]]]]] = {}
+    for word, label in words.items():
+        positions = []
+        start = text.find(word)
+        while start != -1:
+            positions.append([start, start + len(word) - 1])
+            start = text.find(word, start + len(word))
+        if positions:
+            hits.setdefault(label, []).append((word, positions))
+    return hits
+
+
+def build_audit_result(text: str, words: Dict[str, str]) -> Dict:
+    """构造与百度接口一致的审核结果"""
+    result = {"log_id": random.randint(10 ** 16, 10 ** 17 - 1)}
+    hits = scan_text(text, words)
+    if not hits:
+        result.update({"conclusion": "合规", "conclusionType": 1})
+        return result
+
+    data = []
+    for label, matches in hits.items():
+        type_, sub_type = SUBTYPES.get(label, (12, 2))
+        data.append({
+            "type": type_,
+            "subType": sub_type,
+            "conclusion": "不合规",
+            "conclusionType": 2,
+            "msg": f"存在{label}不合规",
+            "hits": [{
+                "datasetName": "百度默认文本反作弊库",
+                "words": [word for word, _ in matches],
+                "probability": 1.0,
+                "wordHitPositions": [
+                    {"keyword": word, "positions": positions, "label": label} for word, positions in matches
+                ],
+            }],
+        })
+    result.update({"conclusion": "不合规", "conclusionType": 2, "data": data})
+    return result
+
+
+def _error(name: str) -> JSONResponse:
+    """百度接口以 HTTP 200 返回业务错误"""
+    code, message = ERRORS[name]
+    return JSONResponse(content={"log_id": random.randint(10 ** 16, 10 ** 17 - 1), "error_code": code, "error_msg": message})
+
+
+def create_app(config: FakeBaiduConfig) -> FastAPI:
+    """创建替身服务器应用"""
+    app = FastAPI(title="Fake Baidu AI")
+    state = FakeBaiduState()
+    app.state.config = config
+    app.state.baidu = state
+
+    async def simulate_latency():
+        delay = config.latency_ms + random.uniform(-config.jitter_ms, config.jitter_ms)
+        if config.slow_rate > 0 and random.random() < config.slow_rate:
+            delay += config.slow_ms
+            state.stats["slow"] += 1
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    @app.post("/oauth/2.0/token")
+    async def oauth_token(request: Request):
+        params = request.query_params
+        state.stats["token_requests"] += 1
+        await simulate_latency()
+        if params.get("grant_type") != "client_credentials":
+            return JSONResponse(status_code=400, content={
+                "error": "unsupported_grant_type", "error_description": "The authorization grant type is not supported"
+            })
+        if params.get("client_id") != config.api_key:
+            return JSONResponse(status_code=401, content={"error": "invalid_client", "error_description": "unknown client id"})
+        if params.get("client_secret") != config.secret_key:
+            return JSONResponse(status_code=401, content={
+                "error": "invalid_client", "error_description": "Client authentication failed"
+            })
+
+        token = f"24.{secrets.token_hex(16)}.{config.token_ttl}.{int(time.time())}-fake"
+        state.tokens[token] = time.monotonic() + config.token_ttl
+        return {
+            "refresh_token": f"25.{secrets.token_hex(16)}",
+            "expires_in": config.token_ttl,
+            "session_key": secrets.token_hex(16),
+            "access_token": token,
+            "scope": "public brain_all_scope solution_face",
+            "session_secret": secrets.token_hex(16),
+        }
+
+    @app.post("/rest/2.0/solution/v1/text_censor/v2/user_defined")
+    async def text_censor(request: Request):
+        token = request.query_params.get("access_token")
+        form = await request.form()
+        token = token or form.get("access_token")
+        state.stats["audit_requests"] += 1
+
+        expires_at = state.tokens.get(token)
+        if expires_at is None:
+            state.stats["token_invalid"] += 1
+            return _error("token_invalid")
+        if time.monotonic() > expires_at:
+            state.stats["token_expired"] += 1
+            return _error("token_expired")
+
+        if config.daily_quota > 0 and state.audit_calls >= config.daily_quota:
+            state.stats["daily_limit"] += 1
+            return _error("daily_limit")
+        if config.qps > 0:
+            second = int(time.time())
+            window_second, count = state.qps_window
+            count = count + 1 if window_second == second else 1
+            state.qps_window = (second, count)
+            if count > config.qps:
+                state.stats["qps_limit"] += 1
+                return _error("qps_limit")
+        state.audit_calls += 1
+
+        await simulate_latency()
+        if config.error_rate > 0 and random.random() < config.error_rate:
+            state.stats["internal"] += 1
+            return _error("internal")
+
+        text = form.get("text") or ""
+        result = build_audit_result(text, config.words)
+        state.stats["conclusion_%d" % result["conclusionType"]] += 1
+        return result
+
+    @app.get("/_stats")
+    async def stats():
+        """替身服务器自身的调用统计（压测结束后核对令牌刷新和限流次数）"""
+        return {"audit_calls": state.audit_calls, "active_tokens": len(state.tokens), **state.stats}
+
+    return app
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="百度AI内容审核本地替身服务器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--api-key", default="fake_api_key")
+    parser.add_argument("--secret-key", default="fake_secret_key")
+    parser.add_argument("--words", help="敏感词表文件（每行: 词 [违规类型]），默认使用测试模式的词表")
+    parser.add_argument("--token-ttl", type=int, default=2592000, help="访问令牌有效期（秒，默认30天）")
+    parser.add_argument("--qps", type=float, default=0.0, help="审核接口QPS上限，超出返回错误码18（0为不限）")
+    parser.add_argument("--daily-quota", type=int, default=0, help="审核接口总调用上限，超出返回错误码17（0为不限）")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="平均响应延迟（毫秒）")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="延迟随机抖动范围（毫秒）")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="慢响应比例（0-1）")
+    parser.add_argument("--slow-ms", type=float, default=5000.0, help="慢响应的额外延迟（毫秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="随机返回内部错误的比例（0-1）")
+    args = parser.parse_args()
+
+    config = FakeBaiduConfig(
+        api_key=args.api_key,
+        secret_key=args.secret_key,
+        words=load_words(args.words),
+        token_ttl=args.token_ttl,
+        qps=args.qps,
+        daily_quota=args.daily_quota,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        slow_rate=args.slow_rate,
+        slow_ms=args.slow_ms,
+        error_rate=args.error_rate,
+    )
+
+    print("🧪 百度AI内容审核替身服务器")
+    print(f"📍 地址: http://{args.host}:{args.port}  （BAIDU_API_BASE）")
+    print(f"🔑 API Key: {args.api_key}  Secret Key: {args.secret_key}")
+    print(f"📚 敏感词: {len(config.words)} 个  令牌有效期: {args.token_ttl}s")
+    print(f"⏱️ 延迟: {args.latency_ms}±{args.jitter_ms}ms  慢响应: {args.slow_rate:.1%} +{args.slow_ms}ms  "
+          f"QPS上限: {args.qps or '不限'}  配额: {args.daily_quota or '不限'}")
+    print("=" * 50)
+
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
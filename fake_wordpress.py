@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress REST API 本地替身服务器 - 用于压测与基准测试
+实现 WordPressClient 与插件流程用到的端点，可配置延迟、错误率和吞吐上限，无需真实站点
+
+用法:
+    python fake_wordpress.py --port 8090 --latency-ms 150 --jitter-ms 50 --error-rate 0.01
+    # 中间件 .env 中设置 WP_DOMAIN=localhost:8090，WP_USERNAME/WP_APP_PASSWORD 与下方参数一致
+"""
+
+import time
+import base64
+import random
+import asyncio
+import argparse
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+import uvicorn
+
+
+class FakeWordPressConfig:
+    """替身服务器配置"""
+
+    def __init__(
+        self,
+        username: str = "admin",
+        app_password: str = "fake app password",
+        forbidden_users: Optional[List[str]] = None,
+        adv_posts_enabled: bool = True,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        max_rps: float = 0.0,
+        max_concurrency: int = 0,
+    ):
+        self.username = username
+        self.app_password = app_password
+        # 这些用户可以认证，但没有发布权限（返回403）
+        self.forbidden_users = set(forbidden_users or [])
+        # 关闭后 /adv_posts 返回404，用于测试回退到标准端点
+        self.adv_posts_enabled = adv_posts_enabled
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        # 每秒请求上限（超出返回429），0 表示不限制
+        self.max_rps = max_rps
+        # 同时处理的请求上限（模拟 PHP-FPM 工作进程数，超出排队），0 表示不限制
+        self.max_concurrency = max_concurrency
+
+
+class PostStore:
+    """内存文章存储"""
+
+    def __init__(self):
+        self.posts: Dict[int, Dict[str, Any]] = {}
+        self.media: Dict[int, Dict[str, Any]] = {}
+        self._next_id = 1000
+
+    def next_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def create_post(self, post_type: str, data: Dict[str, Any], base_url: str) -> Dict[str, Any]:
+        post_id = self.next_id()
+        now = datetime.now().isoformat(timespec="seconds")
+        title = data.get("title", "")
+        content = data.get("content", "")
+        status = data.get("status", "draft")
+        categories = data.get("categories") or [1]
+        # 与插件行为一致：头条文章强制为草稿并归入16035分类
+        if data.get("headline_article") or 16035 in categories:
+            status = "draft"
+            categories = [16035]
+        post = {
+            "id": post_id,
+            "date": now,
+            "modified": now,
+            "slug": f"post-{post_id}",
+            "status": status,
+            "type": post_type,
+            "link": f"{base_url}/?p={post_id}",
+            "title": {"raw": title, "rendered": title},
+            "content": {"raw": content, "rendered": content, "protected": False},
+            "author": 1,
+            "categories": categories,
+        }
+        self.posts[post_id] = post
+        return post
+
+
+def _select_fields(item: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+    """实现 _fields 参数（支持 title.rendered 这样的嵌套字段）"""
+    if not fields:
+        return item
+    result: Dict[str, Any] = {}
+    for field in fields.split(","):
+        field = field.strip()
+        top, _, sub = field.partition(".")
+        if top not in item:
+            continue
+        if sub and isinstance(item[top], dict):
+            if sub in item[top]:
+                result.setdefault(top, {})[sub] = item[top][sub]
+        else:
+            result[top] = item[top]
+    return result
+
+
+def _error(status: int, code: str, message: str) -> JSONResponse:
+    """WordPress 风格的错误响应"""
+    return JSONResponse(status_code=status, content={"code": code, "message": message, "data": {"status": status}})
+
+
+async def _read_json(request: Request):
+    """读取 JSON 请求体；格式错误时与真实 WordPress 一样返回 400 rest_invalid_json 错误响应"""
+    try:
+        return await request.json(), None
+    except ValueError:
+        return None, _error(400, "rest_invalid_json", "传入的JSON正文无效。")
+
+
+def create_app(config: FakeWordPressConfig) -> FastAPI:
+    """创建替身服务器应用"""
+    app = FastAPI(title="Fake WordPress REST API")
+    store = PostStore()
+    app.state.store = store
+    app.state.config = config
+
+    semaphore = asyncio.Semaphore(config.max_concurrency) if config.max_concurrency > 0 else None
+    rate_window = {"second": 0, "count": 0}
+
+    def authenticate(request: Request) -> Optional[JSONResponse]:
+        """校验 Basic Auth，失败时返回错误响应"""
+        header = request.headers.get("authorization", "")
+        if not header.startswith("Basic "):
+            return _error(401, "rest_not_logged_in", "您未登录。")
+        try:
+            username, _, password = base64.b64decode(header[6:]).decode("utf-8").partition(":")
+        except ValueError:
+            return _error(401, "rest_authentication_error", "认证头格式错误。")
+        if username in config.forbidden_users:
+            return _error(403, "rest_cannot_create", "抱歉，您不能以此用户身份创建文章。")
+        if username != config.username or password != config.app_password:
+            return _error(401, "incorrect_password", "提供的密码是无效的应用密码。")
+        return None
+
+    @app.middleware("http")
+    async def simulate_conditions(request: Request, call_next):
+        """模拟吞吐上限、并发上限、网络延迟和随机服务器错误"""
+        if config.max_rps > 0:
+            second = int(time.time())
+            if rate_window["second"] != second:
+                rate_window["second"], rate_window["count"] = second, 0
+            rate_window["count"] += 1
+            if rate_window["count"] > config.max_rps:
+                return _error(429, "rest_too_many_requests", "请求过于频繁。")
+
+        async def handle():
+            delay = config.latency_ms + random.uniform(-config.jitter_ms, config.jitter_ms)
+            if delay > 0:
+                await asyncio.sleep(delay / 1000)
+            if config.error_rate > 0 and random.random() < config.error_rate:
+                return _error(500, "internal_server_error", "模拟的服务器错误。")
+            return await call_next(request)
+
+        if semaphore is None:
+            return await handle()
+        async with semaphore:
+            return await handle()
+
+    def base_url(request: Request) -> str:
+        return str(request.base_url).rstrip("/")
+
+    async def create(post_type: str, request: Request) -> Response:
+        if post_type == "adv_posts" and not config.adv_posts_enabled:
+            return _error(404, "rest_no_route", "未找到匹配URL和请求方式的路由。")
+        auth_error = authenticate(request)
+        if auth_error:
+            return auth_error
+        data, json_error = await _read_json(request)
+        if json_error:
+            return json_error
+        if not data.get("title") and not data.get("content"):
+            return _error(400, "empty_content", "内容、标题和摘要为空。")
+        post = store.create_post(post_type, data, base_url(request))
+        return JSONResponse(status_code=201, content=post)
+
+    def list_posts(post_type: str, request: Request) -> Response:
+        if post_type == "adv_posts" and not config.adv_posts_enabled:
+            return _error(404, "rest_no_route", "未找到匹配URL和请求方式的路由。")
+        params = request.query_params
+        try:
+            page = max(1, int(params.get("page", 1)))
+            per_page = min(100, max(1, int(params.get("per_page", 10))))
+        except ValueError:
+            return _error(400, "rest_invalid_param", "无效参数: page, per_page")
+        status = params.get("status", "publish")
+        posts = [
+            p for p in reversed(list(store.posts.values()))
+            if p["type"] == post_type and (status == "any" or p["status"] in status.split(","))
+        ]
+        if status != "publish":
+            auth_error = authenticate(request)
+            if auth_error:
+                return auth_error
+        total = len(posts)
+        total_pages = max(1, -(-total // per_page))
+        if page > total_pages and total:
+            return _error(400, "rest_post_invalid_page_number", "请求的页码大于总页数。")
+        items = [_select_fields(p, params.get("_fields")) for p in posts[(page - 1) * per_page: page * per_page]]
+        return JSONResponse(content=items, headers={"X-WP-Total": str(total), "X-WP-TotalPages": str(total_pages)})
+
+    def get_post(post_type: str, post_id: int, request: Request) -> Response:
+        post = store.posts.get(post_id)
+        if not post or post["type"] != post_type:
+            return _error(404, "rest_post_invalid_id", "无效的文章ID。")
+        return JSONResponse(content=_select_fields(post, request.query_params.get("_fields")))
+
+    @app.post("/wp-json/wp/v2/adv_posts")
+    async def create_adv_post(request: Request):
+        return await create("adv_posts", request)
+
+    @app.post("/wp-json/wp/v2/posts")
+    async def create_standard_post(request: Request):
+        return await create("post", request)
+
+    @app.get("/wp-json/wp/v2/adv_posts")
+    async def list_adv_posts(request: Request):
+        return list_posts("adv_posts", request)
+
+    @app.get("/wp-json/wp/v2/posts")
+    async def list_standard_posts(request: Request):
+        return list_posts("post", request)
+
+    @app.get("/wp-json/wp/v2/adv_posts/{post_id}")
+    async def get_adv_post(post_id: int, request: Request):
+        return get_post("adv_posts", post_id, request)
+
+    @app.get("/wp-json/wp/v2/posts/{post_id}")
+    async def get_standard_post(post_id: int, request: Request):
+        return get_post("post", post_id, request)
+
+    @app.get("/wp-json/wp/v2/users/me")
+    async def users_me(request: Request):
+        auth_error = authenticate(request)
+        if auth_error and auth_error.status_code == 401:
+            return auth_error
+        return _select_fields({"id": 1, "name": config.username, "slug": config.username},
+                              request.query_params.get("_fields"))
+
+    @app.post("/wp-json/wp/v2/media")
+    async def upload_media(request: Request):
+        auth_error = authenticate(request)
+        if auth_error:
+            return auth_error
+        body = await request.body()
+        if not body:
+            return _error(400, "rest_upload_no_data", "未提供数据。")
+        disposition = request.headers.get("content-disposition", "")
+        filename = disposition.partition("filename=")[2].strip('"') or "upload.bin"
+        media_id = store.next_id()
+        media = {
+            "id": media_id,
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "type": "attachment",
+            "title": {"rendered": filename},
+            "mime_type": request.headers.get("content-type", "application/octet-stream"),
+            "source_url": f"{base_url(request)}/wp-content/uploads/{filename}",
+            "media_details": {"filesize": len(body)},
+        }
+        store.media[media_id] = media
+        return JSONResponse(status_code=201, content=media)
+
+    @app.post("/wp-json/batch/v1")
+    async def batch(request: Request):
+        """批量接口：逐个执行子请求，按顺序返回 {status, headers, body}"""
+        auth_error = authenticate(request)
+        if auth_error:
+            return auth_error
+        payload, json_error = await _read_json(request)
+        if json_error:
+            return json_error
+        requests_ = payload.get("requests", [])
+        if len(requests_) > 25:
+            return _error(400, "rest_batch_max_requests", "批量请求最多包含25个子请求。")
+        responses = []
+        for sub in requests_:
+            path = sub.get("path", "")
+            method = sub.get("method", "POST").upper()
+            post_type = {"/wp/v2/adv_posts": "adv_posts", "/wp/v2/posts": "post"}.get(path)
+            if method != "POST" or post_type is None or (post_type == "adv_posts" and not config.adv_posts_enabled):
+                responses.append({"status": 404, "headers": {},
+                                  "body": {"code": "rest_no_route", "message": "未找到匹配的路由。"}})
+                continue
+            post = store.create_post(post_type, sub.get("body") or {}, base_url(request))
+            responses.append({"status": 201, "headers": {}, "body": post})
+        return {"failed": None, "responses": responses}
+
+    return app
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="WordPress REST API 本地替身服务器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--username", default="admin", help="可认证的用户名")
+    parser.add_argument("--app-password", default="fake app password", help="应用密码")
+    parser.add_argument("--forbid-user", action="append", default=[], help="可认证但无发布权限的用户（返回403）")
+    parser.add_argument("--no-adv-posts", action="store_true", help="禁用 /adv_posts 端点（返回404）")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="每个请求的平均延迟（毫秒）")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="延迟随机抖动范围（毫秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="随机返回500的比例（0-1）")
+    parser.add_argument("--max-rps", type=float, default=0.0, help="每秒请求上限，超出返回429（0为不限）")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="同时处理的请求上限，超出排队（0为不限）")
+    args = parser.parse_args()
+
+    config = FakeWordPressConfig(
+        username=args.username,
+        app_password=args.app_password,
+        forbidden_users=args.forbid_user,
+        adv_posts_enabled=not args.no_adv_posts,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        max_rps=args.max_rps,
+        max_concurrency=args.max_concurrency,
+    )
+
+    print("🧪 WordPress REST API 替身服务器")
+    print(f"📍 地址: http://{args.host}:{args.port}/wp-json/wp/v2")
+    print(f"🔑 认证: {args.username} / {args.app_password}")
+    print(f"⏱️ 延迟: {args.latency_ms}±{args.jitter_ms}ms  错误率: {args.error_rate:.1%}  "
+          f"RPS上限: {args.max_rps or '不限'}  并发上限: {args.max_concurrency or '不限'}")
+    print("=" * 50)
+
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
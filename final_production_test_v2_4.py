@@ -3,21 +3,59 @@
 """
 WordPress 软文发布中间件 V2.4 生产环境最终测试
 验证所有功能是否正常工作，为上线做最后检查
+同时记录各接口的延迟分布并与基准对比，p95 变慢超过阈值时测试失败
 """
 
+import os
 import requests
 import json
 import time
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlsplit
+
+from load_test_v2_4 import latency_summary
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "production_latency_baseline_v2_4.json")
+
+# 延迟采样的只读接口（发布接口会产生文章，只记录功能测试中的那一次）
+LATENCY_ENDPOINTS = [
+    ("GET", "/health"),
+    ("GET", "/api/info"),
+    ("GET", "/api/user"),
+    ("GET", "/api/stats/monthly"),
+    ("GET", "/api/publish/history"),
+    ("GET", "/login"),
+]
 
 class ProductionTester:
     """生产环境测试器"""
     
-    def __init__(self, base_url: str = "http://localhost:8004"):
+    def __init__(self, base_url: str = "http://localhost:8004", latency_samples: int = 20,
+                 baseline_file: str = BASELINE_FILE, threshold: float = 0.2, min_delta_ms: float = 5.0,
+                 skip_publish: bool = False):
         self.base_url = base_url
+        # 不发送真实的发布请求（部署门禁在测试模式的新版本上运行时使用）
+        self.skip_publish = skip_publish
         self.session = requests.Session()
         self.test_results = []
+        # 每个接口的响应耗时（秒），由响应钩子自动记录
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.session.hooks["response"].append(self.record_latency)
+        self.latency_samples = latency_samples
+        self.baseline_file = baseline_file
+        self.threshold = threshold
+        self.min_delta_ms = min_delta_ms
+        self.latency_report: Dict[str, Dict[str, float]] = {}
+        self.regression_rows: List[Dict[str, Any]] = []
+    
+    def record_latency(self, response: requests.Response, *args, **kwargs):
+        """requests 响应钩子：按 "方法 路径" 记录耗时（不含查询参数，跟随重定向时只记录最终响应）"""
+        if response.history:
+            return
+        path = urlsplit(response.url).path
+        self.latencies[f"{response.request.method} {path}"].append(response.elapsed.total_seconds())
         
     def log_test(self, test_name: str, success: bool, message: str = "", details: Any = None):
         """记录测试结果"""
@@ -296,6 +334,88 @@ class ProductionTester:
             self.log_test("AI审核开关", False, f"测试失败: {str(e)}")
             return False
     
+    def sample_latencies(self):
+        """对只读接口重复请求，积累足够的样本计算分位数"""
+        for _ in range(self.latency_samples):
+            for method, endpoint in LATENCY_ENDPOINTS:
+                try:
+                    self.session.request(method, f"{self.base_url}{endpoint}", timeout=10)
+                except requests.RequestException:
+                    pass
+    
+    def load_baseline(self) -> Optional[Dict[str, Any]]:
+        """读取延迟基准"""
+        if not os.path.exists(self.baseline_file):
+            return None
+        with open(self.baseline_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def save_baseline(self):
+        """保存本次的延迟分布为新基准"""
+        with open(self.baseline_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                "created_at": datetime.now().isoformat(),
+                "base_url": self.base_url,
+                "endpoints": self.latency_report
+            }, f, ensure_ascii=False, indent=2)
+        print(f"💾 延迟基准已保存: {self.baseline_file}")
+    
+    def test_latency_regression(self) -> bool:
+        """测试接口延迟是否相对基准回退"""
+        self.sample_latencies()
+        self.latency_report = {
+            endpoint: latency_summary(samples) for endpoint, samples in sorted(self.latencies.items())
+        }
+        
+        baseline = self.load_baseline()
+        if baseline is None:
+            self.log_test("延迟基准对比", True, "未找到基准文件，跳过对比（使用 --save-baseline 记录基准）")
+            return True
+        
+        regressions = []
+        for endpoint, current in self.latency_report.items():
+            base = baseline.get("endpoints", {}).get(endpoint)
+            if base is None:
+                self.regression_rows.append({"endpoint": endpoint, "current": current, "base": None, "status": "新增"})
+                continue
+            change = current["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+            # 变化幅度和绝对差值都超过阈值才算回退，避免毫秒级接口的抖动误报
+            regressed = change > self.threshold and current["p95_ms"] - base["p95_ms"] > self.min_delta_ms
+            if regressed:
+                regressions.append(endpoint)
+            self.regression_rows.append({
+                "endpoint": endpoint,
+                "current": current,
+                "base": base,
+                "p95_change": round(change, 4),
+                "status": "回退" if regressed else "正常"
+            })
+        
+        self.print_latency_diff(baseline)
+        
+        if regressions:
+            self.log_test("延迟基准对比", False, f"p95 变慢超过 {self.threshold:.0%}: {', '.join(regressions)}")
+            return False
+        self.log_test("延迟基准对比", True, f"{len(self.latency_report)} 个接口均在阈值内")
+        return True
+    
+    def print_latency_diff(self, baseline: Dict[str, Any]):
+        """打印与基准的延迟对比表"""
+        print(f"\n📊 接口延迟对比（基准: {baseline.get('created_at', '未知')}，p95 阈值 +{self.threshold:.0%}）")
+        print("-" * 100)
+        print(f"{'接口':<32}{'样本':>6}{'基准p50':>10}{'当前p50':>10}{'基准p95':>10}{'当前p95':>10}{'p95变化':>10}  结果")
+        print("-" * 100)
+        for row in self.regression_rows:
+            current, base = row["current"], row["base"]
+            if base is None:
+                print(f"{row['endpoint']:<32}{current['count']:>6}{'-':>10}{current['p50_ms']:>10}"
+                      f"{'-':>10}{current['p95_ms']:>10}{'-':>10}  🆕 新增")
+                continue
+            mark = "❌ 回退" if row["status"] == "回退" else "✅"
+            print(f"{row['endpoint']:<32}{current['count']:>6}{base['p50_ms']:>10}{current['p50_ms']:>10}"
+                  f"{base['p95_ms']:>10}{current['p95_ms']:>10}{row['p95_change']:>+10.1%}  {mark}")
+        print("-" * 100)
+    
     def run_production_tests(self) -> bool:
         """运行完整的生产环境测试"""
         print("🚀 开始WordPress软文发布中间件V2.4生产环境测试")
@@ -308,8 +428,11 @@ class ProductionTester:
             ("登录安全测试", self.test_login_security),
             ("API端点测试", self.test_api_endpoints),
             ("V2.4新功能测试", self.test_v2_4_features),
-            ("AI审核开关测试", self.test_ai_audit_switch)
+            ("AI审核开关测试", self.test_ai_audit_switch),
+            ("延迟基准对比", self.test_latency_regression)
         ]
+        if self.skip_publish:
+            tests = [test for test in tests if test[1] != self.test_ai_audit_switch]
         
         passed_tests = 0
         total_tests = len(tests)
@@ -364,7 +487,9 @@ class ProductionTester:
                     "failed": total - passed,
                     "success_rate": success_rate
                 },
-                "results": self.test_results
+                "results": self.test_results,
+                "latency": self.latency_report,
+                "latency_comparison": self.regression_rows
             }, f, ensure_ascii=False, indent=2)
         
         print(f"\n📄 详细测试报告已保存: {report_file}")
@@ -376,13 +501,28 @@ def main():
     
     parser = argparse.ArgumentParser(description="WordPress发布系统V2.4生产环境测试")
     parser.add_argument("--url", default="http://localhost:8004", help="测试URL")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="延迟基准文件")
+    parser.add_argument("--save-baseline", action="store_true", help="测试通过后将本次延迟分布保存为基准")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p95 变慢超过该比例判定为回退（默认0.2）")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="p95 绝对差值小于该值时不判定为回退")
+    parser.add_argument("--latency-samples", type=int, default=20, help="每个只读接口的采样次数")
+    parser.add_argument("--skip-publish", action="store_true", help="跳过会发布测试文章的AI审核开关测试")
     
     args = parser.parse_args()
     
-    tester = ProductionTester(args.url)
+    tester = ProductionTester(
+        args.url,
+        latency_samples=args.latency_samples,
+        baseline_file=args.baseline,
+        threshold=args.threshold,
+        min_delta_ms=args.min_delta_ms,
+        skip_publish=args.skip_publish
+    )
     
     try:
         success = tester.run_production_tests()
+        if success and args.save_baseline:
+            tester.save_baseline()
         exit_code = 0 if success else 1
         
         if success:
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 V2.4 - Gunicorn 配置（生产模式）
+由 start_v2_4.py 加载，工作进程数、回收阈值和预加载等参数通过命令行传入；
+这里只放工作进程类型和进程生命周期钩子
+"""
+
+from dataclasses import replace
+
+from uvicorn.workers import UvicornWorker
+
+
+class UvloopWorker(UvicornWorker):
+    """固定使用 uvloop 事件循环和 httptools 解析器，依赖缺失时直接启动失败而不是静默降级"""
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 等待连接关闭只占用一半的优雅停止时间，剩下的留给 lifespan 等待发布任务并保存未完成的记录，
+        # 否则主进程在 graceful-timeout 到期时直接 SIGKILL，未完成的发布来不及保存
+        self.config.timeout_graceful_shutdown = self.cfg.graceful_timeout / 2
+
+
+def post_fork(server, worker):
+    """
+    预加载模式下应用在主进程中导入，日志写入线程不会被 fork 复制到子进程，
+    需要在每个工作进程中重新启动；多个工作进程必须各写各的日志文件，避免同时轮转同一个文件
+    """
+    from wp_publisher.log_config import reinit_logging_after_fork
+    from wp_publisher.settings import get_settings
+
+    settings = get_settings()
+    if server.cfg.workers > 1:
+        settings = replace(settings, log_per_process=True)
+    reinit_logging_after_fork(settings)
+
+
+def child_exit(server, worker):
+    """工作进程退出（包括达到最大请求数后被回收）时清理其 livesum 指标文件"""
+    from wp_publisher import metrics
+
+    metrics.mark_process_dead(worker.pid)
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 V2.4 压力测试
+按配置的比例混合登录、发布、发布历史、本月统计请求，以目标RPS（开环）或固定并发（闭环）持续施压，
+输出各操作的 p50/p95/p99 延迟、吞吐量和错误分类（JSON报告 + 文本表格），用于上线前的容量评估
+
+用法:
+    # 配合 fake_wordpress.py 使用，避免压测真实站点
+    python load_test_v2_4.py --url http://localhost:8004 --rps 50 --duration 60
+    python load_test_v2_4.py --concurrency 20 --duration 60 --mix publish=1,history=4,stats=4,login=1
+"""
+
+import time
+import json
+import random
+import asyncio
+import argparse
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import aiohttp
+
+# 默认操作比例（权重）
+DEFAULT_MIX = {"login": 1, "publish": 2, "history": 4, "stats": 3}
+
+TEST_CREDENTIALS = {"username": "admin", "password": "Admin@2024#Secure!"}
+
+
+def percentile(values: List[float], q: float) -> float:
+    """最近秩法分位数（values 需已排序）"""
+    if not values:
+        return 0.0
+    last = len(values) - 1
+    return values[min(last, int(q * last + 0.5))]
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    """延迟分布摘要（输入秒，输出毫秒）"""
+    ordered = sorted(latencies)
+    if not ordered:
+        return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """解析 "publish=1,history=4" 格式的操作比例"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"未知操作: {name}（可选: {', '.join(DEFAULT_MIX)}）")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+class LoadTester:
+    """压力测试器"""
+
+    def __init__(self, base_url: str, mix: Dict[str, int], credentials: Dict[str, str],
+                 sessions: int = 10, timeout: float = 30.0):
+        self.base_url = base_url.rstrip("/")
+        self.operations = list(mix)
+        self.weights = [mix[name] for name in self.operations]
+        self.credentials = credentials
+        self.session_count = sessions
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.sessions: List[aiohttp.ClientSession] = []
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Counter] = defaultdict(Counter)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def login(self, session: aiohttp.ClientSession) -> Optional[str]:
+        """登录，成功返回 None，失败返回错误分类"""
+        async with session.post(f"{self.base_url}/login", data=self.credentials) as response:
+            if response.status != 200:
+                return f"HTTP {response.status}"
+            data = await LoadTester.read_json(response)
+            if data is None:
+                return f"非JSON响应 HTTP {response.status}"
+            return None if data.get("status") == "success" else "登录失败"
+
+    async def op_login(self, session: aiohttp.ClientSession) -> Optional[str]:
+        # 使用独立的 Cookie，避免影响共享会话的登录状态
+        async with aiohttp.ClientSession(timeout=self.timeout, cookie_jar=aiohttp.CookieJar(unsafe=True)) as fresh:
+            return await self.login(fresh)
+
+    async def op_publish(self, session: aiohttp.ClientSession) -> Optional[str]:
+        article = {
+            "title": f"压测文章 {datetime.now().strftime('%H%M%S')}-{random.randint(1000, 9999)}",
+            "content": "<h2>压力测试</h2>" + "<p>这是一篇用于压力测试的文章内容。</p>" * 20,
+        }
+        async with session.post(f"{self.base_url}/publish", json=article) as response:
+            return await self.check_json(response)
+
+    async def op_history(self, session: aiohttp.ClientSession) -> Optional[str]:
+        async with session.get(f"{self.base_url}/api/publish/history?limit=10") as response:
+            return await self.check_json(response)
+
+    async def op_stats(self, session: aiohttp.ClientSession) -> Optional[str]:
+        async with session.get(f"{self.base_url}/api/stats/monthly") as response:
+            return await self.check_json(response)
+
+    @staticmethod
+    async def read_json(response: aiohttp.ClientResponse) -> Optional[Dict]:
+        """读取 JSON 响应体；不是 JSON（如代理返回的 HTML 错误页）或内容不完整时返回 None"""
+        try:
+            data = await response.json(content_type=None)
+        except ValueError:  # 包括 aiohttp.ContentTypeError 和 JSON 解析错误
+            return None
+        return data if isinstance(data, dict) else None
+
+    @staticmethod
+    async def check_json(response: aiohttp.ClientResponse) -> Optional[str]:
+        """接口以 HTTP 200 + status=error 表示业务失败，需要单独分类"""
+        if response.status != 200:
+            return f"HTTP {response.status}"
+        data = await LoadTester.read_json(response)
+        if data is None:
+            return f"非JSON响应 HTTP {response.status}"
+        if data.get("status") != "success":
+            return f"业务错误: {str(data.get('message', ''))[:40]}"
+        return None
+
+    async def run_one(self):
+        """按比例随机选择一个操作并记录结果"""
+        name = random.choices(self.operations, self.weights)[0]
+        session = random.choice(self.sessions)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        start = time.perf_counter()
+        try:
+            error = await getattr(self, f"op_{name}")(session)
+        except asyncio.TimeoutError:
+            error = "超时"
+        except aiohttp.ClientError as e:
+            error = type(e).__name__
+        except ValueError as e:
+            # 其他响应解析错误也计为失败请求，不能让工作协程退出（否则实际并发会悄悄下降）
+            error = type(e).__name__
+        finally:
+            self.in_flight -= 1
+        self.latencies[name].append(time.perf_counter() - start)
+        if error:
+            self.errors[name][error] += 1
+
+    async def setup(self):
+        """创建并登录共享会话"""
+        for _ in range(self.session_count):
+            session = aiohttp.ClientSession(timeout=self.timeout, cookie_jar=aiohttp.CookieJar(unsafe=True))
+            error = await self.login(session)
+            if error:
+                await session.close()
+                raise RuntimeError(f"压测账户登录失败: {error}")
+            self.sessions.append(session)
+
+    async def teardown(self):
+        for session in self.sessions:
+            await session.close()
+
+    async def run_rps(self, rps: float, duration: float):
+        """开环模式：按固定速率发起请求，不等待前一个请求完成（服务变慢时并发会上升）"""
+        tasks = set()
+        interval = 1.0 / rps
+        start = time.perf_counter()
+        sent = 0
+        while time.perf_counter() - start < duration:
+            task = asyncio.create_task(self.run_one())
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            sent += 1
+            # 按计划时间发送，避免调度误差累积
+            await asyncio.sleep(max(0.0, start + sent * interval - time.perf_counter()))
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def run_concurrency(self, concurrency: int, duration: float):
+        """闭环模式：固定数量的虚拟用户连续发起请求"""
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                await self.run_one()
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    async def run(self, duration: float, rps: Optional[float] = None, concurrency: Optional[int] = None) -> Dict:
+        await self.setup()
+        started_at = datetime.now()
+        start = time.perf_counter()
+        try:
+            if rps:
+                await self.run_rps(rps, duration)
+            else:
+                await self.run_concurrency(concurrency or 10, duration)
+        finally:
+            await self.teardown()
+        elapsed = time.perf_counter() - start
+        return self.build_report(started_at, elapsed, rps, concurrency)
+
+    def build_report(self, started_at: datetime, elapsed: float,
+                     rps: Optional[float], concurrency: Optional[int]) -> Dict:
+        operations = {}
+        all_latencies: List[float] = []
+        all_errors: Counter = Counter()
+        for name in self.operations:
+            latencies = self.latencies.get(name, [])
+            errors = self.errors.get(name, Counter())
+            all_latencies.extend(latencies)
+            all_errors.update(errors)
+            operations[name] = {
+                **latency_summary(latencies),
+                "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+                "error_count": sum(errors.values()),
+                "errors": dict(errors),
+            }
+        total = len(all_latencies)
+        error_count = sum(all_errors.values())
+        return {
+            "test_time": started_at.isoformat(),
+            "base_url": self.base_url,
+            "mode": "rps" if rps else "concurrency",
+            "target_rps": rps,
+            "concurrency": None if rps else (concurrency or 10),
+            "duration_seconds": round(elapsed, 2),
+            "max_in_flight": self.max_in_flight,
+            "overall": {
+                **latency_summary(all_latencies),
+                "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+                "error_count": error_count,
+                "error_rate": round(error_count / total, 4) if total else 0.0,
+                "errors": dict(all_errors),
+            },
+            "operations": operations,
+        }
+
+
+def print_report(report: Dict):
+    """以文本表格输出压测结果"""
+    print("\n📊 压力测试结果")
+    print("=" * 86)
+    mode = f"目标 {report['target_rps']} RPS" if report["mode"] == "rps" else f"并发 {report['concurrency']}"
+    print(f"模式: {mode}  时长: {report['duration_seconds']}s  最大并发: {report['max_in_flight']}")
+    print("-" * 86)
+    print(f"{'操作':<10}{'请求数':>8}{'吞吐(rps)':>11}{'错误':>7}{'平均(ms)':>10}"
+          f"{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'最大(ms)':>10}")
+    rows = list(report["operations"].items()) + [("总计", report["overall"])]
+    for name, stats in rows:
+        print(f"{name:<10}{stats['count']:>8}{stats['throughput_rps']:>11}{stats['error_count']:>7}"
+              f"{stats['mean_ms']:>10}{stats['p50_ms']:>10}{stats['p95_ms']:>10}"
+              f"{stats['p99_ms']:>10}{stats['max_ms']:>10}")
+    errors = report["overall"]["errors"]
+    if errors:
+        print("-" * 86)
+        print("❌ 错误分类:")
+        for name, stats in report["operations"].items():
+            for error, count in stats["errors"].items():
+                print(f"  • {name}: {error} × {count}")
+    print("=" * 86)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="WordPress发布系统V2.4压力测试")
+    parser.add_argument("--url", default="http://localhost:8004", help="测试URL")
+    parser.add_argument("--username", default=TEST_CREDENTIALS["username"])
+    parser.add_argument("--password", default=TEST_CREDENTIALS["password"])
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--rps", type=float, help="目标每秒请求数（开环模式）")
+    group.add_argument("--concurrency", type=int, default=10, help="虚拟用户数（闭环模式，默认10）")
+    parser.add_argument("--duration", type=float, default=30.0, help="持续时间（秒）")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="操作比例，例如 publish=1,history=4,stats=3,login=1")
+    parser.add_argument("--sessions", type=int, default=10, help="预先登录的共享会话数")
+    parser.add_argument("--timeout", type=float, default=30.0, help="单个请求超时（秒）")
+    parser.add_argument("--output", help="JSON报告路径（默认 load_test_report_v2_4_时间戳.json）")
+    args = parser.parse_args()
+
+    print("🚀 WordPress 软文发布中间件 V2.4 压力测试")
+    print(f"📍 目标: {args.url}  操作比例: {args.mix}")
+
+    tester = LoadTester(
+        args.url, args.mix, {"username": args.username, "password": args.password},
+        sessions=args.sessions, timeout=args.timeout,
+    )
+    try:
+        report = asyncio.run(tester.run(args.duration, rps=args.rps, concurrency=args.concurrency))
+    except KeyboardInterrupt:
+        print("\n⏹️ 测试被用户中断")
+        return 1
+    except Exception as e:
+        print(f"\n❌ 压力测试失败: {e}")
+        return 1
+
+    print_report(report)
+    report_file = args.output or f"load_test_report_v2_4_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(report_file, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"📄 JSON报告已保存: {report_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -2,23 +2,148 @@
 # -*- coding: utf-8 -*-
 """
 WordPress 软文发布中间件 V2.4 性能监控脚本
-监控系统运行状态和性能指标
+监控系统运行状态和性能指标，一个监控进程可并发探测多个中间件节点
 """
 
 import time
 import json
+import asyncio
 import psutil
-import requests
+import aiohttp
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional, Union
 from pathlib import Path
 
+class MetricsStore:
+    """
+    追加写的指标存储：每天一个JSONL分段文件，保留期外的分段整体删除；
+    可用性由内存中按小时滚动的聚合值计算，每次采样的开销与历史数据量无关
+    """
+    
+    SEGMENT_PREFIX = "metrics-"
+    SEGMENT_SUFFIX = ".jsonl"
+    
+    def __init__(self, directory: Path, retention_days: int = 7, window_hours: int = 24):
+        self.directory = Path(directory)
+        self.retention_days = retention_days
+        self.window_hours = window_hours
+        # 小时桶: {小时序号: [健康次数, 总次数]}，只保留最近 window_hours 小时
+        self.buckets: Dict[int, List[int]] = {}
+        self._current_day: Optional[str] = None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._rebuild_buckets()
+    
+    def _segment_path(self, day: str) -> Path:
+        return self.directory / f"{self.SEGMENT_PREFIX}{day}{self.SEGMENT_SUFFIX}"
+    
+    def _segments(self) -> List[Path]:
+        """按日期排序的分段文件列表"""
+        return sorted(self.directory.glob(f"{self.SEGMENT_PREFIX}*{self.SEGMENT_SUFFIX}"))
+    
+    @staticmethod
+    def _hour_of(timestamp: datetime) -> int:
+        return int(timestamp.timestamp() // 3600)
+    
+    @staticmethod
+    def _is_healthy(metrics: Dict[str, Any]) -> bool:
+        return metrics.get("app_metrics", {}).get("status") == "healthy"
+    
+    def _record_bucket(self, timestamp: datetime, healthy: bool):
+        bucket = self.buckets.setdefault(self._hour_of(timestamp), [0, 0])
+        bucket[0] += 1 if healthy else 0
+        bucket[1] += 1
+    
+    def _prune_buckets(self, now: datetime):
+        oldest = self._hour_of(now) - self.window_hours
+        for hour in [h for h in self.buckets if h < oldest]:
+            del self.buckets[hour]
+    
+    def _rebuild_buckets(self):
+        """启动时从窗口内的分段重建聚合值（只执行一次）"""
+        since = datetime.now() - timedelta(hours=self.window_hours)
+        for record in self.iter_records(since):
+            self._record_bucket(datetime.fromisoformat(record["timestamp"]), self._is_healthy(record))
+    
+    def drop_expired_segments(self, now: Optional[datetime] = None):
+        """删除保留期之外的整个分段文件"""
+        cutoff = ((now or datetime.now()) - timedelta(days=self.retention_days)).strftime("%Y%m%d")
+        for segment in self._segments():
+            day = segment.name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)]
+            if day < cutoff:
+                segment.unlink()
+    
+    def append(self, metrics: Dict[str, Any]):
+        """追加一条指标记录"""
+        timestamp = datetime.fromisoformat(metrics["timestamp"])
+        day = timestamp.strftime("%Y%m%d")
+        
+        with open(self._segment_path(day), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(metrics, ensure_ascii=False, separators=(",", ":")) + "\n")
+        
+        # 跨天时才检查保留期
+        if day != self._current_day:
+            self._current_day = day
+            self.drop_expired_segments(timestamp)
+        
+        self._record_bucket(timestamp, self._is_healthy(metrics))
+        self._prune_buckets(timestamp)
+    
+    def iter_records(self, since: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """按时间顺序遍历记录，只读取 since 之后的分段"""
+        since_day = since.strftime("%Y%m%d") if since else ""
+        for segment in self._segments():
+            day = segment.name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)]
+            if day < since_day:
+                continue
+            with open(segment, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        timestamp = datetime.fromisoformat(record.get("timestamp", ""))
+                    except ValueError:
+                        # 进程中断时可能留下不完整的最后一行
+                        continue
+                    if since is None or timestamp > since:
+                        yield record
+    
+    def availability(self, hours: int = 24) -> float:
+        """最近 hours 小时（按整小时桶计）的可用性百分比"""
+        oldest = self._hour_of(datetime.now()) - min(hours, self.window_hours)
+        healthy = total = 0
+        for hour, (bucket_healthy, bucket_total) in self.buckets.items():
+            if hour > oldest:
+                healthy += bucket_healthy
+                total += bucket_total
+        return (healthy / total) * 100 if total else 0.0
+    
+    def import_legacy(self, legacy_file: Path):
+        """将旧版整体JSON文件导入分段存储，完成后重命名，避免重复导入"""
+        if not legacy_file.exists():
+            return
+        with open(legacy_file, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        for record in records:
+            if record.get("timestamp"):
+                self.append(record)
+        legacy_file.rename(legacy_file.with_suffix(".json.migrated"))
+
 class PerformanceMonitor:
-    """性能监控器"""
+    """性能监控器（asyncio版本：所有节点、所有端点并发探测，共用一个连接池）"""
+    
+    # 每次采样探测的端点
+    ENDPOINTS = [
+        ("/health", "GET"),
+        ("/api/info", "GET"),
+        ("/login", "GET")
+    ]
     
-    def __init__(self, base_url: str = "http://localhost:8001"):
-        self.base_url = base_url
-        self.metrics_file = Path("metrics_v2_4.json")
+    def __init__(self, base_urls: Union[str, List[str]] = "http://localhost:8001", request_timeout: float = 5.0):
+        self.base_urls = [base_urls] if isinstance(base_urls, str) else list(base_urls)
+        self.base_url = self.base_urls[0]
+        self.request_timeout = request_timeout
+        self.metrics_store = MetricsStore(Path("metrics_v2_4"))
+        # 旧版本的整体JSON文件，首次运行时导入
+        self.metrics_store.import_legacy(Path("metrics_v2_4.json"))
         self.alert_thresholds = {
             "cpu_percent": 80.0,
             "memory_percent": 85.0,
@@ -26,12 +151,26 @@ class PerformanceMonitor:
             "error_rate": 5.0,     # 百分比
             "disk_usage": 90.0     # 百分比
         }
+        # CPU使用率按两次调用之间的间隔计算，先调用一次作为基准，之后不再阻塞等待
+        psutil.cpu_percent(interval=None)
+    
+    def create_session(self) -> aiohttp.ClientSession:
+        """创建探测用的连接池会话（按节点数放宽每主机连接数）"""
+        connector = aiohttp.TCPConnector(
+            limit=max(100, len(self.base_urls) * len(self.ENDPOINTS)),
+            limit_per_host=len(self.ENDPOINTS) + 1,
+            ttl_dns_cache=300
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+        )
         
     def get_system_metrics(self) -> Dict[str, Any]:
-        """获取系统指标"""
+        """获取系统指标（非阻塞）"""
         try:
-            # CPU使用率
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU使用率：自上次采样以来的平均值
+            cpu_percent = psutil.cpu_percent(interval=None)
             
             # 内存使用率
             memory = psutil.virtual_memory()
@@ -58,16 +197,16 @@ class PerformanceMonitor:
             print(f"获取系统指标失败: {e}")
             return {}
     
-    def get_app_metrics(self) -> Dict[str, Any]:
+    async def get_app_metrics(self, session: aiohttp.ClientSession, base_url: str) -> Dict[str, Any]:
         """获取应用指标"""
         try:
             # 健康检查
-            start_time = time.time()
-            response = requests.get(f"{self.base_url}/health", timeout=5)
-            response_time = time.time() - start_time
+            start_time = time.perf_counter()
+            async with session.get(f"{base_url}/health") as response:
+                health_data = await response.json() if response.status == 200 else {}
+            response_time = time.perf_counter() - start_time
             
-            if response.status_code == 200:
-                health_data = response.json()
+            if response.status == 200:
                 return {
                     "timestamp": datetime.now().isoformat(),
                     "status": "healthy",
@@ -81,156 +220,156 @@ class PerformanceMonitor:
                     "timestamp": datetime.now().isoformat(),
                     "status": "unhealthy",
                     "response_time": response_time,
-                    "status_code": response.status_code
+                    "status_code": response.status
                 }
                 
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
             return {
                 "timestamp": datetime.now().isoformat(),
                 "status": "error",
-                "error": str(e)
+                "error": str(e) or type(e).__name__
             }
     
-    def test_api_endpoints(self) -> Dict[str, Any]:
-        """测试API端点"""
-        endpoints = [
-            ("/health", "GET"),
-            ("/api/info", "GET"),
-            ("/login", "GET")
-        ]
-        
-        results = {}
-        
-        for endpoint, method in endpoints:
-            try:
-                start_time = time.time()
-                
-                if method == "GET":
-                    response = requests.get(f"{self.base_url}{endpoint}", timeout=5)
-                else:
-                    response = requests.post(f"{self.base_url}{endpoint}", timeout=5)
-                    
-                response_time = time.time() - start_time
-                
-                results[endpoint] = {
-                    "status_code": response.status_code,
-                    "response_time": response_time,
-                    "success": response.status_code < 400
-                }
-                
-            except Exception as e:
-                results[endpoint] = {
-                    "error": str(e),
-                    "success": False
-                }
-                
-        return results
-    
-    def calculate_availability(self, hours: int = 24) -> float:
-        """计算可用性"""
-        if not self.metrics_file.exists():
-            return 0.0
-            
+    async def _probe_endpoint(self, session: aiohttp.ClientSession, url: str, method: str) -> Dict[str, Any]:
+        """探测单个端点"""
         try:
-            with open(self.metrics_file, 'r', encoding='utf-8') as f:
-                metrics = json.load(f)
-                
-            cutoff_time = datetime.now() - timedelta(hours=hours)
-            recent_metrics = [
-                m for m in metrics 
-                if datetime.fromisoformat(m.get("timestamp", "")) > cutoff_time
-            ]
+            start_time = time.perf_counter()
+            async with session.request(method, url, allow_redirects=False) as response:
+                await response.read()
+            response_time = time.perf_counter() - start_time
             
-            if not recent_metrics:
-                return 0.0
-                
-            healthy_count = sum(
-                1 for m in recent_metrics 
-                if m.get("app_metrics", {}).get("status") == "healthy"
-            )
-            
-            return (healthy_count / len(recent_metrics)) * 100
+            return {
+                "status_code": response.status,
+                "response_time": response_time,
+                "success": response.status < 400
+            }
             
+        except Exception as e:
+            return {
+                "error": str(e) or type(e).__name__,
+                "success": False
+            }
+    
+    async def test_api_endpoints(self, session: aiohttp.ClientSession, base_url: str) -> Dict[str, Any]:
+        """并发测试API端点"""
+        results = await asyncio.gather(*(
+            self._probe_endpoint(session, f"{base_url}{endpoint}", method)
+            for endpoint, method in self.ENDPOINTS
+        ))
+        return {endpoint: result for (endpoint, _), result in zip(self.ENDPOINTS, results)}
+    
+    async def probe_target(self, session: aiohttp.ClientSession, base_url: str) -> Dict[str, Any]:
+        """探测单个中间件节点：健康检查与端点测试并发进行"""
+        app_metrics, api_results = await asyncio.gather(
+            self.get_app_metrics(session, base_url),
+            self.test_api_endpoints(session, base_url)
+        )
+        return {"app_metrics": app_metrics, "api_endpoints": api_results}
+    
+    def calculate_availability(self, hours: int = 24) -> float:
+        """计算可用性（基于滚动聚合值，不再重新解析历史数据）"""
+        try:
+            return self.metrics_store.availability(hours)
         except Exception as e:
             print(f"计算可用性失败: {e}")
             return 0.0
     
-    def check_alerts(self, system_metrics: Dict, app_metrics: Dict) -> List[str]:
-        """检查告警条件"""
+    def check_alerts(self, system_metrics: Dict, app_metrics: Dict, target: str = "") -> List[str]:
+        """检查告警条件（target 非空时只检查该节点的应用指标）"""
         alerts = []
+        prefix = f"[{target}] " if target else ""
         
         # 系统资源告警
-        if system_metrics.get("cpu_percent", 0) > self.alert_thresholds["cpu_percent"]:
-            alerts.append(f"CPU使用率过高: {system_metrics['cpu_percent']:.1f}%")
-            
-        if system_metrics.get("memory_percent", 0) > self.alert_thresholds["memory_percent"]:
-            alerts.append(f"内存使用率过高: {system_metrics['memory_percent']:.1f}%")
-            
-        if system_metrics.get("disk_percent", 0) > self.alert_thresholds["disk_usage"]:
-            alerts.append(f"磁盘使用率过高: {system_metrics['disk_percent']:.1f}%")
+        if not target:
+            if system_metrics.get("cpu_percent", 0) > self.alert_thresholds["cpu_percent"]:
+                alerts.append(f"CPU使用率过高: {system_metrics['cpu_percent']:.1f}%")
+                
+            if system_metrics.get("memory_percent", 0) > self.alert_thresholds["memory_percent"]:
+                alerts.append(f"内存使用率过高: {system_metrics['memory_percent']:.1f}%")
+                
+            if system_metrics.get("disk_percent", 0) > self.alert_thresholds["disk_usage"]:
+                alerts.append(f"磁盘使用率过高: {system_metrics['disk_percent']:.1f}%")
             
         # 应用性能告警
-        if app_metrics.get("response_time", 0) > self.alert_thresholds["response_time"]:
-            alerts.append(f"响应时间过长: {app_metrics['response_time']:.2f}秒")
-            
-        if app_metrics.get("status") != "healthy":
-            alerts.append(f"应用状态异常: {app_metrics.get('status', 'unknown')}")
+        if app_metrics:
+            if app_metrics.get("response_time", 0) > self.alert_thresholds["response_time"]:
+                alerts.append(f"{prefix}响应时间过长: {app_metrics['response_time']:.2f}秒")
+                
+            if app_metrics.get("status") != "healthy":
+                alerts.append(f"{prefix}应用状态异常: {app_metrics.get('status', 'unknown')}")
             
         return alerts
     
     def save_metrics(self, metrics: Dict[str, Any]):
-        """保存指标数据"""
+        """保存指标数据（追加写入当天分段，过期分段整体删除）"""
         try:
-            # 读取现有数据
-            if self.metrics_file.exists():
-                with open(self.metrics_file, 'r', encoding='utf-8') as f:
-                    all_metrics = json.load(f)
-            else:
-                all_metrics = []
-                
-            # 添加新指标
-            all_metrics.append(metrics)
-            
-            # 只保留最近7天的数据
-            cutoff_time = datetime.now() - timedelta(days=7)
-            all_metrics = [
-                m for m in all_metrics 
-                if datetime.fromisoformat(m.get("timestamp", "")) > cutoff_time
-            ]
-            
-            # 保存数据
-            with open(self.metrics_file, 'w', encoding='utf-8') as f:
-                json.dump(all_metrics, f, ensure_ascii=False, indent=2)
-                
+            self.metrics_store.append(metrics)
         except Exception as e:
             print(f"保存指标失败: {e}")
     
-    def generate_report(self) -> Dict[str, Any]:
-        """生成监控报告"""
+    async def generate_report(self, session: aiohttp.ClientSession) -> Dict[str, Any]:
+        """生成监控报告：所有节点并发探测"""
         system_metrics = self.get_system_metrics()
-        app_metrics = self.get_app_metrics()
-        api_results = self.test_api_endpoints()
-        availability = self.calculate_availability()
-        alerts = self.check_alerts(system_metrics, app_metrics)
+        probes = await asyncio.gather(*(self.probe_target(session, url) for url in self.base_urls))
+        targets = dict(zip(self.base_urls, probes))
+        
+        alerts = self.check_alerts(system_metrics, {})
+        for url, probe in targets.items():
+            alerts.extend(self.check_alerts(system_metrics, probe["app_metrics"], url if len(targets) > 1 else ""))
+        
+        all_endpoints = [r for probe in probes for r in probe["api_endpoints"].values()]
+        healthy_targets = sum(1 for probe in probes if probe["app_metrics"].get("status") == "healthy")
+        
+        if len(targets) == 1:
+            app_metrics = probes[0]["app_metrics"]
+            api_results = probes[0]["api_endpoints"]
+        else:
+            # 多节点：全部节点健康才计为可用
+            app_metrics = {
+                "status": "healthy" if healthy_targets == len(targets) else "degraded",
+                "healthy_targets": healthy_targets,
+                "total_targets": len(targets)
+            }
+            api_results = {}
         
         report = {
             "timestamp": datetime.now().isoformat(),
             "system_metrics": system_metrics,
             "app_metrics": app_metrics,
             "api_endpoints": api_results,
-            "availability_24h": availability,
+            "targets": targets if len(targets) > 1 else None,
+            "availability_24h": self.calculate_availability(),
             "alerts": alerts,
             "summary": {
                 "status": "healthy" if not alerts else "warning",
                 "total_alerts": len(alerts),
                 "api_success_rate": sum(
-                    1 for r in api_results.values() if r.get("success", False)
-                ) / len(api_results) * 100 if api_results else 0
+                    1 for r in all_endpoints if r.get("success", False)
+                ) / len(all_endpoints) * 100 if all_endpoints else 0
             }
         }
         
         return report
     
+    def _print_target(self, app_metrics: Dict[str, Any], api_results: Dict[str, Any]):
+        """打印单个节点的应用指标和端点测试结果"""
+        if app_metrics:
+            print("🚀 应用指标:")
+            print(f"  状态: {app_metrics.get('status', 'unknown')}")
+            print(f"  响应时间: {app_metrics.get('response_time', 0):.3f}秒")
+            print(f"  版本: {app_metrics.get('version', 'unknown')}")
+            print(f"  活跃会话: {app_metrics.get('active_sessions', 0)}")
+            print(f"  AI审核: {'启用' if app_metrics.get('ai_check_enabled') else '禁用'}")
+            print()
+        
+        if api_results:
+            print("🔗 API端点测试:")
+            for endpoint, result in api_results.items():
+                status = "✅" if result.get("success") else "❌"
+                time_info = f"({result.get('response_time', 0):.3f}s)" if 'response_time' in result else ""
+                print(f"  {status} {endpoint} {time_info}")
+            print()
+    
     def print_report(self, report: Dict[str, Any]):
         """打印监控报告"""
         print("📊 WordPress发布系统V2.4 - 性能监控报告")
@@ -249,26 +388,17 @@ class PerformanceMonitor:
             print(f"  可用磁盘: {sys_metrics.get('disk_free_gb', 0):.1f}GB")
             print()
         
-        # 应用指标
-        app_metrics = report.get("app_metrics", {})
-        if app_metrics:
-            print("🚀 应用指标:")
-            print(f"  状态: {app_metrics.get('status', 'unknown')}")
-            print(f"  响应时间: {app_metrics.get('response_time', 0):.3f}秒")
-            print(f"  版本: {app_metrics.get('version', 'unknown')}")
-            print(f"  活跃会话: {app_metrics.get('active_sessions', 0)}")
-            print(f"  AI审核: {'启用' if app_metrics.get('ai_check_enabled') else '禁用'}")
-            print()
-        
-        # API端点测试
-        api_results = report.get("api_endpoints", {})
-        if api_results:
-            print("🔗 API端点测试:")
-            for endpoint, result in api_results.items():
-                status = "✅" if result.get("success") else "❌"
-                time_info = f"({result.get('response_time', 0):.3f}s)" if 'response_time' in result else ""
-                print(f"  {status} {endpoint} {time_info}")
+        targets = report.get("targets")
+        if targets:
+            # 多节点：逐个节点打印
+            app_metrics = report.get("app_metrics", {})
+            print(f"🌐 节点状态: {app_metrics.get('healthy_targets', 0)}/{app_metrics.get('total_targets', 0)} 健康")
             print()
+            for url, probe in targets.items():
+                print(f"📍 {url}")
+                self._print_target(probe.get("app_metrics", {}), probe.get("api_endpoints", {}))
+        else:
+            self._print_target(report.get("app_metrics", {}), report.get("api_endpoints", {}))
         
         # 可用性
         availability = report.get("availability_24h", 0)
@@ -286,36 +416,39 @@ class PerformanceMonitor:
         
         print("=" * 60)
     
-    def run_monitoring(self, interval: int = 60, duration: int = 0):
-        """运行持续监控"""
-        print(f"🔄 开始监控 (间隔: {interval}秒)")
+    async def run_monitoring(self, interval: float = 60, duration: float = 0, quiet: bool = False):
+        """运行持续监控：按固定节拍采样（支持亚秒级间隔），探测耗时不会累积到间隔中"""
+        print(f"🔄 开始监控 (间隔: {interval}秒, 节点数: {len(self.base_urls)})")
         
-        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        next_tick = start_time
         
-        try:
+        async with self.create_session() as session:
             while True:
-                # 生成报告
-                report = self.generate_report()
-                
-                # 保存指标
+                # 生成报告并保存指标
+                report = await self.generate_report(session)
                 self.save_metrics(report)
                 
                 # 打印报告
-                self.print_report(report)
+                if not quiet or report["alerts"]:
+                    self.print_report(report)
                 
                 # 检查是否需要停止
-                if duration > 0 and (time.time() - start_time) >= duration:
+                if duration > 0 and (loop.time() - start_time) >= duration:
                     break
-                    
-                # 等待下次监控
-                time.sleep(interval)
                 
-        except KeyboardInterrupt:
-            print("\n⏹️ 监控被用户中断")
+                # 等待下个节拍；探测超过一个间隔时跳过错过的节拍
+                next_tick += interval
+                now = loop.time()
+                if next_tick < now:
+                    next_tick = now
+                await asyncio.sleep(next_tick - now)
     
-    def run_single_check(self):
+    async def run_single_check(self):
         """运行单次检查"""
-        report = self.generate_report()
+        async with self.create_session() as session:
+            report = await self.generate_report(session)
         self.save_metrics(report)
         self.print_report(report)
         return report
@@ -325,22 +458,27 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="WordPress发布系统V2.4性能监控")
-    parser.add_argument("--url", default="http://localhost:8001", help="应用URL")
-    parser.add_argument("--interval", type=int, default=60, help="监控间隔(秒)")
-    parser.add_argument("--duration", type=int, default=0, help="监控持续时间(秒)，0表示持续监控")
+    parser.add_argument("--url", action="append", help="应用URL，可重复指定或用逗号分隔以监控多个节点")
+    parser.add_argument("--interval", type=float, default=60, help="监控间隔(秒)，支持小数")
+    parser.add_argument("--duration", type=float, default=0, help="监控持续时间(秒)，0表示持续监控")
+    parser.add_argument("--timeout", type=float, default=5.0, help="单次探测超时(秒)")
+    parser.add_argument("--quiet", action="store_true", help="只在有告警时打印报告")
     parser.add_argument("--single", action="store_true", help="运行单次检查")
     
     args = parser.parse_args()
     
-    monitor = PerformanceMonitor(args.url)
+    urls = [u.strip().rstrip("/") for item in (args.url or ["http://localhost:8001"]) for u in item.split(",") if u.strip()]
+    monitor = PerformanceMonitor(urls, request_timeout=args.timeout)
     
     try:
         if args.single:
-            monitor.run_single_check()
+            asyncio.run(monitor.run_single_check())
         else:
-            monitor.run_monitoring(args.interval, args.duration)
+            asyncio.run(monitor.run_monitoring(args.interval, args.duration, args.quiet))
+    except KeyboardInterrupt:
+        print("\n⏹️ 监控被用户中断")
     except Exception as e:
         print(f"❌ 监控失败: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -86,7 +86,7 @@ class SecurityAuditor:
         sensitive_files = [
             ".env",
             ".env.production", 
-            "main_v2_4.py"
+            "main_v2_4_final.py"
         ]
         
         for file_name in sensitive_files:
@@ -104,17 +104,19 @@ class SecurityAuditor:
                 elif mode.endswith("7"):  # 其他用户有写权限
                     self.log_issue("MEDIUM", f"{file_name}其他用户有写权限", "移除其他用户写权限")
     
+    def read_app_source(self) -> str:
+        """应用代码：入口文件和 wp_publisher 包"""
+        files = [self.project_root / "main_v2_4_final.py", *sorted((self.project_root / "wp_publisher").glob("*.py"))]
+        return "\n".join(path.read_text(encoding="utf-8") for path in files if path.exists())
+    
     def check_code_security(self):
         """检查代码安全性"""
         print("💻 检查代码安全性...")
         
-        main_file = self.project_root / "main_v2_4.py"
-        if not main_file.exists():
+        content = self.read_app_source()
+        if not content:
             return
             
-        with open(main_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
         # 检查潜在的安全问题
         security_patterns = [
             (r'eval\s*\(', "使用eval()函数", "避免使用eval()，使用安全的替代方案"),
@@ -164,15 +166,12 @@ class SecurityAuditor:
         """检查会话安全性"""
         print("🔑 检查会话安全性...")
         
-        main_file = self.project_root / "main_v2_4.py"
-        if not main_file.exists():
+        content = self.read_app_source()
+        if not content:
             return
             
-        with open(main_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
         # 检查会话配置
-        if 'httponly=True' not in content.lower():
+        if 'httponly=true' not in content.lower():
             self.log_issue("MEDIUM", "Cookie未设置HttpOnly", "设置HttpOnly防止XSS")
             
         if 'secure=False' in content:
@@ -3,18 +3,94 @@
 """
 WordPress 软文发布中间件 V2.4 启动脚本
 功能优化与审核逻辑调整版本
+
+默认以生产模式启动：gunicorn 管理多个 uvicorn 工作进程（uvloop + httptools），
+预加载应用、处理一定数量的请求后回收工作进程；--dev 为单进程 + 文件监视自动重载
+
+用法:
+    python start_v2_4.py                          # 生产模式，工作进程数默认为CPU核数
+    python start_v2_4.py --workers 4 --max-requests 5000
+    python start_v2_4.py --dev                    # 开发模式
 """
 
 import os
 import sys
+import shutil
+import argparse
+import importlib.util
 import subprocess
 from pathlib import Path
 
+APP = "main_v2_4_final:app"
+
+def parse_args():
+    """解析命令行参数（部分参数也可通过环境变量设置，方便在systemd中配置）"""
+    parser = argparse.ArgumentParser(description="WordPress软文发布中间件V2.4启动脚本")
+    parser.add_argument("--dev", action="store_true", help="开发模式：单进程，监视文件变化自动重载")
+    parser.add_argument("--host", default="0.0.0.0", help="监听地址")
+    parser.add_argument("--port", help="监听端口（默认读取 PORT 配置）")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "0")) or os.cpu_count() or 1,
+                        help="工作进程数（默认 WEB_CONCURRENCY 或CPU核数）")
+    parser.add_argument("--max-requests", type=int, default=int(os.getenv("MAX_REQUESTS", "10000")),
+                        help="工作进程处理该数量请求后被回收重启，防止内存缓慢增长（0为不回收）")
+    parser.add_argument("--max-requests-jitter", type=int, default=int(os.getenv("MAX_REQUESTS_JITTER", "1000")),
+                        help="回收阈值的随机偏移，避免所有工作进程同时重启")
+    parser.add_argument("--graceful-timeout", type=int, default=30, help="停止/回收时等待进行中请求完成的秒数")
+    parser.add_argument("--no-preload", action="store_true", help="不在主进程中预加载应用")
+    return parser.parse_args()
+
+def prepare_metrics_dir(script_dir: Path) -> Path:
+    """多进程指标目录：每次启动前清空，避免残留已退出进程的数据"""
+    metrics_dir = script_dir / "prometheus_multiproc"
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    metrics_dir.mkdir()
+    return metrics_dir
+
+def build_command(args, port: str) -> list:
+    """构建启动命令"""
+    if args.dev:
+        return [
+            sys.executable, "-m", "uvicorn", APP,
+            "--host", args.host,
+            "--port", port,
+            "--reload",
+            # 页面渲染结果缓存在内存中，修改模板后也需要重启
+            "--reload-include", "*.html"
+        ]
+    
+    if importlib.util.find_spec("gunicorn") is not None:
+        command = [
+            sys.executable, "-m", "gunicorn", APP,
+            "--config", "gunicorn_conf.py",
+            "--worker-class", "gunicorn_conf.UvloopWorker",
+            "--workers", str(args.workers),
+            "--bind", f"{args.host}:{port}",
+            "--max-requests", str(args.max_requests),
+            "--max-requests-jitter", str(args.max_requests_jitter),
+            "--graceful-timeout", str(args.graceful_timeout),
+        ]
+        if not args.no_preload:
+            command.append("--preload")
+        return command
+    
+    # 没有 gunicorn（例如Windows）：uvicorn 自带的多进程模式，不支持预加载
+    print("⚠️  未安装 gunicorn，使用 uvicorn 多进程模式（不支持预加载）")
+    return [
+        sys.executable, "-m", "uvicorn", APP,
+        "--host", args.host,
+        "--port", port,
+        "--workers", str(args.workers),
+        "--loop", "asyncio" if sys.platform == "win32" else "uvloop",
+        "--http", "httptools",
+        "--timeout-graceful-shutdown", str(args.graceful_timeout // 2),
+    ] + (["--limit-max-requests", str(args.max_requests)] if args.max_requests else [])
+
 def main():
     """启动V2.4版本的应用"""
+    args = parse_args()
     
     # 确保在正确的目录中
-    script_dir = Path(__file__).parent
+    script_dir = Path(__file__).parent.resolve()
     os.chdir(script_dir)
     
     print("🚀 启动 WordPress 软文发布中间件 V2.4")
@@ -35,7 +111,8 @@ def main():
     
     # 检查必要文件
     required_files = [
-        "main_v2_4.py",
+        "main_v2_4_final.py",
+        "gunicorn_conf.py",
         "requirements.txt",
         ".env",
         "templates/index_v2_4.html",
@@ -56,22 +133,23 @@ def main():
     # 检查环境变量
     print("🔍 检查环境配置...")
     
-    # 加载.env文件
+    # 读取.env文件（只用于检查，不写入进程环境：写入后会传给工作进程，
+    # 而进程环境变量优先于 .env，管理后台修改的配置就不会生效）
     try:
-        from dotenv import load_dotenv
-        load_dotenv()
+        from dotenv import dotenv_values
     except ImportError:
         print("❌ 错误: 请先安装依赖包")
         print("运行: pip install -r requirements.txt")
         sys.exit(1)
+    config = {**dotenv_values(".env"), **os.environ}
     
     # 检查关键配置
-    wp_domain = os.getenv("WP_DOMAIN")
-    wp_username = os.getenv("WP_USERNAME")
-    wp_app_password = os.getenv("WP_APP_PASSWORD")
-    admin_user = os.getenv("ADMIN_USER")
-    admin_pass = os.getenv("ADMIN_PASS")
-    enable_ai_check = os.getenv("ENABLE_AI_CHECK", "true").lower()
+    wp_domain = config.get("WP_DOMAIN")
+    wp_username = config.get("WP_USERNAME")
+    wp_app_password = config.get("WP_APP_PASSWORD")
+    admin_user = config.get("ADMIN_USER")
+    admin_pass = config.get("ADMIN_PASS")
+    enable_ai_check = (config.get("ENABLE_AI_CHECK") or "true").lower()
     
     if not all([wp_domain, wp_username, wp_app_password, admin_user, admin_pass]):
         print("⚠️  警告: 部分配置未设置，将使用测试模式")
@@ -86,9 +164,11 @@ def main():
     
     # 显示AI审核状态
     if enable_ai_check == "true":
-        baidu_api_key = os.getenv("BAIDU_API_KEY")
-        baidu_secret_key = os.getenv("BAIDU_SECRET_KEY")
-        if baidu_api_key and baidu_secret_key:
+        baidu_api_key = config.get("BAIDU_API_KEY")
+        baidu_secret_key = config.get("BAIDU_SECRET_KEY")
+        if (config.get("BAIDU_LIVE_AUDIT") or "false").lower() != "true":
+            print("🤖 AI审核: 已启用（未设置 BAIDU_LIVE_AUDIT=true，不调用百度接口，审核直接通过）")
+        elif baidu_api_key and baidu_secret_key:
             print("🤖 AI审核: 已启用 (百度AI)")
         else:
             print("⚠️  AI审核: 已启用但缺少百度AI密钥")
@@ -99,7 +179,15 @@ def main():
     
     # 启动应用
     try:
-        port = os.getenv("PORT", "8002")  # 在try块开始就定义port变量
+        port = args.port or config.get("PORT") or "8004"  # 在try块开始就定义port变量
+        command = build_command(args, port)
+        env = os.environ.copy()
+        if args.dev:
+            print("🛠️ 开发模式: 单进程，文件变化时自动重载")
+        else:
+            env["PROMETHEUS_MULTIPROC_DIR"] = str(prepare_metrics_dir(script_dir))
+            print(f"🏭 生产模式: {args.workers} 个工作进程，每 {args.max_requests or '∞'} 个请求回收，"
+                  f"{'不' if args.no_preload else ''}预加载应用")
         print("🌐 启动Web服务器...")
         print(f"📍 访问地址: http://localhost:{port}")
         print("🔑 管理员登录: admin / admin123456")
@@ -108,14 +196,10 @@ def main():
         print("按 Ctrl+C 停止服务器")
         print()
         
-        # 使用uvicorn启动
-        subprocess.run([
-            sys.executable, "-m", "uvicorn",
-            "main_v2_4:app",
-            "--host", "0.0.0.0",
-            "--port", port,
-            "--reload"
-        ])
+        if os.name == "posix" and not args.dev:
+            # 用进程管理器替换当前进程，systemd 的停止/重载信号直接发给 gunicorn 主进程
+            os.execve(sys.executable, command, env)
+        subprocess.run(command, env=env)
         
     except KeyboardInterrupt:
         print("\n👋 服务器已停止")
@@ -5,6 +5,8 @@
 let publishHistory = JSON.parse(localStorage.getItem('publishHistory') || '[]');
 let currentConfig = {};
 let currentUser = null; // 当前登录用户信息
+let eventSource = null; // 服务器推送事件连接
+let statsSummary = null; // 服务端发布统计汇总（/api/stats/summary）
 
 // 页面加载完成后初始化
 document.addEventListener('DOMContentLoaded', function() {
@@ -16,14 +18,44 @@ function initializeAdmin() {
     // 获取用户信息
     loadUserInfo();
     
-    loadStatistics();
+    loadStatistics(); // 统计汇总加载后绘制图表
     loadCurrentConfig();
     loadSystemLogs();
     loadPublishHistory();
-    drawChart();
     
-    // 定期刷新数据
-    setInterval(refreshAll, 60000); // 每分钟刷新一次
+    // 订阅服务器推送：配置或发布数据有变化时刷新，不再每分钟轮询
+    subscribeEvents();
+}
+
+// 订阅服务器推送事件
+function subscribeEvents() {
+    if (!window.EventSource) {
+        // 浏览器不支持 SSE 时退回定时刷新
+        setInterval(refreshAll, 60000); // 每分钟刷新一次
+        return;
+    }
+    
+    // 只订阅本页用到的事件；本页的发布历史是浏览器本地的发布记录，不使用服务器推送的文章列表
+    eventSource = new EventSource('/api/events?events=config,summary');
+    
+    // 配置已修改（本页或其他管理员保存、直接编辑 .env）
+    eventSource.addEventListener('config', function() {
+        loadCurrentConfig();
+    });
+    
+    // 有新的发布（含失败和审核拒绝）：重新读取统计汇总并重绘图表
+    eventSource.addEventListener('summary', function() {
+        loadStatistics();
+    });
+    
+    eventSource.onerror = function() {
+        // 连接中断时浏览器会自动重连；连接被拒绝（如会话过期）时检查登录状态后稍后重新订阅
+        if (eventSource.readyState === EventSource.CLOSED) {
+            eventSource = null;
+            loadUserInfo();
+            setTimeout(subscribeEvents, 30000);
+        }
+    };
 }
 
 // 获取用户信息
@@ -103,27 +135,26 @@ async function logout() {
     }
 }
 
-// 加载统计数据
-function loadStatistics() {
-    const total = publishHistory.length;
-    const successful = publishHistory.filter(item => item.success).length;
-    const successRate = total > 0 ? Math.round((successful / total) * 100) : 0;
-    
-    // 今日发布数
-    const today = new Date().toDateString();
-    const todayCount = publishHistory.filter(item => 
-        new Date(item.timestamp).toDateString() === today
-    ).length;
-    
-    // 审核拒绝数
-    const rejectedCount = publishHistory.filter(item => 
-        !item.success && (item.message.includes('审核') || item.message.includes('敏感'))
-    ).length;
-
-    document.getElementById('totalPublished').textContent = total;
-    document.getElementById('successRate').textContent = successRate + '%';
-    document.getElementById('todayPublished').textContent = todayCount;
-    document.getElementById('auditRejected').textContent = rejectedCount;
+// 加载统计数据（服务端汇总，所有浏览器看到的数字一致）
+async function loadStatistics() {
+    try {
+        const response = await fetch('/api/stats/summary?days=7');
+        const result = await response.json();
+        if (result.status !== 'success') {
+            console.error('统计汇总获取失败:', result.message);
+            return;
+        }
+        statsSummary = result;
+    } catch (error) {
+        console.error('统计汇总获取失败:', error);
+        return;
+    }
+    
+    document.getElementById('totalPublished').textContent = statsSummary.total;
+    document.getElementById('successRate').textContent = Math.round(statsSummary.success_rate) + '%';
+    document.getElementById('todayPublished').textContent = statsSummary.today;
+    document.getElementById('auditRejected').textContent = statsSummary.audit_rejected;
+    drawChart();
 }
 
 // 加载发布历史
@@ -160,8 +191,6 @@ function clearHistory() {
         publishHistory = [];
         localStorage.removeItem('publishHistory');
         loadPublishHistory();
-        loadStatistics();
-        drawChart();
         showConfigMessage('历史记录已清空', 'success');
     }
 }
@@ -455,25 +484,14 @@ function drawChart() {
     // 清空画布
     ctx.clearRect(0, 0, canvas.width, canvas.height);
     
-    // 准备数据 - 最近7天的发布数据
-    const days = [];
-    const publishCounts = [];
-    const successCounts = [];
-    
-    for (let i = 6; i >= 0; i--) {
-        const date = new Date();
-        date.setDate(date.getDate() - i);
-        const dateStr = date.toDateString();
-        
-        days.push(date.getMonth() + 1 + '/' + date.getDate());
-        
-        const dayItems = publishHistory.filter(item => 
-            new Date(item.timestamp).toDateString() === dateStr
-        );
-        
-        publishCounts.push(dayItems.length);
-        successCounts.push(dayItems.filter(item => item.success).length);
-    }
+    // 准备数据 - 最近7天的发布数据（服务端已按日汇总）
+    const series = statsSummary ? statsSummary.series : { days: [], total: [], success: [] };
+    const days = series.days.map(day => {
+        const [, month, date] = day.split('-');
+        return parseInt(month, 10) + '/' + parseInt(date, 10);
+    });
+    const publishCounts = series.total;
+    const successCounts = series.success;
     
     // 绘制图表
     const maxCount = Math.max(...publishCounts, 1);
@@ -562,7 +580,6 @@ function refreshAll() {
     loadCurrentConfig();
     loadSystemLogs();
     loadPublishHistory();
-    drawChart();
 }
 
 // 导出系统报告
@@ -575,17 +592,16 @@ function exportSystemReport() {
             role: currentUser.role,
             login_time: currentUser.login_time
         } : null,
-        statistics: {
-            total: publishHistory.length,
-            successful: publishHistory.filter(item => item.success).length,
-            failed: publishHistory.filter(item => !item.success).length,
-            today: publishHistory.filter(item => 
-                new Date(item.timestamp).toDateString() === new Date().toDateString()
-            ).length,
-            auditRejected: publishHistory.filter(item => 
-                !item.success && (item.message.includes('审核') || item.message.includes('敏感'))
-            ).length
-        },
+        statistics: statsSummary ? {
+            total: statsSummary.total,
+            successful: statsSummary.success,
+            failed: statsSummary.total - statsSummary.success,
+            today: statsSummary.today,
+            auditRejected: statsSummary.audit_rejected,
+            byPublishType: statsSummary.by_publish_type,
+            byUser: statsSummary.by_user,
+            series: statsSummary.series
+        } : null,
         configuration: {
             wp_configured: currentConfig.wp_domain && currentConfig.wp_username && currentConfig.wp_app_password,
             baidu_configured: currentConfig.baidu_api_key && currentConfig.baidu_secret_key,
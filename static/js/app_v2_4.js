@@ -7,6 +7,19 @@ let quillEditor = null;
 let currentMode = 'edit'; // edit, code, preview
 let currentUser = null; // 当前登录用户信息
 let monthlyCount = 0; // 本月发布数量
+let eventSource = null; // 服务器推送事件连接
+let pendingJob = null; // 当前标签页正在进行的发布 {id, type}（用于匹配发布进度事件）
+
+// 草稿同步：停止输入一段时间后只把变化的部分提交到服务器（/api/draft），换电脑登录也能继续编辑
+const DRAFT_SYNC_DELAY = 1500; // 停止输入多久后同步（毫秒）
+const DRAFT_SYNC_MAX_WAIT = 10000; // 持续输入时最长多久同步一次（毫秒）
+const LEGACY_DRAFT_KEY = 'formData_v2_4'; // 旧版本保存在浏览器本地的草稿
+let syncedDraft = { version: 0, title: '', content: '', mode: '' }; // 服务器上的最新版本
+let draftLoaded = false; // 草稿恢复完成前不同步，避免用空表单覆盖服务器上的草稿
+let draftTimer = null;
+let draftFirstChange = 0;
+let draftSyncing = null; // 进行中的同步
+let draftPending = false; // 同步进行中又有新的修改
 
 // DOM元素
 const publishForm = document.getElementById('publishForm');
@@ -34,10 +47,10 @@ function initializeApp() {
     // 绑定表单提交事件
     publishForm.addEventListener('submit', handleFormSubmit);
     
-    // 从localStorage恢复表单数据
+    // 从服务器恢复草稿
     restoreFormData();
     
-    // 绑定输入事件保存表单数据
+    // 绑定输入事件同步草稿
     bindFormDataSaving();
     
     // 绑定快捷键
@@ -46,9 +59,63 @@ function initializeApp() {
     // V2.4新增：加载发布历史
     loadPublishHistory();
     
-    // 定期刷新统计数据和历史
-    setInterval(loadMonthlyStats, 300000); // 每5分钟刷新一次
-    setInterval(loadPublishHistory, 600000); // 每10分钟刷新一次历史
+    // 订阅服务器推送：统计、历史和发布进度有变化时由服务器推送，不再定时轮询
+    subscribeEvents();
+}
+
+// 订阅服务器推送事件
+function subscribeEvents() {
+    if (!window.EventSource) {
+        // 浏览器不支持 SSE 时退回定时刷新
+        setInterval(loadMonthlyStats, 300000); // 每5分钟刷新一次
+        setInterval(loadPublishHistory, 600000); // 每10分钟刷新一次历史
+        return;
+    }
+    
+    eventSource = new EventSource('/api/events');
+    
+    eventSource.addEventListener('stats', function(event) {
+        const data = JSON.parse(event.data);
+        monthlyCount = data.monthly_count;
+        updateMonthlyDisplay(data.monthly_count, data.current_month);
+    });
+    
+    eventSource.addEventListener('history', function(event) {
+        displayPublishHistory(JSON.parse(event.data).posts);
+    });
+    
+    eventSource.addEventListener('publish', function(event) {
+        const data = JSON.parse(event.data);
+        if (pendingJob && data.job_id === pendingJob.id) {
+            showPublishProgress(data.stage, pendingJob.type);
+        }
+    });
+    
+    eventSource.onerror = function() {
+        // 连接中断时浏览器会自动重连；连接被拒绝（如会话过期）时不再重连，检查登录状态后稍后重新订阅
+        if (eventSource.readyState === EventSource.CLOSED) {
+            eventSource = null;
+            loadUserInfo();
+            setTimeout(subscribeEvents, 30000);
+        }
+    };
+}
+
+// 生成发布任务ID（作为 X-Request-ID 发送，服务器推送的发布进度以此匹配）
+function newJobId() {
+    return Date.now().toString(16) + Math.random().toString(16).slice(2, 10);
+}
+
+// 显示发布进度
+function showPublishProgress(stage, publishType) {
+    const stageText = {
+        audit: '🔍 内容审核中...',
+        wp: '📤 提交到WordPress...'
+    }[stage];
+    if (!stageText) return;
+    
+    const button = document.getElementById(publishType === 'headline' ? 'headlineBtn' : 'submitBtn');
+    button.innerHTML = `${stageText} <span class="loading"><span class="spinner"></span></span>`;
 }
 
 // 获取用户信息
@@ -266,14 +333,14 @@ async function logout() {
     }
     
     try {
+        // 退出前提交尚未同步的草稿修改
+        await syncDraft();
+        
         const response = await fetch('/logout', {
             method: 'POST'
         });
         
         if (response.ok) {
-            // 清除本地数据
-            localStorage.removeItem('formData_v2_4');
-            
             // 重定向到登录页
             window.location.href = '/login';
         } else {
@@ -554,10 +621,12 @@ async function handleFormSubmit(event) {
     setLoadingState(true, 'normal');
     
     try {
+        pendingJob = { id: newJobId(), type: formData.publish_type };
         const response = await fetch('/publish', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
+                'X-Request-ID': pendingJob.id
             },
             body: JSON.stringify(formData)
         });
@@ -594,6 +663,7 @@ async function handleFormSubmit(event) {
         // 保存错误到历史记录
         saveToHistory(formData, { status: 'error', message: '网络连接失败' }, 0);
     } finally {
+        pendingJob = null;
         setLoadingState(false, 'normal');
     }
 }
@@ -623,10 +693,12 @@ async function publishToHeadline() {
     setLoadingState(true, 'headline');
     
     try {
+        pendingJob = { id: newJobId(), type: formData.publish_type };
         const response = await fetch('/publish', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
+                'X-Request-ID': pendingJob.id
             },
             body: JSON.stringify(formData)
         });
@@ -660,6 +732,7 @@ async function publishToHeadline() {
         // 保存错误到历史记录
         saveToHistory(formData, { status: 'error', message: '网络连接失败' }, 0);
     } finally {
+        pendingJob = null;
         setLoadingState(false, 'headline');
     }
 }
@@ -801,10 +874,13 @@ function resetForm() {
     showMessage('表单已重置', 'success');
 }
 
-// 保存草稿
-function saveDraft() {
-    saveFormData();
-    showMessage('草稿已保存到本地', 'success');
+// 保存草稿（立即同步到服务器）
+async function saveDraft() {
+    if (await syncDraft()) {
+        showMessage('草稿已保存', 'success');
+    } else {
+        showMessage('草稿保存失败，请检查网络连接', 'error');
+    }
 }
 
 // 设置加载状态 - 支持不同按钮类型
@@ -875,8 +951,8 @@ function saveToHistory(formData, result, httpStatus) {
     localStorage.setItem('publishHistory', JSON.stringify(publishHistory));
 }
 
-// 保存表单数据到localStorage
-function saveFormData() {
+// 当前表单对应的草稿字段
+function getFormDraft() {
     let content = '';
     if (currentMode === 'code') {
         content = codeEditor.value;
@@ -884,48 +960,210 @@ function saveFormData() {
         content = quillEditor.root.innerHTML;
     }
     
-    const formData = {
+    return {
         title: titleInput.value,
-        content: content,
-        mode: currentMode // V2.4新增：保存当前编辑模式
+        content: content === '<p><br></p>' ? '' : content, // Quill 的空文档
+        mode: currentMode === 'code' ? 'code' : 'edit' // V2.4新增：保存当前编辑模式
     };
-    localStorage.setItem('formData_v2_4', JSON.stringify(formData));
 }
 
-// 从localStorage恢复表单数据
-function restoreFormData() {
-    const savedData = localStorage.getItem('formData_v2_4');
-    if (savedData) {
-        try {
-            const formData = JSON.parse(savedData);
-            titleInput.value = formData.title || '';
-            
-            if (formData.content) {
-                if (formData.mode === 'code') {
-                    // 恢复代码模式
-                    codeEditor.value = formData.content;
-                    switchMode('code');
-                } else {
-                    // 恢复富文本模式
-                    const delta = quillEditor.clipboard.convert(formData.content);
-                    quillEditor.setContents(delta);
-                }
+// 服务器返回的草稿（没有草稿时为空）
+function draftBase(draft, version) {
+    if (!draft) {
+        return { version: version || 0, title: '', content: '', mode: '' };
+    }
+    return { version: draft.version, title: draft.title, content: draft.content, mode: draft.mode };
+}
+
+// 比较字段新旧值，生成一次替换：从 start 起删除 delete 个字符，再插入 insert（位置按 UTF-16 码元，与服务器一致）
+function diffField(field, oldValue, newValue) {
+    if (oldValue === newValue) {
+        return null;
+    }
+    
+    const minLength = Math.min(oldValue.length, newValue.length);
+    let start = 0;
+    while (start < minLength && oldValue.charCodeAt(start) === newValue.charCodeAt(start)) {
+        start++;
+    }
+    // 不拆开代理对（emoji 等）
+    if (start > 0 && isHighSurrogate(oldValue.charCodeAt(start - 1))) {
+        start--;
+    }
+    
+    let oldEnd = oldValue.length;
+    let newEnd = newValue.length;
+    while (oldEnd > start && newEnd > start && oldValue.charCodeAt(oldEnd - 1) === newValue.charCodeAt(newEnd - 1)) {
+        oldEnd--;
+        newEnd--;
+    }
+    if (oldEnd < oldValue.length && isLowSurrogate(oldValue.charCodeAt(oldEnd))) {
+        oldEnd++;
+        newEnd++;
+    }
+    
+    return { field: field, start: start, delete: oldEnd - start, insert: newValue.slice(start, newEnd) };
+}
+
+function isHighSurrogate(code) {
+    return code >= 0xD800 && code <= 0xDBFF;
+}
+
+function isLowSurrogate(code) {
+    return code >= 0xDC00 && code <= 0xDFFF;
+}
+
+// 表单有修改：停止输入 DRAFT_SYNC_DELAY 后同步，持续输入时最迟 DRAFT_SYNC_MAX_WAIT 同步一次
+function saveFormData() {
+    if (!draftLoaded) {
+        return;
+    }
+    
+    const now = Date.now();
+    if (!draftTimer) {
+        draftFirstChange = now;
+    }
+    clearTimeout(draftTimer);
+    const wait = Math.max(0, Math.min(DRAFT_SYNC_DELAY, draftFirstChange + DRAFT_SYNC_MAX_WAIT - now));
+    draftTimer = setTimeout(syncDraft, wait);
+}
+
+// 立即同步草稿，返回是否成功；keepalive 用于页面关闭时仍能发出请求
+async function syncDraft(keepalive = false) {
+    clearTimeout(draftTimer);
+    draftTimer = null;
+    if (!draftLoaded) {
+        return false;
+    }
+    if (draftSyncing) {
+        // 上一次同步完成后再比较，保证修改基于最新版本
+        draftPending = true;
+        return draftSyncing;
+    }
+    
+    draftSyncing = pushDraft(keepalive, 1);
+    try {
+        return await draftSyncing;
+    } catch (error) {
+        console.error('草稿同步失败:', error);
+        return false;
+    } finally {
+        draftSyncing = null;
+        if (draftPending) {
+            draftPending = false;
+            saveFormData();
+        }
+    }
+}
+
+// 把当前表单与服务器版本的差异提交到服务器
+async function pushDraft(keepalive, retries) {
+    const current = getFormDraft();
+    const ops = ['title', 'content', 'mode']
+        .map(field => diffField(field, syncedDraft[field], current[field]))
+        .filter(op => op !== null);
+    if (ops.length === 0) {
+        return true;
+    }
+    
+    const response = await fetch('/api/draft', {
+        method: 'PATCH',
+        keepalive: keepalive,
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ base_version: syncedDraft.version, ops: ops, length: current.content.length })
+    });
+    const result = await response.json();
+    
+    if (response.ok) {
+        syncedDraft = { version: result.version, ...current };
+        return true;
+    }
+    if (response.status === 409 && retries > 0) {
+        // 其他页面修改过草稿：以服务器最新版本为基础重新比较，以当前页面的内容为准
+        syncedDraft = draftBase(result.draft, result.version);
+        return pushDraft(keepalive, retries - 1);
+    }
+    console.error('草稿同步失败:', result.message);
+    return false;
+}
+
+// 从服务器恢复草稿
+async function restoreFormData() {
+    try {
+        const response = await fetch('/api/draft');
+        const result = await response.json();
+        if (result.status !== 'success') {
+            console.error('恢复草稿失败:', result.message);
+            return;
+        }
+        syncedDraft = draftBase(result.draft, result.version);
+        
+        // 旧版本保存在本地的草稿：服务器上没有草稿时迁移到服务器
+        let draft = syncedDraft;
+        const legacyData = localStorage.getItem(LEGACY_DRAFT_KEY);
+        if (legacyData) {
+            localStorage.removeItem(LEGACY_DRAFT_KEY);
+            const legacy = JSON.parse(legacyData);
+            if (!draft.title && !draft.content) {
+                draft = { title: legacy.title || '', content: legacy.content || '', mode: legacy.mode };
             }
-            updateCharCount();
-        } catch (error) {
-            console.error('恢复表单数据失败:', error);
         }
+        
+        fillForm(draft);
+        draftLoaded = true;
+        if (draft !== syncedDraft) {
+            syncDraft();
+        }
+    } catch (error) {
+        console.error('恢复草稿失败:', error);
     }
 }
 
-// 清空表单数据
-function clearFormData() {
-    localStorage.removeItem('formData_v2_4');
+// 把草稿填入表单
+function fillForm(draft) {
+    titleInput.value = draft.title || '';
+    
+    if (draft.content) {
+        if (draft.mode === 'code') {
+            // 恢复代码模式（切换模式时会用富文本编辑器的内容覆盖代码编辑器，之后再填入）
+            switchMode('code');
+            codeEditor.value = draft.content;
+        } else {
+            // 恢复富文本模式
+            const delta = quillEditor.clipboard.convert(draft.content);
+            quillEditor.setContents(delta);
+        }
+    }
+    updateCharCount();
+}
+
+// 清空草稿（发布成功、重置表单后）
+async function clearFormData() {
+    clearTimeout(draftTimer);
+    draftTimer = null;
+    try {
+        const response = await fetch('/api/draft', { method: 'DELETE' });
+        const result = await response.json();
+        if (result.status === 'success') {
+            syncedDraft = draftBase(null, result.version);
+        }
+    } catch (error) {
+        console.error('清空草稿失败:', error);
+    }
 }
 
 // 绑定表单数据保存事件
 function bindFormDataSaving() {
     titleInput.addEventListener('input', saveFormData);
+    
+    // 切换到其他标签页或关闭页面时立即提交尚未同步的修改
+    document.addEventListener('visibilitychange', function() {
+        if (document.visibilityState === 'hidden' && draftTimer) {
+            syncDraft(true);
+        }
+    });
 }
 
 // 字符计数功能
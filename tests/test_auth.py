@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+会话与权限测试
+"""
+
+from dataclasses import replace
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from wp_publisher import auth
+from wp_publisher.app import auth_middleware
+from wp_publisher.auth import is_public_path
+from wp_publisher.settings import get_settings
+
+
+@pytest.fixture
+def metrics_app(monkeypatch):
+    """只带认证中间件和 /metrics 的应用；TestClient 的来源地址为 testclient"""
+    settings = replace(get_settings(), metrics_token="secret-token", metrics_allow_ips=("127.0.0.1", "::1"))
+    monkeypatch.setattr(auth, "get_settings", lambda: settings)
+    app = FastAPI()
+    app.middleware("http")(auth_middleware)
+
+    @app.get("/metrics")
+    async def metrics_endpoint():
+        return {"ok": True}
+
+    @app.get("/metrics-export")
+    async def lookalike():
+        return {"ok": True}
+
+    return app
+
+
+def test_metrics_is_not_a_public_path():
+    assert not is_public_path("/metrics")
+    assert not is_public_path("/metrics-export")
+
+
+def test_metrics_requires_token_or_allowed_address(metrics_app):
+    client = TestClient(metrics_app)
+    assert client.get("/metrics").status_code == 403
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 403
+    assert client.get("/metrics", headers={"Authorization": "Bearer secret-token"}).status_code == 200
+    # 前缀相同的其他路径仍需要登录
+    assert client.get("/metrics-export", follow_redirects=False).status_code == 302
+
+
+def make_request(host: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/metrics", "headers": [], "client": (host, 50000)})
+
+
+def test_metrics_allows_listed_addresses(metrics_app):
+    assert auth.metrics_access_allowed(make_request("127.0.0.1"))
+    assert auth.metrics_access_allowed(make_request("::1"))
+    assert not auth.metrics_access_allowed(make_request("203.0.113.7"))
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+客户端快照测试
+"""
+
+import time
+import asyncio
+import socket
+import threading
+
+import uvicorn
+
+from wp_publisher import clients
+from wp_publisher.clients import ClientBundle
+from wp_publisher.settings import Settings
+
+
+def make_settings(domain: str) -> Settings:
+    return Settings.from_mapping({"WP_DOMAIN": domain, "WP_USERNAME": "u", "WP_APP_PASSWORD": "p"})
+
+
+def test_close_clients_closes_bundles_still_in_grace_period():
+    async def scenario():
+        old_settings, new_settings = make_settings("https://old.example"), make_settings("https://new.example")
+        clients.init_clients(old_settings)
+        old_wp = clients.get_clients().wp
+        old_session = await old_wp.get_session()
+
+        clients.rebuild_clients(old_settings, new_settings)
+        assert clients.get_clients().wp is not old_wp
+        assert len(ClientBundle._retiring) == 1
+        assert not old_session.closed
+
+        await clients.close_clients()
+        return old_session
+
+    old_session = asyncio.run(scenario())
+    assert old_session.closed
+    assert not ClientBundle._retiring
+
+
+def test_text_audit_does_not_call_baidu_unless_live_audit_is_enabled(monkeypatch):
+    calls = []
+
+    async def fake_live_audit(self, text, retry_count=1):
+        calls.append(text)
+        return {"conclusionType": 2}
+
+    monkeypatch.setattr(clients.BaiduAIClient, "live_audit", fake_live_audit)
+    keys = {"BAIDU_API_KEY": "k", "BAIDU_SECRET_KEY": "s"}
+
+    placeholder = clients.BaiduAIClient(Settings.from_mapping(keys))
+    assert asyncio.run(placeholder.text_audit("正文"))["conclusionType"] == 1
+    assert placeholder.token_status()["mode"] == "placeholder"
+    assert calls == []
+
+    live = clients.BaiduAIClient(Settings.from_mapping({**keys, "BAIDU_LIVE_AUDIT": "true"}))
+    assert asyncio.run(live.text_audit("正文"))["conclusionType"] == 2
+    assert live.token_status()["mode"] == "live"
+    assert calls == ["正文"]
+
+
+def test_concurrent_audits_after_token_expiry_refresh_the_token_once():
+    import fake_baidu
+
+    fake = fake_baidu.create_app(fake_baidu.FakeBaiduConfig())
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(fake, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    try:
+        while not server.started:
+            time.sleep(0.05)
+        baidu = clients.BaiduAIClient(Settings.from_mapping({
+            "BAIDU_API_KEY": "fake_api_key", "BAIDU_SECRET_KEY": "fake_secret_key",
+            "BAIDU_API_BASE": f"http://127.0.0.1:{port}", "BAIDU_LIVE_AUDIT": "true",
+        }))
+
+        async def scenario():
+            await baidu.text_audit("第一篇")
+            # 服务端令牌提前失效，本地缓存仍认为有效：所有并发请求都会收到错误码 111
+            fake.state.baidu.tokens = dict.fromkeys(fake.state.baidu.tokens, 0.0)
+            results = await asyncio.gather(*(baidu.text_audit(f"第{i}篇") for i in range(10)))
+            await baidu.close()
+            return results
+
+        results = asyncio.run(scenario())
+        assert all(result["conclusionType"] == 1 for result in results)
+        assert fake.state.baidu.stats["token_expired"] == 10
+        assert fake.state.baidu.stats["token_requests"] == 2
+    finally:
+        server.should_exit = True
+        thread.join(5)
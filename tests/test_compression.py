@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+响应压缩测试
+"""
+
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from fastapi.testclient import TestClient
+
+from wp_publisher import compression
+from wp_publisher.compression import CompressionMiddleware, negotiate
+
+BODY = "发布历史" * 1000
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.api_route("/text", methods=["GET", "HEAD"])
+    async def text():
+        return PlainTextResponse(BODY, headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/events")
+    async def events():
+        async def stream():
+            yield b"retry: 5000\n\n"
+            yield b"data: " + BODY.encode() + b"\n\n"
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.get("/partial")
+    async def partial():
+        return PlainTextResponse(BODY[:600], status_code=206, headers={"Content-Range": "bytes 0-1799/12000"})
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("br;q=0, gzip;q=0.0", None),
+    ("identity", None),
+    ("", None),
+])
+def test_negotiate(monkeypatch, accept_encoding, expected):
+    monkeypatch.setattr(compression, "SUPPORTED_ENCODINGS", ("br", "gzip"))
+    assert negotiate(accept_encoding) == expected
+
+
+def test_gzip_response_has_vary_and_weak_etag(client):
+    response = client.get("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"abc"'
+    assert int(response.headers["content-length"]) < len(BODY.encode())
+    assert response.text == BODY
+
+
+def test_identity_response_is_unchanged(client):
+    response = client.get("/text", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"abc"'
+    assert response.text == BODY
+
+
+def test_small_response_is_not_compressed(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_event_stream_is_not_compressed(client):
+    response = client.get("/events", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.content.startswith(b"retry: 5000\n\n")
+
+
+def test_partial_content_is_not_compressed(client):
+    response = client.get("/partial", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 206
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-range"] == "bytes 0-1799/12000"
+
+
+def test_head_keeps_the_uncompressed_headers(client):
+    get = client.get("/text", headers={"Accept-Encoding": "identity"})
+    response = client.head("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-length"] == get.headers["content-length"]
+    assert response.headers["etag"] == '"abc"'
+    assert response.content == b""
+
+
+def test_streamed_body_is_compressed_in_chunks():
+    compressor = compression.StreamCompressor("gzip")
+    data = compressor.compress(b"a" * 5000) + compressor.compress(b"b" * 5000) + compressor.finish()
+    assert gzip.decompress(data) == b"a" * 5000 + b"b" * 5000
+
+
+def test_weak_etag_still_revalidates_static_files(tmp_path):
+    (tmp_path / "app.js").write_text("console.log(1);\n" * 200, encoding="utf-8")
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+    app.mount("/static", StaticFiles(directory=str(tmp_path)))
+    client = TestClient(app)
+
+    response = client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].startswith("W/")
+
+    revalidated = client.get("/static/app.js", headers={
+        "Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]
+    })
+    assert revalidated.status_code == 304
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+草稿同步测试
+"""
+
+import pytest
+
+from wp_publisher.drafts import (
+    MAX_LENGTHS, DraftConflictError, DraftStore, DraftTooLargeError, apply_patch, utf16_length,
+)
+
+EMPTY = {"title": "", "content": "", "mode": ""}
+
+
+def op(field: str, start: int, delete: int, insert: str) -> dict:
+    return {"field": field, "start": start, "delete": delete, "insert": insert}
+
+
+@pytest.fixture
+def store(tmp_path):
+    drafts = DraftStore(tmp_path / "drafts.sqlite3")
+    yield drafts
+    drafts.close()
+
+
+def test_offsets_are_utf16_code_units():
+    # "😀" 在浏览器中长度为 2（代理对），位置与 JavaScript 的字符串下标一致
+    draft = {**EMPTY, "content": "a😀b"}
+    assert utf16_length(draft["content"]) == 4
+    assert apply_patch(draft, [op("content", 3, 1, "c")])["content"] == "a😀c"
+    assert apply_patch(draft, [op("content", 1, 2, "中")])["content"] == "a中b"
+    assert apply_patch(draft, [op("content", 1, 0, "🎉"), op("content", 5, 1, "")])["content"] == "a🎉😀"
+
+
+def test_patch_bumps_version_and_round_trips(store):
+    assert store.get("alice") is None
+    assert store.patch("alice", 0, [op("title", 0, 0, "标题"), op("content", 0, 0, "<p>正文😀</p>")]) == 1
+    assert store.patch("alice", 1, [op("mode", 0, 0, "html")], length=utf16_length("<p>正文😀</p>")) == 2
+
+    draft = store.get("alice")
+    assert (draft["version"], draft["title"], draft["content"], draft["mode"]) == (2, "标题", "<p>正文😀</p>", "html")
+
+
+def test_stale_base_version_is_rejected_with_latest(store):
+    store.patch("alice", 0, [op("content", 0, 0, "第一版")])
+    store.patch("alice", 1, [op("content", 3, 0, "，第二版")])
+
+    with pytest.raises(DraftConflictError) as excinfo:
+        store.patch("alice", 1, [op("content", 0, 0, "旧页面")])
+    assert excinfo.value.latest["version"] == 2
+    assert excinfo.value.latest["content"] == "第一版，第二版"
+    assert store.get("alice")["version"] == 2
+
+
+@pytest.mark.parametrize("bad_op", [
+    op("content", 4, 0, "x"),
+    op("content", 2, 3, ""),
+    op("content", -1, 0, "x"),
+    op("content", 0, -1, "x"),
+])
+def test_out_of_range_ops_conflict(store, bad_op):
+    store.patch("alice", 0, [op("content", 0, 0, "abc")])
+    with pytest.raises(DraftConflictError) as excinfo:
+        store.patch("alice", 1, [bad_op])
+    assert excinfo.value.latest["content"] == "abc"
+    assert store.get("alice")["version"] == 1
+
+
+def test_length_mismatch_conflicts(store):
+    store.patch("alice", 0, [op("content", 0, 0, "abc")])
+    with pytest.raises(DraftConflictError):
+        store.patch("alice", 1, [op("content", 3, 0, "d")], length=5)
+    assert store.get("alice")["content"] == "abc"
+
+
+def test_too_large_is_rejected(store):
+    with pytest.raises(DraftTooLargeError):
+        store.patch("alice", 0, [op("title", 0, 0, "x" * (MAX_LENGTHS["title"] + 1))])
+    assert store.get("alice") is None
+
+
+def test_clear_bumps_version(store):
+    assert store.clear("alice") == 0
+    store.patch("alice", 0, [op("title", 0, 0, "标题"), op("content", 0, 0, "正文")])
+
+    assert store.clear("alice") == 2
+    draft = store.get("alice")
+    assert (draft["version"], draft["title"], draft["content"]) == (2, "", "")
+    # 已提交，其他工作进程的连接能读到
+    other = DraftStore(store.path)
+    assert other.get("alice")["version"] == 2
+    other.close()
+
+    # 仍基于清空前版本的页面不能把修改叠加到新草稿上
+    with pytest.raises(DraftConflictError):
+        store.patch("alice", 1, [op("content", 2, 0, "追加")])
+    assert store.patch("alice", 2, [op("content", 0, 0, "新草稿")]) == 3
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+服务器推送事件测试
+"""
+
+import asyncio
+
+from wp_publisher.events import EventBroadcaster, parse_event_types
+from wp_publisher.models import UserRole
+
+ADMIN = {"username": "admin", "role": UserRole.ADMIN}
+
+
+def drain_queue(subscriber) -> list:
+    messages = []
+    while not subscriber.queue.empty():
+        messages.append(subscriber.queue.get_nowait())
+    return messages
+
+
+def test_parse_event_types():
+    assert parse_event_types(None) is None
+    assert parse_event_types("") is None
+    assert parse_event_types("config, summary,unknown") == {"config", "summary"}
+
+
+def test_subscriber_only_receives_requested_events():
+    async def scenario():
+        broadcaster = EventBroadcaster()
+        dashboard = broadcaster.subscribe(ADMIN, events=parse_event_types("config,summary"))
+        publisher = broadcaster.subscribe(ADMIN)
+
+        broadcaster.publish("history", {"posts": []})
+        broadcaster.publish("summary", {}, admin_only=True)
+        assert broadcaster.wanted("history")
+
+        broadcaster._remove(publisher)
+        assert not broadcaster.wanted("history")
+        assert broadcaster.wanted("summary")
+        return drain_queue(dashboard), drain_queue(publisher)
+
+    dashboard_messages, publisher_messages = asyncio.run(scenario())
+    assert [message.split(b"\n")[1] for message in dashboard_messages] == [b"event: summary"]
+    assert len(publisher_messages) == 2
+
+
+def test_replay_after_reconnect_respects_requested_events():
+    async def scenario():
+        broadcaster = EventBroadcaster()
+        broadcaster.publish("history", {"posts": []})
+        broadcaster.publish("config", {}, admin_only=True)
+        return drain_queue(broadcaster.subscribe(ADMIN, "0", parse_event_types("config")))
+
+    messages = asyncio.run(scenario())
+    assert [message.split(b"\n")[1] for message in messages] == [b"event: config"]
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+结构化日志测试
+"""
+
+import json
+import queue
+import logging
+
+from wp_publisher.log_config import JsonFormatter, TruncatingQueueHandler
+
+
+def test_fields_are_truncated_before_enqueue():
+    log_queue = queue.Queue()
+    logger = logging.getLogger("wp_publisher.test_log_config")
+    logger.propagate = False
+    handler = TruncatingQueueHandler(log_queue, max_field_length=10)
+    logger.addHandler(handler)
+    try:
+        fields = {"content": "正文" * 100, "status": 201}
+        logger.warning("发布完成", extra={"fields": fields})
+        # 调用方之后修改字段字典，不影响已入队的记录
+        fields["content"] = "已修改"
+        fields["extra"] = "x"
+    finally:
+        logger.removeHandler(handler)
+
+    record = log_queue.get_nowait()
+    assert record.fields == {"content": "正文正文正文正文正文...(共200字符)", "status": 201}
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["content"] == record.fields["content"]
+    assert entry["msg"] == "发布完成"
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+事件循环看门狗测试
+"""
+
+import asyncio
+
+from wp_publisher.loop_watchdog import LoopWatchdog
+
+
+def test_percentiles_are_computed_in_sampling_loop_not_on_read():
+    watchdog = LoopWatchdog(interval=0.001, summary_every=5)
+    watchdog.samples.extend([0.001] * 99 + [0.5])
+
+    # 读取只返回上一次计算的结果，不排序样本
+    assert watchdog.percentiles()["samples"] == 0
+
+    async def run_ticks():
+        watchdog.start()
+        await asyncio.sleep(0.1)
+        watchdog.stop()
+
+    asyncio.run(run_ticks())
+    summary = watchdog.percentiles()
+    assert summary["samples"] >= 100
+    assert summary["max"] >= 500.0
+    assert summary["p50"] < 100.0
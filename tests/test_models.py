@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+请求模型测试
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from wp_publisher.models import PublishRequest
+
+
+def test_publish_type_defaults_to_normal():
+    assert PublishRequest(title="标题", content="正文").publish_type == "normal"
+    assert PublishRequest(title="标题", content="正文", publish_type="headline").publish_type == "headline"
+
+
+@pytest.mark.parametrize("publish_type", ["Headline", "urgent", "normal\n", ""])
+def test_unknown_publish_type_is_rejected(publish_type):
+    with pytest.raises(ValidationError):
+        PublishRequest(title="标题", content="正文", publish_type=publish_type)
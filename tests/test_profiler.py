@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+在线性能剖析测试
+"""
+
+import asyncio
+import threading
+
+from wp_publisher import profiler
+
+
+def test_sampler_is_stopped_off_the_event_loop_thread(monkeypatch):
+    stopped_on = []
+    original_stop = profiler.StackSampler.stop
+
+    def stop(self):
+        stopped_on.append(threading.get_ident())
+        return original_stop(self)
+
+    monkeypatch.setattr(profiler.StackSampler, "stop", stop)
+
+    async def scenario():
+        await profiler.sample_profile(0.05, interval=0.001)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+    assert stopped_on and stopped_on[0] != loop_thread
+
+
+def test_sample_profile_collects_event_loop_stacks():
+    collapsed = asyncio.run(profiler.sample_profile(0.1, interval=0.001))
+    assert collapsed
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed.splitlines())
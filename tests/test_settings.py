@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+配置快照测试
+"""
+
+from wp_publisher.settings import env_overridden, load_settings
+
+
+def test_environment_overrides_env_file(tmp_path, monkeypatch):
+    env_file = tmp_path / ".env"
+    env_file.write_text("TEST_MODE=false\nWP_DOMAIN=https://from-env-file.example\n", encoding="utf-8")
+    monkeypatch.setenv("TEST_MODE", "true")
+    monkeypatch.delenv("WP_DOMAIN", raising=False)
+
+    settings = load_settings(env_file)
+
+    assert settings.test_mode is True
+    assert settings.wp_domain == "https://from-env-file.example"
+
+
+def test_env_overridden_lists_keys_set_in_environment(monkeypatch):
+    monkeypatch.setenv("BAIDU_API_KEY", "from-systemd")
+    monkeypatch.delenv("WP_DOMAIN", raising=False)
+
+    assert env_overridden(["WP_DOMAIN", "BAIDU_API_KEY"]) == ["BAIDU_API_KEY"]
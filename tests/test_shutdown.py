@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+平滑停止测试
+"""
+
+import os
+import time
+import signal
+import asyncio
+import socket
+import threading
+import http.client
+
+import pytest
+import uvicorn
+from fastapi.testclient import TestClient
+
+from wp_publisher.app import create_app
+from wp_publisher.auth import SessionManager
+from wp_publisher.models import UserRole
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="需要向本进程发送 SIGTERM")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve(app, client, graceful_timeout: float = 30.0) -> float:
+    """
+    在主线程中运行 uvicorn（信号处理只在主线程安装），client(port) 在另一个线程中访问服务器并发送 SIGTERM；
+    返回从发送信号到服务器退出的秒数
+    """
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(
+        app, host="127.0.0.1", port=port, log_level="warning", timeout_graceful_shutdown=graceful_timeout
+    ))
+    signalled = []
+
+    def run_client():
+        while not server.started:
+            time.sleep(0.05)
+        client(port, lambda: (signalled.append(time.monotonic()), os.kill(os.getpid(), signal.SIGTERM)))
+
+    # uvicorn 退出后会把收到的信号重新发给自己，先换成空处理函数
+    previous = signal.signal(signal.SIGTERM, lambda signum, frame: None)
+    thread = threading.Thread(target=run_client, daemon=True)
+    try:
+        thread.start()
+        asyncio.run(server.serve())
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+    thread.join(5)
+    assert signalled
+    return time.monotonic() - signalled[0]
+
+
+def test_publishing_stops_when_the_signal_arrives_not_after_connections_close():
+    app = create_app()
+    seen = {}
+
+    @app.get("/health/slow")
+    async def slow_request():
+        # 停止信号在这个请求处理期间到达，uvicorn 等它结束后才执行 lifespan 的退出部分
+        await asyncio.sleep(0.5)
+        seen["accepting"] = app.state.publish_drain.accepting
+        return {"ok": True}
+
+    def client(port, send_signal):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        conn.request("GET", "/health/slow")
+        time.sleep(0.2)
+        send_signal()
+        assert conn.getresponse().status == 200
+
+    serve(app, client)
+    assert seen["accepting"] is False
+
+
+def test_health_reports_draining_once_publishing_stops():
+    app = create_app()
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
+        app.state.publish_drain.stop_accepting()
+        response = client.get("/health")
+    assert response.status_code == 503
+    assert response.json()["status"] == "draining"
+
+
+def test_shutdown_completes_with_an_event_subscriber_connected():
+    app = create_app()
+    session_id = SessionManager.create_session("admin", UserRole.ADMIN)
+
+    def client(port, send_signal):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        conn.request("GET", "/api/events", headers={"Cookie": f"session_id={session_id}"})
+        response = conn.getresponse()
+        assert response.status == 200
+        assert response.readline().startswith(b"retry:")
+        send_signal()
+        # 连接由服务器结束，不是等到优雅停止超时
+        response.read()
+
+    assert serve(app, client, graceful_timeout=30) < 5
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+发布统计汇总测试
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from wp_publisher import routes
+from wp_publisher.auth import require_admin
+from wp_publisher.models import UserRole
+from wp_publisher.stats import PublishStats
+
+# 按日汇总超过保留天数会被清理，测试数据以今天为准
+TODAY = date.today()
+
+
+def days_ago(n: int) -> date:
+    return TODAY - timedelta(days=n)
+
+
+@pytest.fixture
+def stats(tmp_path):
+    store = PublishStats(tmp_path / "publish_stats.sqlite3")
+    yield store
+    store.close()
+
+
+def record_sample(stats: PublishStats, today: date):
+    """alice 今天 2 次成功、1 次审核拒绝；bob 昨天 1 次成功（头条）、1 次 WordPress 失败；carol 10 天前 1 次失败"""
+    stats.record("alice", "normal", "success", day=today)
+    stats.record("alice", "headline", "success", day=today)
+    stats.record("alice", "normal", "audit_rejected", day=today)
+    stats.record("bob", "headline", "success", day=today - timedelta(days=1))
+    stats.record("bob", "normal", "wp_error", day=today - timedelta(days=1))
+    stats.record("carol", "normal", "error", day=today - timedelta(days=10))
+
+
+def test_summary_totals_include_all_days(stats):
+    record_sample(stats, TODAY)
+    summary = stats.summary(days=7, today=TODAY)
+
+    assert summary["total"] == 6
+    assert summary["success"] == 3
+    assert summary["success_rate"] == 50.0
+    assert summary["audit_rejected"] == 1
+    assert summary["today"] == 3
+    assert summary["by_outcome"] == {"success": 3, "error": 1, "wp_error": 1, "audit_rejected": 1}
+    assert summary["by_publish_type"] == {"normal": 4, "headline": 2}
+
+
+def test_summary_by_user_only_counts_the_window(stats):
+    record_sample(stats, TODAY)
+    summary = stats.summary(days=7, today=TODAY)
+
+    assert summary["by_user"] == [
+        {"username": "alice", "total": 3, "success": 2},
+        {"username": "bob", "total": 2, "success": 1},
+    ]
+    wider = stats.summary(days=30, today=TODAY)
+    assert {"username": "carol", "total": 1, "success": 0} in wider["by_user"]
+
+
+def test_summary_series_is_one_entry_per_day(stats):
+    record_sample(stats, TODAY)
+    series = stats.summary(days=3, today=TODAY)["series"]
+
+    assert series["days"] == [days_ago(2).isoformat(), days_ago(1).isoformat(), TODAY.isoformat()]
+    assert series["total"] == [0, 2, 3]
+    assert series["success"] == [0, 1, 2]
+    assert series["wp_error"] == [0, 1, 0]
+    assert series["audit_rejected"] == [0, 0, 1]
+    assert series["error"] == [0, 0, 0]
+
+
+def test_summary_without_publishes(stats):
+    summary = stats.summary(days=0, today=TODAY)
+    assert summary["total"] == 0
+    assert summary["success_rate"] == 0.0
+    assert summary["today"] == 0
+    assert summary["series"]["days"] == [TODAY.isoformat()]
+
+
+def test_summary_endpoint(stats, monkeypatch):
+    record_sample(stats, date.today())
+    monkeypatch.setattr(routes, "publish_stats", stats)
+    app = FastAPI()
+    app.include_router(routes.router)
+    app.dependency_overrides[require_admin] = lambda: {"username": "admin", "role": UserRole.ADMIN}
+
+    data = TestClient(app).get("/api/stats/summary", params={"days": 7}).json()
+    assert data["status"] == "success"
+    assert data["total"] == 6
+    assert data["success_rate"] == 50.0
+    assert data["today"] == 3
+    assert [user["username"] for user in data["by_user"]] == ["alice", "bob"]
+    assert data["series"]["total"][-2:] == [2, 3]
+
+
+def test_unknown_publish_type_is_counted_as_normal(stats):
+    stats.record("alice", "normal", "success", day=TODAY)
+    stats.record("alice", "urgent", "success", day=TODAY)
+    with stats._lock:
+        conn = stats._connect()
+        assert conn.execute("SELECT COUNT(*) FROM publish_totals").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM publish_daily").fetchone()[0] == 1
+        # 旧版本写入的未知类型
+        conn.execute("INSERT INTO publish_totals (outcome, publish_type, count) VALUES ('success', 'legacy', 3)")
+
+    summary = stats.summary(days=7, today=TODAY)
+    assert summary["by_publish_type"] == {"normal": 5, "headline": 0}
+    assert summary["total"] == 5
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+请求追踪测试
+"""
+
+import json
+
+from wp_publisher.tracing import RequestTrace
+
+
+def test_repeated_stages_are_kept_in_record_and_summed_in_server_timing():
+    trace = RequestTrace("rid", "POST", "/publish")
+    trace.stages = [("audit", 10.0), ("wp", 20.0), ("wp", 30.0)]
+
+    record = json.loads(trace.to_record(200, 65.0))
+
+    assert record["stages"] == [["audit", 10.0], ["wp", 20.0], ["wp", 30.0]]
+    assert trace.server_timing(65.0) == "audit;dur=10.0, wp;dur=50.0, total;dur=65.0"
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 V2.4
+
+    from wp_publisher import create_app
+    app = create_app()
+
+导入子模块（settings、models、auth、clients 等）不会创建应用、客户端或读取 .env，
+测试和命令行工具可以单独使用
+"""
+
+__version__ = "2.4.0"
+
+__all__ = ["create_app", "__version__"]
+
+
+def __getattr__(name):
+    # 延迟导入应用工厂，import wp_publisher.settings 时不必加载 FastAPI 路由
+    if name == "create_app":
+        from .app import create_app
+        return create_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 - 应用工厂
+create_app() 组装路由、中间件和进程生命周期；日志、客户端和后台任务都在这里或 lifespan 中初始化，
+导入包内其他模块没有副作用
+
+    uvicorn wp_publisher.app:create_app --factory
+"""
+
+import asyncio
+import signal
+import threading
+from contextlib import asynccontextmanager
+from typing import Callable
+
+from fastapi import FastAPI, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import RedirectResponse
+
+from . import drain, events, health, loop_watchdog, metrics, tracing
+from .assets import StaticAssets, load_manifest
+from .auth import METRICS_PATH, SessionManager, is_public_path, metrics_access_allowed
+from .compression import CompressionMiddleware
+from .clients import close_clients, get_clients, init_clients
+from .drafts import drafts
+from .log_config import get_logger, setup_logging, shutdown_logging
+from .routes import PAGE_TEMPLATES, get_publish_in_flight, pages, router
+from .settings import BASE_DIR, get_settings, watch_settings
+from .stats import publish_stats
+
+logger = get_logger("app")
+
+# uvicorn（包括 gunicorn 的 uvicorn 工作进程）收到这些信号后开始平滑停止
+SHUTDOWN_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+
+def on_shutdown_signal(callback: Callable[[], None]):
+    """
+    服务器收到停止信号时在事件循环中调用 callback。
+    uvicorn 收到信号后先关闭监听、等待已有连接结束，之后才执行 lifespan 的退出部分，
+    需要在等待连接之前完成的工作（停止接收发布、结束事件连接）在这里触发。
+    在 uvicorn 安装的信号处理函数外再包一层，uvicorn 退出时恢复它自己保存的处理函数；
+    不在主线程或服务器没有接管信号时不做处理
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    loop = asyncio.get_running_loop()
+    for sig in SHUTDOWN_SIGNALS:
+        previous = signal.getsignal(sig)
+        if not callable(previous):
+            continue
+
+        def handler(signum, frame, previous=previous):
+            previous(signum, frame)
+            loop.call_soon_threadsafe(callback)
+
+        signal.signal(sig, handler)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    进程生命周期：创建客户端；每个工作进程各自轮询 .env 的变化、刷新依赖健康状态、向事件订阅者推送数据、运行事件循环看门狗；
+    收到停止信号时立即拒绝新发布（/health 返回 draining）并结束事件连接，退出时等待进行中的发布，再停止后台任务、关闭连接池
+    """
+    state = app.state
+
+    def begin_shutdown():
+        state.publish_drain.stop_accepting()
+        # SSE 连接不会自行结束，不关闭的话 uvicorn 会一直等到优雅停止超时
+        events.broadcaster.close()
+
+    on_shutdown_signal(begin_shutdown)
+    init_clients(get_settings())
+    settings_watcher = asyncio.create_task(watch_settings())
+    health_refresher = asyncio.create_task(state.dependency_health.run(get_clients, get_publish_in_flight))
+    events_refresher = asyncio.create_task(events.refresher.run(get_clients))
+    state.watchdog.start()
+    try:
+        yield
+    finally:
+        # 没有收到信号而退出时（例如测试客户端关闭）在这里结束
+        begin_shutdown()
+        await state.publish_drain.drain(get_settings().drain_timeout)
+        settings_watcher.cancel()
+        health_refresher.cancel()
+        events_refresher.cancel()
+        state.watchdog.stop()
+        await asyncio.gather(settings_watcher, health_refresher, events_refresher, return_exceptions=True)
+        await close_clients()
+        publish_stats.close()
+        drafts.close()
+        logger.info("服务已停止")
+        # 写完队列中剩余的日志
+        shutdown_logging()
+
+
+# 异常处理中间件
+async def auth_middleware(request: Request, call_next):
+    """认证中间件 - 处理未登录用户的重定向"""
+    # 监控指标：令牌或来源地址校验，不接受会话
+    if request.url.path == METRICS_PATH:
+        if not metrics_access_allowed(request):
+            return Response(
+                content='{"detail": "无权访问监控指标"}',
+                status_code=403,
+                media_type="application/json"
+            )
+        return await call_next(request)
+
+    # 检查是否为公开路径
+    if is_public_path(request.url.path):
+        response = await call_next(request)
+        return response
+
+    # 检查登录状态
+    session_id = request.cookies.get("session_id")
+    if not session_id or not SessionManager.get_session(session_id):
+        # 未登录，重定向到登录页面
+        if request.url.path.startswith("/api/"):
+            # API请求返回JSON错误
+            return Response(
+                content='{"detail": "未登录"}',
+                status_code=401,
+                media_type="application/json"
+            )
+        else:
+            # 页面请求重定向到登录页
+            return RedirectResponse(url="/login", status_code=302)
+
+    response = await call_next(request)
+    return response
+
+
+async def metrics_middleware(request: Request, call_next):
+    """按路由模板和状态码统计请求数"""
+    response = await call_next(request)
+    route = request.scope.get("route")
+    metrics.REQUESTS_TOTAL.labels(
+        route=getattr(route, "path", "unmatched"),
+        method=request.method,
+        outcome=f"{response.status_code // 100}xx"
+    ).inc()
+    return response
+
+
+def create_app() -> FastAPI:
+    """创建应用实例"""
+    settings = get_settings()
+
+    # 结构化日志：请求路径只入队，后台线程写入 logs/app.log 与 logs/trace.log
+    setup_logging(settings)
+
+    app = FastAPI(
+        title="文章发布系统 V2.4",
+        description="宝塔生产环境版本，功能优化与路径适配",
+        version="2.4.0",
+        lifespan=lifespan
+    )
+
+    # 进行中的发布：停止时等待其完成，未完成的写入 drain/ 目录
+    app.state.publish_drain = drain.PublishDrain(BASE_DIR / "drain")
+    # 依赖健康状态：后台定期刷新，/health?deep=1 只读缓存
+    app.state.dependency_health = health.DependencyHealth(interval=settings.health_check_interval)
+    # 事件循环看门狗：持续测量延迟，阻塞超过阈值时记录调用栈
+    app.state.watchdog = loop_watchdog.LoopWatchdog(slow_threshold=settings.slow_callback_ms / 1000)
+
+    # 挂载静态文件 - 使用绝对路径适配宝塔环境；构建后的文件（static/dist/）带哈希，可永久缓存
+    static_dir = BASE_DIR / "static"
+    if static_dir.exists():
+        load_manifest(static_dir)
+        app.mount("/static", StaticAssets(directory=str(static_dir)), name="static")
+
+    # 页面引用的静态资源文件名取决于清单，读取清单后再渲染
+    pages.precompile(PAGE_TEMPLATES)
+
+    # 响应压缩放在最内层，直接处理路由返回的完整响应体
+    app.add_middleware(CompressionMiddleware)
+
+    # 添加CORS中间件 - 生产环境安全配置
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:8001", "http://localhost:8004", "https://your-domain.com"],
+        allow_credentials=True,
+        allow_methods=["GET", "POST"],
+        allow_headers=["*"],
+        expose_headers=[tracing.REQUEST_ID_HEADER, "Server-Timing"],
+    )
+
+    app.include_router(router)
+
+    # 中间件按添加顺序由内到外：认证 → 请求计数（包含认证中间件拒绝的请求） → 请求追踪（计时覆盖全部）
+    app.middleware("http")(auth_middleware)
+    app.middleware("http")(metrics_middleware)
+    app.middleware("http")(tracing.tracing_middleware)
+
+    return app
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 - 静态资源
+build_assets_v2_4.py 把 static/ 下的 JS/CSS 压缩后按内容哈希命名写入 static/dist/，并生成 .gz/.br 文件和清单；
+这里负责读取清单（模板中用 asset_url() 解析带哈希的文件名）以及按 Accept-Encoding 发送预压缩文件
+
+未构建时 asset_url() 返回原始文件路径，开发环境无需先运行构建
+"""
+
+import os
+import json
+import mimetypes
+from pathlib import Path
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from .log_config import get_logger
+
+logger = get_logger("app")
+
+STATIC_URL = "/static"
+# 构建输出目录（相对于 static/）和清单文件名
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+
+# 预压缩文件后缀，按优先顺序
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# 带哈希的文件内容不会变化，可永久缓存；其余文件每次向服务器确认（ETag/Last-Modified）
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+# 清单：原始路径（如 js/app_v2_4.js） → 构建后路径（如 dist/js/app_v2_4.1a2b3c4d5e.js）
+_manifest: Dict[str, str] = {}
+
+
+def load_manifest(static_dir: Path) -> Dict[str, str]:
+    """读取构建清单；未构建或清单损坏时回退到原始文件"""
+    global _manifest
+    manifest_file = static_dir / DIST_DIR / MANIFEST_NAME
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            _manifest = json.load(f)["files"]
+    except FileNotFoundError:
+        _manifest = {}
+    except (ValueError, KeyError) as e:
+        logger.warning("静态资源清单无效，使用未构建的文件", extra={"fields": {"file": str(manifest_file), "error": str(e)}})
+        _manifest = {}
+    return _manifest
+
+
+def asset_url(path: str) -> str:
+    """模板中使用：{{ asset_url('js/app_v2_4.js') }} → /static/dist/js/app_v2_4.<hash>.js"""
+    path = path.lstrip("/")
+    return f"{STATIC_URL}/{_manifest.get(path, path)}"
+
+
+def accepted_encodings(accept_encoding: str) -> set:
+    """解析 Accept-Encoding，返回客户端接受的编码（q=0 视为拒绝）"""
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.partition(";")
+        name = name.strip()
+        if not name:
+            continue
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name)
+    return accepted
+
+
+class StaticAssets(StaticFiles):
+    """
+    /static 挂载点：
+    - static/dist/ 下的构建文件带 immutable 缓存头，存在 .br/.gz 文件且客户端接受时直接发送压缩内容
+    - 其他文件要求浏览器每次确认，修改后立即生效
+    """
+
+    def __init__(self, *, directory: str, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self.dist_dir = os.path.join(os.path.realpath(directory), DIST_DIR) + os.sep
+
+    def file_response(
+        self,
+        full_path: str,
+        stat_result: os.stat_result,
+        scope,
+        status_code: int = 200,
+    ) -> Response:
+        if not os.path.realpath(full_path).startswith(self.dist_dir):
+            response = super().file_response(full_path, stat_result, scope, status_code)
+            response.headers.setdefault("Cache-Control", REVALIDATE_CACHE)
+            return response
+
+        request_headers = Headers(scope=scope)
+        response = self.precompressed_response(full_path, request_headers, status_code)
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+            response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def precompressed_response(self, full_path: str, request_headers: Headers, status_code: int) -> Optional[Response]:
+        """客户端接受且存在对应的预压缩文件时返回压缩内容，Content-Type 仍按原文件"""
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                stat_result = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            # 以原文件名推断媒体类型，否则 .br/.gz 会被当作二进制下载
+            response = FileResponse(
+                full_path + suffix,
+                status_code=status_code,
+                stat_result=stat_result,
+                media_type=mimetypes.guess_type(full_path)[0] or "text/plain",
+            )
+            response.headers["Content-Encoding"] = encoding
+            response.headers["Vary"] = "Accept-Encoding"
+            return response
+        return None
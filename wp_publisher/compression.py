@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 - 响应压缩
+按 Accept-Encoding 选择 brotli 或 gzip 压缩动态响应（发布历史、带 violations 的审核结果、多站点结果等）
+
+不压缩的情况：
+- 小于 minimum_size 的响应（压缩收益抵不过 CPU 开销）
+- 已经带 Content-Encoding 的响应（构建好的 .br/.gz 静态文件、已缓存压缩结果的页面）
+- 非文本类型、text/event-stream（逐条推送，压缩会把消息攒在缓冲区里）、Cache-Control: no-transform
+- 部分内容响应（206 / Content-Range），范围是按未压缩内容计算的
+- HEAD 请求：响应体为空，Content-Length 是 GET 响应未压缩的长度，无法换算为压缩后的长度
+
+压缩后的响应与原响应字节不同，强 ETag 改为弱 ETag（W/"..."）；浏览器带回的 If-None-Match 仍能与原 ETag 匹配
+"""
+
+import gzip
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .assets import accepted_encodings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MINIMUM_SIZE = 1024
+GZIP_LEVEL = 6
+# 动态内容使用较低的质量档：压缩率与 gzip 相近或更好，耗时远低于构建时使用的 11 档
+BROTLI_QUALITY = 4
+
+COMPRESSIBLE_TYPES = (
+    "text/", "application/json", "application/javascript", "application/xml", "image/svg+xml",
+)
+EXCLUDED_TYPES = ("text/event-stream",)
+
+# 服务端支持的编码，按优先顺序；未安装 brotli 时只用 gzip
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """选择客户端接受的编码，都不接受时返回 None"""
+    accepted = accepted_encodings(accept_encoding)
+    for encoding in SUPPORTED_ENCODINGS:
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+def compress_body(data: bytes, encoding: str) -> bytes:
+    """一次性压缩完整响应体"""
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class StreamCompressor:
+    """分块压缩流式响应"""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._compress, self._finish = compressor.process, compressor.finish
+        else:
+            # wbits=31：带 gzip 头和校验的格式
+            compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+            self._compress, self._finish = compressor.compress, compressor.flush
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compress(data) if data else b""
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+def is_compressible(headers: Headers, status: int = 200) -> bool:
+    """按状态码和响应头判断是否应压缩"""
+    if status == 206 or "content-range" in headers:
+        return False
+    if "content-encoding" in headers:
+        return False
+    if "no-transform" in headers.get("cache-control", ""):
+        return False
+    content_type = headers.get("content-type", "").lower()
+    if content_type.startswith(EXCLUDED_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """协商压缩中间件（纯 ASGI 实现，流式响应按块压缩，不缓冲整个响应体）"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await CompressionResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+
+class CompressionResponder:
+    """单个请求的压缩状态：收到第一个响应体分块后决定是否压缩"""
+
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[StreamCompressor] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # 等到第一个响应体分块再发送，此时才知道响应大小
+            self.start_message = message
+            return
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start_message["headers"])
+            # 外层中间件转发的响应是分块的，大小以 Content-Length 为准
+            size = int(headers["content-length"]) if "content-length" in headers else None
+            if size is None and not more_body:
+                size = len(body)
+            if not is_compressible(headers, start_message["status"]) or (size is not None and size < self.minimum_size):
+                await self.send(start_message)
+                await self.send(message)
+                return
+
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag is not None and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+            if not more_body:
+                body = compress_body(body, self.encoding)
+                headers["Content-Length"] = str(len(body))
+                await self.send(start_message)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+
+            # 流式响应：长度未知，改用分块传输
+            del headers["Content-Length"]
+            self.compressor = StreamCompressor(self.encoding)
+            await self.send(start_message)
+            await self.send({"type": "http.response.body", "body": self.compressor.compress(body), "more_body": True})
+            return
+
+        if self.compressor is None:
+            await self.send(message)
+            return
+
+        data = self.compressor.compress(body)
+        if not more_body:
+            data += self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
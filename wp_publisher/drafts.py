@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 - 草稿同步
+每个用户一份草稿（标题、内容、编辑模式），保存在服务端，换一台电脑登录也能继续编辑
+
+页面停止输入一段时间后只提交变化的部分：每个修改是对某个字段的一次替换（从 start 起删除 delete 个字符，再插入 insert），
+并带上所基于的版本号；版本号不一致（其他页面已修改）时拒绝修改并返回最新版本，由页面重新比较后再提交。
+位置和长度按 UTF-16 码元计算，与浏览器中字符串的下标一致。内容压缩后保存
+"""
+
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from .storage import DATA_DIR, SQLiteStore
+
+DRAFTS_DB = DATA_DIR / "drafts.sqlite3"
+
+FIELDS = ("title", "content", "mode")
+FIELD_NAMES = {"title": "标题", "content": "内容", "mode": "编辑模式"}
+# 草稿各字段的长度上限（UTF-16 码元），与发布接口的限制相比留有余量
+MAX_LENGTHS = {"title": 1000, "content": 500_000, "mode": 20}
+ZLIB_LEVEL = 6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS drafts (
+    username TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    content BLOB NOT NULL,
+    updated_at TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class DraftConflictError(Exception):
+    """修改所基于的版本不是最新版本，或修改与当前内容对不上"""
+
+    def __init__(self, message: str, latest: Optional[Dict[str, Any]]):
+        super().__init__(message)
+        self.latest = latest
+
+
+class DraftTooLargeError(ValueError):
+    """草稿超过长度上限"""
+
+
+def utf16_length(value: str) -> int:
+    return len(value.encode("utf-16-le", "surrogatepass")) // 2
+
+
+def apply_patch(draft: Dict[str, str], ops: Iterable[Dict[str, Any]]) -> Dict[str, str]:
+    """按顺序应用修改，返回新的草稿字段；位置越界时抛出 IndexError"""
+    result = dict(draft)
+    for op in ops:
+        field = op["field"]
+        data = result[field].encode("utf-16-le", "surrogatepass")
+        start, end = 2 * op["start"], 2 * (op["start"] + op["delete"])
+        if op["start"] < 0 or op["delete"] < 0 or end > len(data):
+            raise IndexError(f"草稿{FIELD_NAMES[field]}的修改位置超出范围")
+        data = data[:start] + op["insert"].encode("utf-16-le", "surrogatepass") + data[end:]
+        result[field] = data.decode("utf-16-le", "surrogatepass")
+    return result
+
+
+def compress_content(content: str) -> bytes:
+    return zlib.compress(content.encode("utf-8", "surrogatepass"), ZLIB_LEVEL)
+
+
+def decompress_content(blob: bytes) -> str:
+    return zlib.decompress(blob).decode("utf-8", "surrogatepass")
+
+
+class DraftStore(SQLiteStore):
+    """用户草稿（在线程池中调用）"""
+
+    def __init__(self, path: Path):
+        super().__init__(path, SCHEMA)
+
+    def _load(self, conn, username: str) -> Optional[Dict[str, Any]]:
+        row = conn.execute(
+            "SELECT version, title, mode, content, updated_at FROM drafts WHERE username = ?", (username,)
+        ).fetchone()
+        if row is None:
+            return None
+        version, title, mode, content, updated_at = row
+        return {
+            "version": version, "title": title, "mode": mode,
+            "content": decompress_content(content), "updated_at": updated_at,
+        }
+
+    def get(self, username: str) -> Optional[Dict[str, Any]]:
+        """最新版本的草稿，没有草稿时返回 None"""
+        with self._lock:
+            return self._load(self._connect(), username)
+
+    def patch(self, username: str, base_version: int, ops: Iterable[Dict[str, Any]],
+              length: Optional[int] = None) -> int:
+        """
+        在 base_version 上应用修改，返回新版本号（没有草稿时 base_version 为 0）；
+        length 为页面上修改后内容的长度，用于发现两边内容不一致
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                # 读取和写入在同一个写事务中，多个工作进程同时修改同一份草稿时依次执行
+                conn.execute("BEGIN IMMEDIATE")
+                current = self._load(conn, username)
+                current_version = current["version"] if current else 0
+                if base_version != current_version:
+                    raise DraftConflictError("草稿已在其他页面修改", current)
+
+                base = {field: current[field] for field in FIELDS} if current else dict.fromkeys(FIELDS, "")
+                try:
+                    draft = apply_patch(base, ops)
+                except IndexError as e:
+                    raise DraftConflictError(str(e), current)
+                if length is not None and utf16_length(draft["content"]) != length:
+                    raise DraftConflictError("草稿内容与页面不一致", current)
+                for field, limit in MAX_LENGTHS.items():
+                    if utf16_length(draft[field]) > limit:
+                        raise DraftTooLargeError(f"草稿{FIELD_NAMES[field]}超过长度上限（{limit}个字符）")
+
+                version = current_version + 1
+                conn.execute(
+                    "INSERT INTO drafts (username, version, title, mode, content, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (username) DO UPDATE SET version = excluded.version, title = excluded.title, "
+                    "mode = excluded.mode, content = excluded.content, updated_at = excluded.updated_at",
+                    (username, version, draft["title"], draft["mode"], compress_content(draft["content"]),
+                     datetime.now().isoformat(timespec="seconds"))
+                )
+                return version
+
+    def clear(self, username: str) -> int:
+        """清空草稿（发布成功、重置表单后）；保留版本号递增，仍打开着旧版本的页面不会把修改叠加到新草稿上"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                # 与 patch 相同，读到的版本号就是本次写入的版本号
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "UPDATE drafts SET version = version + 1, title = '', mode = '', content = ?, updated_at = ? "
+                    "WHERE username = ?",
+                    (compress_content(""), datetime.now().isoformat(timespec="seconds"), username)
+                )
+                row = conn.execute("SELECT version FROM drafts WHERE username = ?", (username,)).fetchone()
+                return row[0] if row else 0
+
+
+drafts = DraftStore(DRAFTS_DB)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 - 发布任务的平滑停止
+- 每个 /publish 在独立任务中执行，客户端断开或服务停止时不会在审核、WordPress 调用中途被取消
+- 收到停止信号时立即拒绝新的发布（/publish 返回 503，/health 返回 draining），
+  此时 uvicorn 仍在等待已有连接上的请求处理完成；lifespan 退出时在截止时间内等待进行中的发布完成
+- 截止时间后仍未完成的发布（含已完成的审核结果）以及客户端未收到结果的发布写入 drain/ 目录，供人工核对或重发
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Dict, List, Optional
+
+logger = logging.getLogger("wp_publisher.drain")
+
+_current_job: ContextVar[Optional["PublishJob"]] = ContextVar("current_publish_job", default=None)
+
+
+class PublishJob:
+    """一次进行中的发布"""
+
+    def __init__(self, job_id: str, payload: Dict[str, Any]):
+        self.job_id = job_id
+        self.payload = payload
+        self.started_at = datetime.now()
+        self.stage = "validation"
+        self.audit_result: Optional[Dict[str, Any]] = None
+        # 客户端已断开（或请求被服务器取消），结果无法返回给调用方
+        self.detached = False
+        self.task: Optional[asyncio.Task] = None
+
+    def to_record(self, state: str, **extra) -> Dict[str, Any]:
+        return {
+            "state": state,
+            "job_id": self.job_id,
+            "started_at": self.started_at.isoformat(),
+            "stage": self.stage,
+            "audit_result": self.audit_result,
+            "request": self.payload,
+            **extra,
+        }
+
+
+def mark_stage(stage: str, audit_result: Optional[Dict[str, Any]] = None):
+    """记录当前发布进行到的阶段（在发布任务内调用，任务外调用无效果）"""
+    job = _current_job.get()
+    if job is not None:
+        job.stage = stage
+        if audit_result is not None:
+            job.audit_result = audit_result
+
+
+class PublishDrain:
+    """进行中发布的登记与停止时的等待"""
+
+    def __init__(self, state_dir: Path):
+        self.state_dir = state_dir
+        self.accepting = True
+        self.jobs: Dict[asyncio.Task, PublishJob] = {}
+        # 客户端断开后才完成的发布结果，停止时一并写入文件
+        self.undelivered: List[Dict[str, Any]] = []
+
+    def submit(self, coro: Awaitable, job_id: str, payload: Dict[str, Any]) -> asyncio.Task:
+        """在独立任务中执行发布"""
+        job = PublishJob(job_id, payload)
+        token = _current_job.set(job)
+        try:
+            # 任务创建时复制当前上下文（包括请求追踪和 job）
+            task = asyncio.ensure_future(coro)
+        finally:
+            _current_job.reset(token)
+        job.task = task
+        self.jobs[task] = job
+        task.add_done_callback(self._on_done)
+        return task
+
+    async def wait(self, task: asyncio.Task):
+        """等待发布结果；请求本身被取消时发布任务继续执行"""
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            job = self.jobs.get(task)
+            if job is not None:
+                job.detached = True
+                logger.warning("客户端在发布完成前断开，发布继续执行", extra={"fields": {
+                    "job_id": job.job_id, "stage": job.stage
+                }})
+            raise
+
+    def _on_done(self, task: asyncio.Task):
+        job = self.jobs.pop(task, None)
+        if job is None or not job.detached or task.cancelled():
+            return
+        error = task.exception()
+        result = None if error else task.result()
+        outcome = {"error": repr(error)} if error else {
+            "response": result.model_dump() if hasattr(result, "model_dump") else result
+        }
+        self.undelivered.append(job.to_record("undelivered", finished_at=datetime.now().isoformat(), **outcome))
+        logger.warning("发布已完成但客户端未收到结果", extra={"fields": {"job_id": job.job_id, **outcome}})
+
+    def stop_accepting(self):
+        """停止接收新的发布（收到停止信号时调用，可重复调用）"""
+        if self.accepting:
+            self.accepting = False
+            logger.info("收到停止信号，不再接收新的发布", extra={"fields": {"in_flight": len(self.jobs)}})
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.jobs)
+
+    async def drain(self, timeout: float) -> Optional[Path]:
+        """停止接收新发布，等待进行中的发布完成；返回写入的文件路径（没有需要保存的记录时为 None）"""
+        self.stop_accepting()
+        start = time.monotonic()
+        pending = set(self.jobs)
+        if pending:
+            logger.info("等待进行中的发布完成", extra={"fields": {"in_flight": len(pending), "timeout": timeout}})
+            _, pending = await asyncio.wait(pending, timeout=timeout)
+
+        unfinished = []
+        for task in pending:
+            job = self.jobs.get(task)
+            if job is not None:
+                unfinished.append(job.to_record("unfinished"))
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.warning("截止时间内未完成的发布已取消", extra={"fields": {
+                "unfinished": len(unfinished), "waited_seconds": round(time.monotonic() - start, 1)
+            }})
+
+        return self.persist(unfinished + self.undelivered)
+
+    def persist(self, records: List[Dict[str, Any]]) -> Optional[Path]:
+        """追加写入本进程的记录文件"""
+        if not records:
+            return None
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        path = self.state_dir / f"publish-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.jsonl"
+        with open(path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        logger.warning("未完成/未送达的发布已保存", extra={"fields": {"path": str(path), "count": len(records)}})
+        self.undelivered = []
+        return path
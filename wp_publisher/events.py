@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 - 服务器推送事件（SSE）
+页面通过 /api/events 订阅，不再各自定时轮询统计和发布历史：
+- publish：发布进度（audit → wp → done），只推送给发起发布的用户
+- history / stats：发布历史和本月统计，由后台任务统一获取后推送给所有订阅者（每个工作进程一次请求，而不是每个标签页一次）
+- summary：发布统计汇总有变化，只推送给管理员（页面收到后重新读取 /api/stats/summary）
+- config：配置已修改，只推送给管理员
+
+页面可以只订阅需要的事件（/api/events?events=config,summary），不订阅的事件不发送，
+没有订阅者需要 history/stats 时后台任务也不请求 WordPress。
+
+事件只在本进程内分发，没有跨进程的通道。gunicorn 默认按 CPU 核数启动工作进程，SSE 连接和 /publish 请求
+通常落在不同的进程上：
+- 发布进度只有连接恰好在同一进程时才能看到；发布页面以 /publish 的响应为准，发布成功后自行重新读取历史
+- 其他标签页的历史和本月统计要等所在进程下一次定时刷新（REFRESH_INTERVAL，默认 300 秒）
+- summary 只推送给同一进程内的管理员页面，其他进程的管理后台在重新连接或手动刷新时更新
+"""
+
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Deque, Dict, FrozenSet, List, Optional, Set, Tuple
+
+import orjson
+
+from . import metrics
+from .log_config import get_logger
+from .models import UserRole
+from .settings import Settings, on_settings_change
+
+logger = get_logger("events")
+
+# 浏览器断线后的重连间隔（毫秒）
+RETRY_MS = 5000
+# 心跳间隔（秒）：保持代理连接不被超时关闭，也让服务器及时发现已断开的连接
+HEARTBEAT_SECONDS = 15.0
+# 单个订阅者的待发送队列上限；消费过慢时断开，浏览器重连后从最近事件中补发
+QUEUE_SIZE = 100
+# 保留最近的事件，供断线重连（Last-Event-ID）补发
+RECENT_EVENTS = 200
+# 事件类型（页面可按类型订阅）
+EVENT_TYPES = frozenset(("publish", "history", "stats", "summary", "config"))
+
+# 发布成功后等待 WordPress 处理完成再刷新历史和统计（秒）
+REFRESH_DELAY = 2.0
+# 有订阅者时定期刷新历史和统计的间隔（秒）
+REFRESH_INTERVAL = 300.0
+
+
+class Subscriber:
+    """一个 SSE 连接"""
+
+    __slots__ = ("username", "is_admin", "events", "queue", "closed")
+
+    def __init__(self, user: Dict[str, Any], events: Optional[FrozenSet[str]] = None):
+        self.username = user["username"]
+        self.is_admin = user["role"] == UserRole.ADMIN
+        # 订阅的事件类型，None 表示全部
+        self.events = events
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.closed = False
+
+    def wants(self, event: str) -> bool:
+        return self.events is None or event in self.events
+
+
+# 最近事件：(事件ID, 事件类型, 编码后的消息, 目标用户, 仅管理员)
+EventRecord = Tuple[int, str, bytes, Optional[str], bool]
+
+
+def encode_event(event_id: int, event: str, data: Dict[str, Any]) -> bytes:
+    """按 SSE 格式编码（每个事件只序列化一次，再分发给所有订阅者）"""
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event_id, event.encode(), orjson.dumps(data))
+
+
+class EventBroadcaster:
+    """进程内事件分发"""
+
+    def __init__(self):
+        self._subscribers: Set[Subscriber] = set()
+        self._recent: Deque[EventRecord] = deque(maxlen=RECENT_EVENTS)
+        self._next_id = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def wanted(self, event: str) -> bool:
+        """是否有订阅者需要该类型的事件"""
+        return any(subscriber.wants(event) for subscriber in self._subscribers)
+
+    def publish(self, event: str, data: Dict[str, Any], user: Optional[str] = None, admin_only: bool = False):
+        """推送事件；指定 user 时只推送给该用户，admin_only 时只推送给管理员"""
+        self._next_id += 1
+        record = (self._next_id, event, encode_event(self._next_id, event, data), user, admin_only)
+        self._recent.append(record)
+        for subscriber in list(self._subscribers):
+            self._deliver(subscriber, record)
+
+    def _deliver(self, subscriber: Subscriber, record: EventRecord):
+        _, event, message, user, admin_only = record
+        if (user is not None and user != subscriber.username) or (admin_only and not subscriber.is_admin):
+            return
+        if not subscriber.wants(event):
+            return
+        try:
+            subscriber.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # 消费过慢：断开该连接，浏览器重连后按 Last-Event-ID 补发
+            logger.warning("事件订阅者队列已满，断开连接", extra={"fields": {"user": subscriber.username}})
+            self._remove(subscriber)
+
+    def _remove(self, subscriber: Subscriber):
+        if subscriber in self._subscribers:
+            self._subscribers.discard(subscriber)
+            metrics.EVENT_SUBSCRIBERS.dec()
+        subscriber.closed = True
+
+    def subscribe(self, user: Dict[str, Any], last_event_id: Optional[str] = None,
+                  events: Optional[FrozenSet[str]] = None) -> Subscriber:
+        """登记订阅者；带 Last-Event-ID 重连时补发之后的事件"""
+        subscriber = Subscriber(user, events)
+        self._subscribers.add(subscriber)
+        metrics.EVENT_SUBSCRIBERS.inc()
+        if last_event_id and last_event_id.isdigit():
+            after = int(last_event_id)
+            for record in self._recent:
+                if record[0] > after:
+                    self._deliver(subscriber, record)
+        return subscriber
+
+    async def stream(self, user: Dict[str, Any], last_event_id: Optional[str] = None,
+                     events: Optional[FrozenSet[str]] = None) -> AsyncIterator[bytes]:
+        """SSE 响应体；连接断开时（生成器被取消或关闭）注销订阅"""
+        subscriber = self.subscribe(user, last_event_id, events)
+        try:
+            yield b"retry: %d\n\n" % RETRY_MS
+            while not subscriber.closed:
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                if subscriber.closed:
+                    break
+                yield message
+        finally:
+            self._remove(subscriber)
+
+    def close(self):
+        """进程停止（收到停止信号时）：结束所有连接，uvicorn 才能等到连接关闭；浏览器会自动重连到其他工作进程"""
+        for subscriber in list(self._subscribers):
+            self._remove(subscriber)
+            try:
+                subscriber.queue.put_nowait(b"")
+            except asyncio.QueueFull:
+                pass
+
+
+class DataRefresher:
+    """后台统一获取发布历史和本月统计，推送给订阅者；发布成功后提前触发一次"""
+
+    def __init__(self, broadcaster: EventBroadcaster, interval: float = REFRESH_INTERVAL):
+        self.broadcaster = broadcaster
+        self.interval = interval
+        self._trigger: Optional[asyncio.Event] = None
+
+    def trigger(self):
+        """请求尽快刷新（多次触发合并为一次）"""
+        if self._trigger is not None:
+            self._trigger.set()
+
+    async def run(self, get_clients: Callable[[], Any]):
+        self._trigger = asyncio.Event()
+        while True:
+            try:
+                await asyncio.wait_for(self._trigger.wait(), self.interval)
+                # 发布刚完成时给 WordPress 一点处理时间，同时合并短时间内的多次触发
+                await asyncio.sleep(REFRESH_DELAY)
+            except asyncio.TimeoutError:
+                pass
+            self._trigger.clear()
+            if self.broadcaster.wanted("history") or self.broadcaster.wanted("stats"):
+                try:
+                    await self.refresh(get_clients())
+                except Exception as e:
+                    logger.warning("推送数据刷新失败: %s", e)
+
+    async def refresh(self, clients):
+        wp = clients.wp
+        results: List[Any] = await asyncio.gather(
+            wp.get_monthly_published_count(), wp.get_publish_history(20), return_exceptions=True
+        )
+        monthly_count, posts = results
+        if isinstance(monthly_count, Exception):
+            logger.warning("本月统计刷新失败: %s", monthly_count)
+        else:
+            self.broadcaster.publish("stats", {
+                "monthly_count": monthly_count,
+                "current_month": datetime.now().strftime("%Y年%m月"),
+            })
+        if isinstance(posts, Exception):
+            logger.warning("发布历史刷新失败: %s", posts)
+        else:
+            self.broadcaster.publish("history", {"posts": posts})
+
+
+def parse_event_types(value: Optional[str]) -> Optional[FrozenSet[str]]:
+    """解析 ?events=a,b；未指定时订阅全部，未知的类型忽略"""
+    if not value:
+        return None
+    return frozenset(name.strip() for name in value.split(",")) & EVENT_TYPES
+
+
+broadcaster = EventBroadcaster()
+refresher = DataRefresher(broadcaster)
+
+
+@on_settings_change
+def notify_config_change(old: Settings, new: Settings):
+    """配置快照替换后通知管理员页面重新加载配置（各工作进程检测到 .env 变化后各自推送）"""
+    broadcaster.publish("config", {"env_file": new.env_file}, admin_only=True)
+
+
+def publish_progress(user: str, job_id: Optional[str], stage: str, **data):
+    """推送发布进度（只发给发起发布的用户）"""
+    if job_id:
+        broadcaster.publish("publish", {"job_id": job_id, "stage": stage, **data}, user=user)
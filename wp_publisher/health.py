@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 - 依赖健康状态
+后台任务定期检查 WordPress、百度AI 等依赖并缓存结果，/health?deep=1 只读取缓存，
+负载均衡器的健康探测不会触发任何外部请求（事件循环延迟由 loop_watchdog.py 持续测量）
+"""
+
+import time
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("wp_publisher.health")
+
+
+class DependencyHealth:
+    """依赖健康状态缓存"""
+
+    def __init__(self, interval: float = 30.0):
+        self.interval = interval
+        self.snapshot: Dict[str, Any] = {}
+        self.checked_at: Optional[datetime] = None
+        self._checked_monotonic: Optional[float] = None
+
+    async def refresh(self, clients, queue_depth: Callable[[], int]):
+        """执行一次全部检查并替换缓存"""
+        site_names = list(clients.wp_sites)
+        site_results = await asyncio.gather(*(clients.wp_sites[name].check_connection() for name in site_names))
+        wordpress = dict(zip(site_names, site_results))
+
+        snapshot = {
+            "wordpress": wordpress,
+            "baidu": clients.baidu.token_status(),
+            "queue_depth": queue_depth(),
+        }
+        snapshot["status"] = "ok" if all(
+            site.get("reachable") and site.get("auth_ok") for site in wordpress.values()
+        ) else "degraded"
+
+        self.snapshot = snapshot
+        self.checked_at = datetime.now()
+        self._checked_monotonic = time.monotonic()
+
+    async def run(self, get_clients: Callable[[], Any], queue_depth: Callable[[], int]):
+        """后台刷新循环，每个工作进程各自运行"""
+        while True:
+            try:
+                await self.refresh(get_clients(), queue_depth)
+            except Exception as e:
+                logger.exception("依赖健康检查失败: %s", e)
+            await asyncio.sleep(self.interval)
+
+    def report(self) -> Dict[str, Any]:
+        """读取缓存的检查结果；超过3个刷新周期未更新时标记为过期"""
+        if self._checked_monotonic is None:
+            return {"status": "pending", "checked_at": None, "stale": True}
+        age = time.monotonic() - self._checked_monotonic
+        return {
+            **self.snapshot,
+            "checked_at": self.checked_at.isoformat(),
+            "age_seconds": round(age, 1),
+            "stale": age > self.interval * 3,
+        }
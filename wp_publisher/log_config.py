@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 - 结构化日志
+请求路径只把日志记录放入内存队列，由后台线程格式化为JSON并写入按大小轮转、gzip压缩的日志文件
+"""
+
+import os
+import gzip
+import json
+import queue
+import shutil
+import logging
+import logging.handlers
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .settings import BASE_DIR, Settings
+from .tracing import current_request_id, trace_logger
+
+# 所有业务日志记录器的根名称
+ROOT_LOGGER_NAME = "wp_publisher"
+
+# 日志目录
+LOG_DIR = BASE_DIR / "logs"
+
+# 单个字段的最大长度，超出部分截断（避免文章正文、WordPress响应写满日志）
+MAX_FIELD_LENGTH = 512
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def truncate(value: Any, limit: int = MAX_FIELD_LENGTH) -> Any:
+    """截断过长的字符串字段，其他类型转为字符串后同样处理"""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    text = value if isinstance(value, str) else str(value)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}...(共{len(text)}字符)"
+
+
+class RequestContextFilter(logging.Filter):
+    """在调用方线程中记录请求ID（后台写入线程拿不到请求上下文）"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = current_request_id()
+        return True
+
+
+class TruncatingQueueHandler(logging.handlers.QueueHandler):
+    """
+    入队前在调用方线程中截断 extra={"fields": {...}} 的字段：
+    队列中只保留截断后的副本，调用方之后修改字段字典也不影响已记录的内容
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]", max_field_length: int = MAX_FIELD_LENGTH):
+        super().__init__(log_queue)
+        self.max_field_length = max_field_length
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = super().prepare(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            record.fields = {key: truncate(value, self.max_field_length) for key, value in fields.items()}
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """单行JSON格式，extra={"fields": {...}} 中的字段（已由 TruncatingQueueHandler 截断）逐个输出"""
+
+    def __init__(self, max_field_length: int = MAX_FIELD_LENGTH):
+        super().__init__()
+        self.max_field_length = max_field_length
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": truncate(record.getMessage(), self.max_field_length * 4),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["rid"] = request_id
+        for key, value in (getattr(record, "fields", None) or {}).items():
+            entry[key] = value
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+
+
+class _ExcludeLogger(logging.Filter):
+    """排除指定记录器（及其子记录器）的日志"""
+
+    def __init__(self, name: str):
+        super().__init__()
+        self.excluded = name
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not (record.name == self.excluded or record.name.startswith(self.excluded + "."))
+
+
+def _gzip_rotator(source: str, dest: str):
+    """轮转时压缩旧日志文件"""
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def _rotating_handler(path: Path, settings: Settings) -> logging.handlers.RotatingFileHandler:
+    """按大小轮转并gzip压缩的文件处理器"""
+    handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=settings.log_max_bytes, backupCount=settings.log_backup_count, encoding="utf-8", delay=True
+    )
+    handler.namer = lambda name: name + ".gz"
+    handler.rotator = _gzip_rotator
+    return handler
+
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    """解析 LOG_LEVELS，例如 "wordpress=DEBUG,trace=WARNING"（名称相对于 wp_publisher）"""
+    levels = {}
+    for item in spec.split(","):
+        name, sep, level = item.partition("=")
+        if sep and name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging(settings: Settings) -> logging.handlers.QueueListener:
+    """配置队列日志：重复调用时先停止旧的后台线程"""
+    global _listener
+    shutdown_logging()
+
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    # 多工作进程各自写独立文件，避免多个进程同时轮转同一个文件
+    suffix = f"-{os.getpid()}" if settings.log_per_process else ""
+
+    app_handler = _rotating_handler(LOG_DIR / f"app{suffix}.log", settings)
+    app_handler.setFormatter(JsonFormatter())
+    app_handler.addFilter(_ExcludeLogger(trace_logger.name))
+
+    # 追踪记录本身已是单行JSON，原样写入
+    trace_handler = _rotating_handler(LOG_DIR / f"trace{suffix}.log", settings)
+    trace_handler.setFormatter(logging.Formatter("%(message)s"))
+    trace_handler.addFilter(logging.Filter(trace_logger.name))
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    queue_handler = TruncatingQueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(settings.log_level.upper())
+    root.propagate = False
+
+    trace_logger.setLevel(logging.INFO)
+    for name, level in _parse_levels(settings.log_levels).items():
+        logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}").setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, app_handler, trace_handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """停止后台写入线程（会先写完队列中剩余的日志）"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def reinit_logging_after_fork(settings: Settings) -> logging.handlers.QueueListener:
+    """fork 出的子进程中重新配置日志：父进程的写入线程不会被复制，不能在子进程中停止它"""
+    global _listener
+    _listener = None
+    return setup_logging(settings)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """获取业务日志记录器，例如 get_logger("wordpress") -> wp_publisher.wordpress"""
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 - 事件循环看门狗
+- 事件循环内的心跳任务持续测量定时器延迟（事件循环延迟），保留最近的样本，每隔几秒在心跳任务中计算一次分位数
+  （/health 只读取计算好的结果，负载均衡器的频繁探测不会每次都排序全部样本）
+- 独立线程检查心跳，事件循环被阻塞超过阈值时记录阻塞位置的调用栈
+"""
+
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from collections import deque
+from typing import Dict, Optional
+
+from . import metrics
+
+logger = logging.getLogger("wp_publisher.loop")
+
+
+class LoopWatchdog:
+    """事件循环延迟测量与慢回调检测"""
+
+    def __init__(self, interval: float = 0.1, slow_threshold: float = 0.1, window: int = 3000,
+                 summary_every: int = 50):
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        # 最近的延迟样本（秒），默认约5分钟
+        self.samples: deque = deque(maxlen=window)
+        # 每 summary_every 个样本（默认约5秒）重新计算一次分位数
+        self.summary_every = summary_every
+        self._summary = self.compute_percentiles()
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _tick(self):
+        """心跳任务：测量 sleep 的实际唤醒延迟"""
+        loop = asyncio.get_running_loop()
+        ticks = 0
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.samples.append(lag)
+            self._heartbeat = time.monotonic()
+            metrics.LOOP_LAG_SECONDS.observe(lag)
+            ticks += 1
+            if ticks % self.summary_every == 0:
+                self._summary = self.compute_percentiles()
+
+    def _watch(self):
+        """看门狗线程：心跳停止超过阈值说明有回调正在阻塞事件循环"""
+        reported = False
+        check_every = min(self.slow_threshold / 2, 0.05)
+        while not self._stop.wait(check_every):
+            blocked_for = time.monotonic() - self._heartbeat - self.interval
+            if blocked_for < self.slow_threshold:
+                reported = False
+                continue
+            if reported:
+                continue
+            # 每次阻塞只记录一次调用栈
+            reported = True
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "（无法获取调用栈）"
+            logger.warning(
+                "事件循环被阻塞超过 %.0fms",
+                blocked_for * 1000,
+                extra={"fields": {"blocked_ms": round(blocked_for * 1000, 1), "stack": stack}}
+            )
+
+    def start(self):
+        """在事件循环线程中调用"""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._tick())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    def percentiles(self) -> Dict[str, float]:
+        """最近一次计算的延迟分位数（毫秒），最多滞后 summary_every 个心跳"""
+        return self._summary
+
+    def compute_percentiles(self) -> Dict[str, float]:
+        """对最近样本排序计算延迟分位数（毫秒）"""
+        if not self.samples:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0, "samples": 0}
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+
+        def pick(q: float) -> float:
+            return round(ordered[min(last, int(q * last + 0.5))] * 1000, 2)
+
+        return {
+            "p50": pick(0.50),
+            "p95": pick(0.95),
+            "p99": pick(0.99),
+            "max": round(ordered[-1] * 1000, 2),
+            "samples": len(ordered),
+        }
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 - Prometheus 指标
+多工作进程部署时设置 PROMETHEUS_MULTIPROC_DIR（每次启动前清空该目录），
+/metrics 会汇总所有工作进程的数据
+"""
+
+import os
+from typing import Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+
+# 发布链路各阶段的耗时分布（秒）
+STAGE_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUESTS_TOTAL = Counter(
+    "wp_publisher_requests_total",
+    "HTTP请求数（按路由、方法和状态码分类）",
+    ["route", "method", "outcome"],
+)
+
+PUBLISH_TOTAL = Counter(
+    "wp_publisher_publish_total",
+    "文章发布请求数（按发布类型和结果分类）",
+    ["publish_type", "outcome"],
+)
+
+AUDIT_SECONDS = Histogram(
+    "wp_publisher_audit_seconds",
+    "百度AI内容审核阶段耗时",
+    buckets=STAGE_BUCKETS,
+)
+
+WP_CREATE_SECONDS = Histogram(
+    "wp_publisher_wp_create_seconds",
+    "WordPress创建文章阶段耗时（按站点）",
+    ["site"],
+    buckets=STAGE_BUCKETS,
+)
+
+PUBLISH_SECONDS = Histogram(
+    "wp_publisher_publish_seconds",
+    "/publish 总耗时",
+    buckets=STAGE_BUCKETS,
+)
+
+LOOP_LAG_SECONDS = Histogram(
+    "wp_publisher_event_loop_lag_seconds",
+    "事件循环延迟（定时器实际唤醒时间与预期之差）",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+ACTIVE_SESSIONS = Gauge(
+    "wp_publisher_active_sessions",
+    "内存中的登录会话数（各工作进程求和）",
+    multiprocess_mode="livesum",
+)
+
+PUBLISH_IN_FLIGHT = Gauge(
+    "wp_publisher_publish_in_flight",
+    "正在处理的发布请求数（各工作进程求和）",
+    multiprocess_mode="livesum",
+)
+
+EVENT_SUBSCRIBERS = Gauge(
+    "wp_publisher_event_subscribers",
+    "SSE 事件订阅连接数（各工作进程求和）",
+    multiprocess_mode="livesum",
+)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """生成 Prometheus 文本格式的指标数据，多进程模式下汇总所有工作进程"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int):
+    """工作进程退出时清理其 livesum 类型的指标文件（供进程管理器的退出钩子调用）"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 - 请求/响应模型
+"""
+
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+# 用户角色枚举
+class UserRole:
+    ADMIN = "admin"
+    OUTSOURCE = "outsource"
+
+# 请求模型
+class PublishRequest(BaseModel):
+    title: str = Field(..., description="文章标题")
+    content: str = Field(..., description="文章内容（支持HTML）")
+    # 只接受两种取值：发布类型同时是监控指标标签和统计汇总的主键，任意字符串会让两者无限增长
+    publish_type: Literal["normal", "headline"] = Field(default="normal", description="发布类型：normal（普通发布）或 headline（头条发布）")
+    sites: Optional[List[str]] = Field(default=None, description="目标站点名称列表，默认发布到全部已配置站点")
+
+class LoginRequest(BaseModel):
+    username: str = Field(..., description="用户名")
+    password: str = Field(..., description="密码")
+
+# 响应模型
+class PublishResponse(BaseModel):
+    status: str = Field(..., description="响应状态：success 或 error")
+    message: str = Field(..., description="响应消息")
+    post_id: Optional[int] = None
+    audit_result: Optional[Dict[str, Any]] = None
+    violations: Optional[list] = None
+    site_results: Optional[Dict[str, Dict[str, Any]]] = None  # 多站点发布：各站点结果
+
+class LoginResponse(BaseModel):
+    status: str = Field(..., description="登录状态：success 或 error")
+    message: str = Field(..., description="响应消息")
+    role: Optional[str] = None
+    redirect_url: Optional[str] = None
+
+class MonthlyStatsResponse(BaseModel):
+    status: str = Field(..., description="响应状态")
+    message: str = Field(..., description="响应消息")
+    monthly_count: int = Field(..., description="本月发布数量")
+    current_month: str = Field(..., description="当前月份")
+
+# V2.4新增：发布历史响应模型
+class PublishHistoryResponse(BaseModel):
+    status: str = Field(..., description="响应状态")
+    message: str = Field(..., description="响应消息")
+    posts: List[Dict[str, Any]] = Field(..., description="文章列表")
+    total: int = Field(..., description="总数量")
+
+# 发布统计汇总响应模型
+class StatsSummaryResponse(BaseModel):
+    status: str = Field(..., description="响应状态")
+    message: str = Field(..., description="响应消息")
+    total: int = Field(0, description="累计发布次数")
+    success: int = Field(0, description="累计成功次数")
+    success_rate: float = Field(0.0, description="成功率（百分比）")
+    audit_rejected: int = Field(0, description="累计审核拒绝次数")
+    today: int = Field(0, description="今日发布次数")
+    by_outcome: Dict[str, int] = Field(default_factory=dict, description="按结果的累计次数")
+    by_publish_type: Dict[str, int] = Field(default_factory=dict, description="按发布类型的累计次数")
+    by_user: List[Dict[str, Any]] = Field(default_factory=list, description="统计窗口内按用户的次数")
+    series: Dict[str, List[Any]] = Field(default_factory=dict, description="按日序列：days 为日期，其余为各结果的次数")
+
+# 草稿同步模型：对某个字段的一次替换（位置和长度按 UTF-16 码元计算）
+class DraftOp(BaseModel):
+    field: Literal["title", "content", "mode"] = Field(..., description="修改的字段")
+    start: int = Field(..., ge=0, description="起始位置")
+    delete: int = Field(0, ge=0, description="删除的长度")
+    insert: str = Field("", description="插入的文本")
+
+class DraftPatchRequest(BaseModel):
+    base_version: int = Field(..., ge=0, description="修改所基于的版本号，没有草稿时为0")
+    ops: List[DraftOp] = Field(..., max_length=50, description="按顺序应用的修改")
+    length: Optional[int] = Field(default=None, description="修改后内容的长度，用于校验两边一致")
+
+class DraftResponse(BaseModel):
+    status: str = Field(..., description="响应状态：success、conflict 或 error")
+    message: str = Field(..., description="响应消息")
+    version: int = Field(0, description="草稿当前版本号")
+    draft: Optional[Dict[str, Any]] = Field(default=None, description="草稿内容（读取草稿或版本冲突时返回）")
+
+# 配置管理模型
+class ConfigRequest(BaseModel):
+    wp_username: Optional[str] = None
+    wp_app_password: Optional[str] = None
+    wp_domain: Optional[str] = None
+    baidu_api_key: Optional[str] = None
+    baidu_secret_key: Optional[str] = None
+    client_auth_token: Optional[str] = None
+    test_mode: Optional[bool] = None
+    enable_ai_check: Optional[bool] = None  # V2.4新增
+
+class ConfigResponse(BaseModel):
+    status: str
+    message: str
+    config: Optional[Dict[str, Any]] = None
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 - 页面渲染缓存
+页面模板不包含用户相关内容（用户名、角色、统计等由页面加载后的 JSON 接口填充），
+因此每个页面只渲染一次（压缩版本也只压缩一次），之后直接从内存返回，并通过 ETag 支持 304
+
+模板编译结果写入字节码缓存目录，进程重启（包括 gunicorn 回收工作进程）时不必重新解析模板
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from starlette.datastructures import Headers
+from starlette.responses import HTMLResponse, Response
+
+from .compression import compress_body, negotiate
+from .log_config import get_logger
+
+logger = get_logger("app")
+
+# 页面需要登录访问，浏览器可以缓存但每次都要带 If-None-Match 向服务器确认
+PAGE_CACHE_CONTROL = "private, no-cache"
+
+
+class RenderedPage:
+    """渲染好的页面：正文、ETag，以及按需生成并缓存的压缩版本"""
+
+    __slots__ = ("body", "digest", "etag", "_encoded")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.digest = hashlib.sha256(body).hexdigest()[:16]
+        self.etag = '"%s"' % self.digest
+        self._encoded: Dict[str, bytes] = {}
+
+    def variant(self, encoding: Optional[str]) -> Tuple[bytes, str]:
+        """按编码返回正文和对应的 ETag（不同编码是不同的表示，ETag 不能相同）"""
+        if encoding is None:
+            return self.body, self.etag
+        body = self._encoded.get(encoding)
+        if body is None:
+            body = self._encoded[encoding] = compress_body(self.body, encoding)
+        return body, '"%s-%s"' % (self.digest, encoding)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 是否命中（弱比较，支持多个值和 *）"""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or (candidate[2:] if candidate.startswith("W/") else candidate) == etag:
+            return True
+    return False
+
+
+class PageCache:
+    """预编译模板并缓存渲染结果"""
+
+    def __init__(self, templates_dir: Path, bytecode_dir: Optional[Path] = None):
+        self.bytecode_dir = bytecode_dir
+        bytecode_cache = FileSystemBytecodeCache(str(bytecode_dir)) if bytecode_dir is not None else None
+        self.env = Environment(
+            loader=FileSystemLoader(str(templates_dir)),
+            autoescape=True,
+            bytecode_cache=bytecode_cache,
+            # 模板只随部署变化，不必每次检查文件修改时间
+            auto_reload=False,
+        )
+        self._pages: Dict[str, RenderedPage] = {}
+
+    def precompile(self, names: Iterable[str]):
+        """启动时编译并渲染页面（预加载模式下在主进程中完成，工作进程直接共享）"""
+        for name in names:
+            self.get(name)
+        logger.info("页面模板已预编译", extra={"fields": {"pages": list(self._pages)}})
+
+    def get(self, name: str) -> RenderedPage:
+        """获取渲染结果，首次访问时渲染"""
+        page = self._pages.get(name)
+        if page is None:
+            if self.bytecode_dir is not None:
+                self.bytecode_dir.mkdir(parents=True, exist_ok=True)
+            page = RenderedPage(self.env.get_template(name).render().encode("utf-8"))
+            self._pages[name] = page
+        return page
+
+    def clear(self):
+        """丢弃渲染结果（静态资源清单变化后需要重新渲染）"""
+        self._pages.clear()
+
+    def response(self, request_headers: Headers, name: str) -> Response:
+        """返回页面（压缩结果同样缓存，不经过压缩中间件）；浏览器缓存的版本仍有效时返回 304"""
+        encoding = negotiate(request_headers.get("accept-encoding", ""))
+        body, etag = self.get(name).variant(encoding)
+        headers = {"ETag": etag, "Cache-Control": PAGE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+        if etag_matches(request_headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=headers)
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return HTMLResponse(body, headers=headers)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 - 在线性能剖析
+在运行中的进程上限时采样，无需重启或本地复现：
+- sample：后台线程定期抓取事件循环线程的调用栈，输出 collapsed stack 文本（可直接生成火焰图）
+- cprofile：在事件循环线程上启用 cProfile，输出 pstats 文件
+"""
+
+import os
+import sys
+import time
+import asyncio
+import marshal
+import cProfile
+import threading
+from collections import Counter
+from typing import Optional
+
+# 单次剖析的最长时间（秒）
+MAX_SECONDS = 60
+
+# 同一时间只允许一个剖析任务
+_profile_lock = asyncio.Lock()
+
+
+class ProfilerBusyError(RuntimeError):
+    """已有剖析任务在运行"""
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def collapse_stack(frame) -> str:
+    """将调用栈转换为 collapsed 格式（根在前，分号分隔）"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """低开销采样器：独立线程按固定间隔读取目标线程的当前栈"""
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[collapse_stack(frame)] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        """停止采样并等待采样线程结束（最多一个采样间隔，在事件循环中应通过线程池调用）"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.samples
+
+
+def format_collapsed(samples: Counter) -> str:
+    """输出 flamegraph.pl / speedscope 可读取的 collapsed stack 文本"""
+    return "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+
+
+async def sample_profile(seconds: float, interval: float = 0.005) -> str:
+    """对事件循环线程采样 seconds 秒，返回 collapsed stack 文本"""
+    if _profile_lock.locked():
+        raise ProfilerBusyError("已有剖析任务在运行")
+    async with _profile_lock:
+        sampler = StackSampler(threading.get_ident(), interval)
+        sampler.start()
+        try:
+            await asyncio.sleep(min(seconds, MAX_SECONDS))
+        finally:
+            # 等待采样线程退出不阻塞事件循环
+            samples = await asyncio.get_running_loop().run_in_executor(None, sampler.stop)
+    return format_collapsed(samples)
+
+
+async def cprofile_profile(seconds: float) -> bytes:
+    """在事件循环线程上启用 cProfile seconds 秒，返回 pstats 文件内容"""
+    if _profile_lock.locked():
+        raise ProfilerBusyError("已有剖析任务在运行")
+    async with _profile_lock:
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            await asyncio.sleep(min(seconds, MAX_SECONDS))
+        finally:
+            profile.disable()
+    profile.create_stats()
+    return marshal.dumps(profile.stats)
+
+
+def profile_filename(mode: str) -> str:
+    """下载文件名"""
+    suffix = "collapsed.txt" if mode == "sample" else "pstats"
+    return f"profile-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}.{suffix}"
@@ -0,0 +1,698 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 - 路由
+进程级服务对象（发布任务登记、依赖健康、事件循环看门狗）由 create_app 放在 app.state 中
+"""
+
+import time
+import asyncio
+import secrets
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request, Response, Cookie
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
+
+from . import drain, events, metrics, profiler, tracing
+from .assets import asset_url
+from .auth import (
+    SESSIONS, AuthManager, SessionManager, require_admin, require_login, verify_client_auth
+)
+from .clients import ClientBundle, get_clients
+from .drafts import DraftConflictError, DraftTooLargeError, drafts
+from .log_config import get_logger
+from .pages import PageCache
+from .models import (
+    ConfigRequest, ConfigResponse, DraftPatchRequest, DraftResponse, LoginResponse, MonthlyStatsResponse,
+    PublishHistoryResponse, PublishRequest, PublishResponse, StatsSummaryResponse, UserRole
+)
+from .settings import BASE_DIR, env_overridden, get_settings, reload_settings, write_env_file
+from .stats import publish_stats
+
+logger = get_logger("app")
+publish_logger = get_logger("publish")
+
+# JSON 响应统一用 orjson 序列化（发布历史、审核结果等较大的响应明显更快）
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# 模板配置 - 使用绝对路径适配宝塔环境；页面与用户无关，渲染一次后从内存返回
+pages = PageCache(BASE_DIR / "templates", BASE_DIR / "cache" / "jinja")
+# 模板中用 asset_url() 引用静态资源，构建后自动指向带哈希的文件
+pages.env.globals["asset_url"] = asset_url
+# 启动时预编译的页面
+PAGE_TEMPLATES = ("login.html", "index_v2_4.html", "admin_dashboard.html")
+
+@router.get("/login", response_class=HTMLResponse)
+async def login_page(request: Request):
+    """登录页面"""
+    return pages.response(request.headers, "login.html")
+
+@router.post("/login", response_model=LoginResponse)
+async def login(response: Response, username: str = Form(...), password: str = Form(...)):
+    """用户登录接口"""
+    try:
+        # 清理过期会话
+        SessionManager.cleanup_expired_sessions()
+        
+        # 验证用户凭据
+        role = AuthManager.verify_credentials(username, password)
+        if not role:
+            return LoginResponse(
+                status="error",
+                message="用户名或密码错误"
+            )
+        
+        # 创建会话
+        session_id = SessionManager.create_session(username, role)
+        
+        # 设置Cookie - 安全配置
+        response.set_cookie(
+            key="session_id",
+            value=session_id,
+            max_age=24 * 60 * 60,  # 24小时
+            httponly=True,  # 防止XSS攻击
+            secure=get_settings().secure_cookies,  # 生产环境启用HTTPS
+            samesite="lax"  # 防止CSRF攻击
+        )
+        
+        # 根据角色确定重定向URL
+        redirect_url = "/admin/dashboard" if role == UserRole.ADMIN else "/"
+        
+        return LoginResponse(
+            status="success",
+            message="登录成功",
+            role=role,
+            redirect_url=redirect_url
+        )
+        
+    except Exception as e:
+        return LoginResponse(
+            status="error",
+            message=f"登录失败: {str(e)}"
+        )
+
+@router.post("/logout")
+async def logout(response: Response, session_id: str = Cookie(None, alias="session_id")):
+    """用户登出接口"""
+    if session_id:
+        SessionManager.delete_session(session_id)
+    
+    # 清除Cookie
+    response.delete_cookie(key="session_id")
+    
+    return {"status": "success", "message": "已成功登出"}
+
+@router.get("/", response_class=HTMLResponse)
+async def root(request: Request, current_user: Dict[str, Any] = Depends(require_login)):
+    """主页面 - 需要登录（用户信息由 /api/user 提供）"""
+    return pages.response(request.headers, "index_v2_4.html")
+
+@router.get("/admin/dashboard", response_class=HTMLResponse)
+async def admin_dashboard(request: Request, current_user: Dict[str, Any] = Depends(require_admin)):
+    """系统管理页面 - 需要管理员权限（用户信息由 /api/user 提供）"""
+    return pages.response(request.headers, "admin_dashboard.html")
+
+@router.post("/admin/profile")
+async def profile_process(
+    seconds: float = 10,
+    mode: str = "sample",
+    interval_ms: float = 5,
+    current_user: Dict[str, Any] = Depends(require_admin)
+):
+    """
+    在线性能剖析 - 需要管理员权限
+    mode=sample：采样事件循环线程调用栈，返回 collapsed stack 文本（可生成火焰图）
+    mode=cprofile：返回 pstats 文件（python -m pstats 或 snakeviz 查看）
+    多工作进程部署时只剖析处理本次请求的进程
+    """
+    if mode not in ("sample", "cprofile"):
+        raise HTTPException(status_code=400, detail="mode 只能是 sample 或 cprofile")
+    if not 0 < seconds <= profiler.MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds 取值范围为 (0, {profiler.MAX_SECONDS}]")
+    
+    logger.info("开始性能剖析", extra={"fields": {
+        "user": current_user["username"], "mode": mode, "seconds": seconds
+    }})
+    try:
+        if mode == "sample":
+            content = (await profiler.sample_profile(seconds, max(interval_ms, 1) / 1000)).encode("utf-8")
+            media_type = "text/plain; charset=utf-8"
+        else:
+            content = await profiler.cprofile_profile(seconds)
+            media_type = "application/octet-stream"
+    except profiler.ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{profiler.profile_filename(mode)}"'}
+    )
+
+@router.get("/api/stats/monthly", response_model=MonthlyStatsResponse)
+async def get_monthly_stats(current_user: Dict[str, Any] = Depends(require_login)):
+    """获取本月发布统计 - V2.4版本"""
+    try:
+        # 获取本月发布数量
+        monthly_count = await get_clients().wp.get_monthly_published_count()
+        
+        # 获取当前月份
+        current_month = datetime.now().strftime("%Y年%m月")
+        
+        return MonthlyStatsResponse(
+            status="success",
+            message="统计数据获取成功",
+            monthly_count=monthly_count,
+            current_month=current_month
+        )
+        
+    except Exception as e:
+        return MonthlyStatsResponse(
+            status="error",
+            message=f"统计数据获取失败: {str(e)}",
+            monthly_count=0,
+            current_month=datetime.now().strftime("%Y年%m月")
+        )
+
+@router.get("/api/stats/summary", response_model=StatsSummaryResponse)
+async def get_stats_summary(current_user: Dict[str, Any] = Depends(require_admin), days: int = 7):
+    """发布统计汇总（管理后台）：读取服务端按日累加的汇总行，不随发布历史增长"""
+    try:
+        loop = asyncio.get_running_loop()
+        summary = await loop.run_in_executor(None, publish_stats.summary, days)
+        return StatsSummaryResponse(status="success", message="统计汇总获取成功", **summary)
+    except Exception as e:
+        logger.error("统计汇总获取失败: %s", e)
+        return StatsSummaryResponse(status="error", message=f"统计汇总获取失败: {str(e)}")
+
+@router.get("/api/publish/history", response_model=PublishHistoryResponse)
+async def get_publish_history(current_user: Dict[str, Any] = Depends(require_login), limit: int = 20):
+    """获取发布历史 - V2.4新增功能"""
+    try:
+        # 获取发布历史
+        posts = await get_clients().wp.get_publish_history(limit)
+        
+        return PublishHistoryResponse(
+            status="success",
+            message="发布历史获取成功",
+            posts=posts,
+            total=len(posts)
+        )
+        
+    except Exception as e:
+        return PublishHistoryResponse(
+            status="error",
+            message=f"发布历史获取失败: {str(e)}",
+            posts=[],
+            total=0
+        )
+
+@router.get("/api/draft", response_model=DraftResponse)
+async def get_draft(current_user: Dict[str, Any] = Depends(require_login)):
+    """读取当前用户的草稿（最新版本）"""
+    loop = asyncio.get_running_loop()
+    draft = await loop.run_in_executor(None, drafts.get, current_user["username"])
+    return DraftResponse(
+        status="success",
+        message="草稿获取成功" if draft else "暂无草稿",
+        version=draft["version"] if draft else 0,
+        draft=draft
+    )
+
+@router.patch("/api/draft", response_model=DraftResponse)
+async def patch_draft(patch: DraftPatchRequest, current_user: Dict[str, Any] = Depends(require_login)):
+    """提交草稿的增量修改；版本冲突时返回 409 和最新草稿，由页面重新比较后再提交"""
+    loop = asyncio.get_running_loop()
+    try:
+        version = await loop.run_in_executor(
+            None, drafts.patch, current_user["username"], patch.base_version,
+            [op.model_dump() for op in patch.ops], patch.length
+        )
+    except DraftConflictError as e:
+        latest = e.latest
+        return ORJSONResponse(
+            status_code=409,
+            content=DraftResponse(
+                status="conflict", message=str(e), version=latest["version"] if latest else 0, draft=latest
+            ).model_dump()
+        )
+    except DraftTooLargeError as e:
+        return ORJSONResponse(
+            status_code=413,
+            content=DraftResponse(status="error", message=str(e)).model_dump()
+        )
+    return DraftResponse(status="success", message="草稿已保存", version=version)
+
+@router.delete("/api/draft", response_model=DraftResponse)
+async def clear_draft(current_user: Dict[str, Any] = Depends(require_login)):
+    """清空当前用户的草稿（发布成功或重置表单后）"""
+    loop = asyncio.get_running_loop()
+    version = await loop.run_in_executor(None, drafts.clear, current_user["username"])
+    return DraftResponse(status="success", message="草稿已清空", version=version)
+
+@router.get("/api/events")
+async def event_stream(request: Request, current_user: Dict[str, Any] = Depends(require_login),
+                       types: Optional[str] = Query(None, alias="events")):
+    """服务器推送事件（SSE）：发布进度、发布历史和本月统计的变化，替代页面定时轮询；events 指定只订阅的事件类型"""
+    return StreamingResponse(
+        events.broadcaster.stream(
+            current_user, request.headers.get("last-event-id"), events.parse_event_types(types)
+        ),
+        media_type="text/event-stream",
+        # 禁止 nginx 缓冲，事件立即送达浏览器
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# 本进程正在处理的发布请求数
+publish_in_flight = 0
+
+def get_publish_in_flight() -> int:
+    """本进程正在处理的发布请求数"""
+    return publish_in_flight
+
+def publish_outcome(response: PublishResponse) -> str:
+    """发布结果分类（用于指标标签）"""
+    if response.status == "success":
+        return "success"
+    if response.audit_result is None:
+        return "error"
+    if response.audit_result.get("conclusionType") == 1:
+        return "wp_error"
+    return "audit_rejected"
+
+@router.post("/publish", response_model=PublishResponse)
+async def publish_article(
+    request: PublishRequest,
+    http_request: Request,
+    current_user: Dict[str, Any] = Depends(require_login)
+):
+    """
+    发布文章接口 - V2.5版本
+    1. 验证用户登录状态
+    2. 百度AI内容审核（可选）
+    3. 发布到WordPress（支持普通发布和头条发布）
+    """
+    publish_drain: drain.PublishDrain = http_request.app.state.publish_drain
+    
+    # 服务正在停止：拒绝新的发布，客户端稍后重试（会由其他工作进程/重启后的进程处理）
+    if not publish_drain.accepting:
+        return ORJSONResponse(
+            status_code=503,
+            content=PublishResponse(status="error", message="服务正在重启，请稍后重试").model_dump(),
+            headers={"Retry-After": "5"}
+        )
+    
+    # 发布在独立任务中执行：客户端断开或服务停止时不会中途取消，由 lifespan 在退出前等待其完成
+    task = publish_drain.submit(
+        execute_publish(request, current_user),
+        job_id=tracing.current_request_id() or secrets.token_hex(8),
+        payload={"user": current_user["username"], **request.model_dump()}
+    )
+    return await publish_drain.wait(task)
+
+async def execute_publish(request: PublishRequest, current_user: Dict[str, Any]) -> PublishResponse:
+    """执行一次发布并记录指标"""
+    global publish_in_flight
+    start_time = time.perf_counter()
+    publish_in_flight += 1
+    try:
+        with metrics.PUBLISH_IN_FLIGHT.track_inprogress():
+            response = await run_publish(request, current_user)
+    finally:
+        publish_in_flight -= 1
+    metrics.PUBLISH_SECONDS.observe(time.perf_counter() - start_time)
+    outcome = publish_outcome(response)
+    metrics.PUBLISH_TOTAL.labels(publish_type=request.publish_type, outcome=outcome).inc()
+    try:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, publish_stats.record, current_user["username"], request.publish_type, outcome
+        )
+        # 管理后台收到通知后重新读取统计汇总（包括失败和审核拒绝的发布）
+        events.broadcaster.publish("summary", {"outcome": outcome}, admin_only=True)
+    except Exception as e:
+        # 统计写入失败不影响发布结果
+        logger.warning("发布统计写入失败: %s", e)
+    events.publish_progress(
+        current_user["username"], tracing.current_request_id(), "done",
+        status=response.status, message=response.message, post_id=response.post_id
+    )
+    if response.status == "success":
+        # 发布历史和本月统计有变化：稍后统一刷新并推送给所有订阅的页面
+        events.refresher.trigger()
+    return response
+
+async def run_publish(request: PublishRequest, current_user: Dict[str, Any]) -> PublishResponse:
+    """发布流程主体：审核 → 发布到各目标站点 → 构建响应"""
+    
+    # 整个请求使用同一个配置/客户端快照，配置热更新不会影响进行中的发布
+    clients = get_clients()
+    
+    try:
+        # 1. 用户已通过依赖注入验证登录状态
+        publish_type_text = "头条文章" if request.publish_type == "headline" else "普通文章"
+        publish_logger.info("用户正在发布%s", publish_type_text, extra={"fields": {
+            "user": current_user['username'],
+            "role": current_user['role'],
+            "title": request.title,
+            "content_length": len(request.content)
+        }})
+        
+        # 2. 验证外包身份（保持向后兼容）
+        if not verify_client_auth():
+            return PublishResponse(
+                status="error",
+                message="身份验证失败：系统配置错误"
+            )
+        
+        # 多站点：先确定目标站点，避免为无效请求执行审核
+        target_sites = clients.select_sites(request.sites)
+        if not target_sites:
+            return PublishResponse(
+                status="error",
+                message=f"未知的目标站点: {', '.join(request.sites)}，可用站点: {', '.join(clients.wp_sites)}"
+            )
+        
+        # 阶段计时：请求解析、登录校验、参数校验
+        tracing.lap("validation")
+        drain.mark_stage("audit")
+        events.publish_progress(current_user["username"], tracing.current_request_id(), "audit")
+        
+        # 3. 百度AI内容审核（V2.5：头条文章也需要审核）
+        ai_check_enabled = clients.settings.enable_ai_check
+        
+        if ai_check_enabled:
+            # 合并标题和内容进行审核
+            full_text = f"{request.title}\n\n{request.content}"
+            with metrics.AUDIT_SECONDS.time(), tracing.stage("audit"):
+                audit_result = await clients.baidu.text_audit(full_text)
+            
+            # 检查审核结果
+            conclusion_type = audit_result.get("conclusionType", 0)
+            
+            if conclusion_type == 2:  # 不合规
+                violations = audit_result.get("violations", [])
+                violation_words = []
+                for violation in violations:
+                    violation_words.extend(violation.get("违规词汇", []))
+                
+                return PublishResponse(
+                    status="error",
+                    message=f"敏感词拦截：{', '.join(violation_words) if violation_words else '检测到违规内容'}",
+                    audit_result=audit_result,
+                    violations=violations
+                )
+            
+            elif conclusion_type != 1:  # 既不是合规也不是不合规
+                return PublishResponse(
+                    status="error",
+                    message=f"内容审核状态异常: {conclusion_type}，请稍后重试",
+                    audit_result=audit_result
+                )
+        else:
+            # AI审核已禁用，直接跳过
+            audit_result = {
+                "conclusionType": 1,
+                "message": "AI审核已禁用，内容直接通过",
+                "ai_check_disabled": True
+            }
+            publish_logger.info("AI审核已禁用，内容将直接发布到WordPress")
+        
+        # 4. 审核通过或跳过，并发发布到各目标站点（审核只做一次）
+        drain.mark_stage("wp", audit_result=audit_result)
+        events.publish_progress(current_user["username"], tracing.current_request_id(), "wp")
+        publish_logger.info("开始发布到WordPress", extra={"fields": {"publish_type": request.publish_type, "sites": list(target_sites)}})
+        with tracing.stage("wp"):
+            wp_results = await ClientBundle.create_post_on_sites(
+                target_sites, request.title, request.content, request.publish_type
+            )
+        
+        succeeded = {name: result for name, result in wp_results.items() if not result.get("error")}
+        failed = {name: result for name, result in wp_results.items() if result.get("error")}
+        multi_site = len(wp_results) > 1
+        site_results = {
+            name: {
+                "status": "error" if result.get("error") else "success",
+                "post_id": result.get("id"),
+                "wp_status": result.get("status"),
+                "link": result.get("link"),
+                "message": result.get("message")
+            }
+            for name, result in wp_results.items()
+        } if multi_site else None
+        
+        # V2.5新增：检查WordPress API调用是否成功
+        if not succeeded:
+            # WordPress API调用失败
+            if multi_site:
+                error_message = "WordPress发布失败: " + "；".join(
+                    f"{name}: {result.get('message', '未知错误')}" for name, result in failed.items()
+                )
+            else:
+                error_message = f"WordPress发布失败: {next(iter(failed.values())).get('message', '未知错误')}"
+            publish_logger.error(error_message)
+            return PublishResponse(
+                status="error",
+                message=error_message,
+                audit_result=audit_result,
+                site_results=site_results
+            )
+        
+        wp_result = next(iter(succeeded.values()))
+        
+        # 发布成功 - 根据发布类型返回不同的消息
+        if request.publish_type == "headline":
+            success_message = "头条文章保存成功"
+        else:
+            success_message = "文章发布成功"
+            
+        if not ai_check_enabled:
+            success_message += "（AI审核已禁用）"
+        
+        # 根据WordPress返回的状态添加额外信息
+        wp_status = wp_result.get("status", "unknown")
+        
+        if wp_status == "pending":
+            success_message += "，已提交待审核队列"
+        elif wp_status == "publish":
+            success_message += "，已直接发布"
+        elif wp_status == "draft":
+            if request.publish_type == "headline":
+                success_message += "，已保存为草稿"
+            else:
+                success_message += "，已保存为草稿"
+        
+        if multi_site:
+            success_message += f"（{len(succeeded)}/{len(wp_results)} 个站点成功"
+            if failed:
+                success_message += f"，失败站点: {', '.join(failed)}"
+            success_message += "）"
+        
+        publish_logger.info(success_message, extra={"fields": {
+            "post_id": wp_result.get("id"),
+            "wp_status": wp_status,
+            "sites_ok": list(succeeded),
+            "sites_failed": list(failed)
+        }})
+        
+        response = PublishResponse(
+            status="success",
+            message=success_message,
+            post_id=wp_result.get("id"),
+            audit_result=audit_result,
+            site_results=site_results
+        )
+        tracing.lap("response")
+        return response
+        
+    except HTTPException as e:
+        # 返回具体的错误信息
+        return PublishResponse(
+            status="error",
+            message=e.detail
+        )
+    except Exception as e:
+        # 处理其他异常
+        publish_logger.exception("发布失败: %s", e)
+        return PublishResponse(
+            status="error",
+            message=f"发布失败: {str(e)}"
+        )
+
+@router.get("/config")
+async def get_config(current_user: Dict[str, Any] = Depends(require_admin)):
+    """获取当前配置信息 - 需要管理员权限"""
+    try:
+        settings = get_settings()
+        config = {
+            "wp_domain": settings.wp_domain,
+            "wp_username": settings.wp_username,
+            "wp_app_password": "已配置" if settings.wp_app_password else None,
+            "baidu_api_key": "已配置" if settings.baidu_api_key else None,
+            "baidu_secret_key": "已配置" if settings.baidu_secret_key else None,
+            "client_auth_token": "已配置" if settings.client_auth_token else None,
+            "test_mode": settings.test_mode,
+            "enable_ai_check": settings.enable_ai_check,  # V2.4新增
+            "wp_sites": [site.name for site in settings.wp_sites]
+        }
+        
+        return ConfigResponse(
+            status="success",
+            message="配置获取成功",
+            config=config
+        )
+        
+    except Exception as e:
+        return ConfigResponse(
+            status="error",
+            message=f"配置获取失败: {str(e)}"
+        )
+
+# 串行化本进程内的配置写入
+CONFIG_WRITE_LOCK = asyncio.Lock()
+
+@router.post("/config")
+async def update_config(config_request: ConfigRequest, current_user: Dict[str, Any] = Depends(require_admin)):
+    """更新配置信息 - 需要管理员权限"""
+    try:
+        env_file = get_settings().env_file
+        updates = {}
+        updated_fields = []
+        
+        # 收集各个配置项，最后一次性写入
+        if config_request.wp_username is not None:
+            updates["WP_USERNAME"] = config_request.wp_username
+            updated_fields.append("WordPress用户名")
+        
+        if config_request.wp_app_password is not None:
+            updates["WP_APP_PASSWORD"] = config_request.wp_app_password
+            updated_fields.append("WordPress应用密码")
+        
+        if config_request.wp_domain is not None:
+            updates["WP_DOMAIN"] = config_request.wp_domain
+            updated_fields.append("WordPress域名")
+        
+        if config_request.baidu_api_key is not None:
+            updates["BAIDU_API_KEY"] = config_request.baidu_api_key
+            updated_fields.append("百度API密钥")
+        
+        if config_request.baidu_secret_key is not None:
+            updates["BAIDU_SECRET_KEY"] = config_request.baidu_secret_key
+            updated_fields.append("百度Secret密钥")
+        
+        if config_request.client_auth_token is not None:
+            updates["CLIENT_AUTH_TOKEN"] = config_request.client_auth_token
+            updated_fields.append("客户端认证令牌")
+        
+        if config_request.test_mode is not None:
+            updates["TEST_MODE"] = str(config_request.test_mode).lower()
+            updated_fields.append("测试模式")
+        
+        # V2.4新增：AI审核开关保存
+        if config_request.enable_ai_check is not None:
+            updates["ENABLE_AI_CHECK"] = str(config_request.enable_ai_check).lower()
+            updated_fields.append("AI内容审核开关")
+        
+        if updates:
+            # 在线程池中一次原子重命名写入，不阻塞事件循环
+            async with CONFIG_WRITE_LOCK:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, write_env_file, Path(env_file), updates)
+                
+                # 立即在本进程替换配置快照和客户端快照；其他工作进程由 watch_settings 检测到文件变化后替换
+                reload_settings(force=True)
+        
+        message = f"配置更新成功: {', '.join(updated_fields)}"
+        overridden = env_overridden(updates)
+        if overridden:
+            # 进程环境变量优先于 .env，这些项需要在 systemd/启动环境中修改
+            message += f"（{', '.join(overridden)} 由进程环境变量设置，.env 中的修改不会生效）"
+        
+        return ConfigResponse(
+            status="success",
+            message=message
+        )
+        
+    except Exception as e:
+        return ConfigResponse(
+            status="error",
+            message=f"配置更新失败: {str(e)}"
+        )
+
+@router.get("/health")
+async def health_check(request: Request, deep: bool = False):
+    """健康检查接口；deep=1 时附带后台缓存的依赖状态（不会触发外部请求）"""
+    result = {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "service": "文章发布系统 V2.4",
+        "version": "2.4.0",
+        "active_sessions": len(SESSIONS),
+        "ai_check_enabled": get_settings().enable_ai_check
+    }
+    # 事件循环延迟分位数（毫秒），持续升高说明有阻塞调用拖慢所有并发请求
+    state = request.app.state
+    result["event_loop_lag_ms"] = state.watchdog.percentiles()
+    if deep:
+        result["dependencies"] = state.dependency_health.report()
+    if not state.publish_drain.accepting:
+        # 正在停止：让负载均衡器尽快摘除本节点
+        result["status"] = "draining"
+        return ORJSONResponse(status_code=503, content=result)
+    return result
+
+@router.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus 指标接口（多工作进程时汇总所有进程）"""
+    content, content_type = metrics.render_metrics()
+    return Response(content=content, media_type=content_type)
+
+@router.get("/api/info")
+async def api_info():
+    """API信息接口"""
+    return {
+        "service": "文章发布系统 V2.4",
+        "version": "2.4.0",
+        "endpoints": {
+            "用户登录": "POST /login",
+            "用户登出": "POST /logout",
+            "发布文章": "POST /publish",
+            "本月统计": "GET /api/stats/monthly",
+            "统计汇总（管理员）": "GET /api/stats/summary?days=7",
+            "发布历史": "GET /api/publish/history",  # V2.4新增
+            "草稿同步": "GET|PATCH|DELETE /api/draft",
+            "健康检查": "GET /health",
+            "依赖健康检查": "GET /health?deep=1",
+            "性能剖析（管理员）": "POST /admin/profile?seconds=10&mode=sample|cprofile",
+            "监控指标": "GET /metrics",
+            "API文档": "GET /docs"
+        },
+        "features": [
+            "编辑器HTML代码模式",  # V2.4新增
+            "发布历史面板",        # V2.4新增
+            "AI审核开关优化",      # V2.4新增
+            "Web UI深度重构与极简布局",
+            "本月发布统计功能",
+            "多角色登录系统（管理员 vs 外包人员）",
+            "基于Session的身份认证",
+            "路由权限控制",
+            "百度AI内容审核（可选）",
+            "增强容错机制",
+            "本地测试环境优化"
+        ]
+    }
+
+@router.get("/api/user")
+async def get_current_user_info(current_user: Dict[str, Any] = Depends(require_login)):
+    """获取当前用户信息"""
+    return {
+        "status": "success",
+        "user": {
+            "username": current_user["username"],
+            "role": current_user["role"],
+            "login_time": current_user["created_at"].isoformat(),
+            "expires_at": current_user["expires_at"].isoformat()
+        }
+    }
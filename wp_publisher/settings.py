@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 - 配置快照
+.env 只解析一次，生成不可变的类型化配置对象；文件变化时整体原子替换
+"""
+
+import os
+import re
+import asyncio
+import logging
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from dotenv import dotenv_values
+
+# 项目根目录（包的上一级，.env、templates、static 所在位置），适配宝塔环境
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+logger = logging.getLogger("wp_publisher.settings")
+
+# 配置文件候选：优先 .env，其次 .env.production
+ENV_CANDIDATES = (BASE_DIR / ".env", BASE_DIR / ".env.production")
+
+
+def _parse_bool(value: Optional[str], default: bool) -> bool:
+    """解析布尔型配置（true/false，大小写不敏感）"""
+    if value is None or value == "":
+        return default
+    return value.strip().lower() == "true"
+
+
+def _parse_int(value: Optional[str], default: int) -> int:
+    """解析整数型配置，非法值回退到默认值"""
+    try:
+        return int(value) if value not in (None, "") else default
+    except ValueError:
+        return default
+
+
+def _parse_float(value: Optional[str], default: float) -> float:
+    """解析浮点型配置，非法值回退到默认值"""
+    try:
+        return float(value) if value not in (None, "") else default
+    except ValueError:
+        return default
+
+
+def _parse_list(value: Optional[str], default: Tuple[str, ...]) -> Tuple[str, ...]:
+    """解析逗号分隔的列表型配置"""
+    if value is None or value.strip() == "":
+        return default
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+def _site_env_prefix(name: str) -> str:
+    """站点名转换为环境变量前缀，例如 site-b -> WP_SITE_B_"""
+    return "WP_" + re.sub(r"[^A-Za-z0-9]", "_", name).upper() + "_"
+
+
+@dataclass(frozen=True)
+class WordPressSite:
+    """单个 WordPress 站点的连接配置"""
+
+    name: str
+    domain: Optional[str] = None
+    username: Optional[str] = None
+    app_password: Optional[str] = None
+
+
+def parse_wp_sites(values: Mapping[str, Optional[str]]) -> Tuple[WordPressSite, ...]:
+    """
+    解析多站点配置：WP_SITES=main,site-b 时读取 WP_MAIN_DOMAIN、WP_SITE_B_USERNAME 等，
+    未单独配置的用户名/应用密码沿用 WP_USERNAME/WP_APP_PASSWORD；
+    未配置 WP_SITES 时只有一个由 WP_DOMAIN 定义的 default 站点
+    """
+    default = WordPressSite(
+        name="default",
+        domain=values.get("WP_DOMAIN"),
+        username=values.get("WP_USERNAME"),
+        app_password=values.get("WP_APP_PASSWORD"),
+    )
+    names = [n.strip() for n in (values.get("WP_SITES") or "").split(",") if n.strip()]
+    if not names:
+        return (default,)
+
+    sites = []
+    for name in dict.fromkeys(names):
+        prefix = _site_env_prefix(name)
+        sites.append(WordPressSite(
+            name=name,
+            domain=values.get(prefix + "DOMAIN") or (default.domain if name == "default" else None),
+            username=values.get(prefix + "USERNAME") or default.username,
+            app_password=values.get(prefix + "APP_PASSWORD") or default.app_password,
+        ))
+    return tuple(sites)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """不可变配置快照，热路径只读取属性，不再解析环境变量字符串"""
+
+    wp_domain: Optional[str] = None
+    wp_username: Optional[str] = None
+    wp_app_password: Optional[str] = None
+    wp_sites: Tuple[WordPressSite, ...] = ()
+    baidu_api_key: Optional[str] = None
+    baidu_secret_key: Optional[str] = None
+    baidu_api_base: str = "https://aip.baidubce.com"
+    # 调用百度文本审核接口（按次计费）；默认关闭，审核直接返回合规
+    baidu_live_audit: bool = False
+    client_auth_token: Optional[str] = None
+    admin_user: Optional[str] = None
+    admin_pass: Optional[str] = None
+    outsource_user: Optional[str] = None
+    outsource_pass: Optional[str] = None
+    session_secret_key: str = "default-secret-key-change-this"
+    test_mode: bool = False
+    enable_ai_check: bool = True
+    secure_cookies: bool = False
+    port: int = 8004
+    log_level: str = "INFO"
+    log_levels: str = ""
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_backup_count: int = 5
+    log_per_process: bool = False
+    health_check_interval: float = 30.0
+    slow_callback_ms: float = 100.0
+    drain_timeout: float = 10.0
+    # /metrics 访问控制：Bearer 令牌，或允许的来源地址/网段
+    metrics_token: Optional[str] = None
+    metrics_allow_ips: Tuple[str, ...] = ("127.0.0.1", "::1")
+    env_file: Optional[str] = None
+
+    @classmethod
+    def from_mapping(cls, values: Mapping[str, Optional[str]], env_file: Optional[str] = None) -> "Settings":
+        """从环境变量映射构建配置快照"""
+        return cls(
+            wp_domain=values.get("WP_DOMAIN"),
+            wp_username=values.get("WP_USERNAME"),
+            wp_app_password=values.get("WP_APP_PASSWORD"),
+            wp_sites=parse_wp_sites(values),
+            baidu_api_key=values.get("BAIDU_API_KEY"),
+            baidu_secret_key=values.get("BAIDU_SECRET_KEY"),
+            baidu_api_base=(values.get("BAIDU_API_BASE") or cls.baidu_api_base).rstrip("/"),
+            baidu_live_audit=_parse_bool(values.get("BAIDU_LIVE_AUDIT"), False),
+            client_auth_token=values.get("CLIENT_AUTH_TOKEN"),
+            admin_user=values.get("ADMIN_USER"),
+            admin_pass=values.get("ADMIN_PASS"),
+            outsource_user=values.get("OUTSOURCE_USER"),
+            outsource_pass=values.get("OUTSOURCE_PASS"),
+            session_secret_key=values.get("SESSION_SECRET_KEY") or cls.session_secret_key,
+            test_mode=_parse_bool(values.get("TEST_MODE"), False),
+            enable_ai_check=_parse_bool(values.get("ENABLE_AI_CHECK"), True),
+            secure_cookies=_parse_bool(values.get("SECURE_COOKIES"), False),
+            port=_parse_int(values.get("PORT"), cls.port),
+            log_level=values.get("LOG_LEVEL") or cls.log_level,
+            log_levels=values.get("LOG_LEVELS") or "",
+            log_max_bytes=_parse_int(values.get("LOG_MAX_BYTES"), cls.log_max_bytes),
+            log_backup_count=_parse_int(values.get("LOG_BACKUP_COUNT"), cls.log_backup_count),
+            log_per_process=_parse_bool(values.get("LOG_PER_PROCESS"), False),
+            health_check_interval=_parse_float(values.get("HEALTH_CHECK_INTERVAL"), cls.health_check_interval),
+            slow_callback_ms=_parse_float(values.get("SLOW_CALLBACK_MS"), cls.slow_callback_ms),
+            drain_timeout=_parse_float(values.get("DRAIN_TIMEOUT"), cls.drain_timeout),
+            metrics_token=values.get("METRICS_TOKEN") or None,
+            metrics_allow_ips=_parse_list(values.get("METRICS_ALLOW_IPS"), cls.metrics_allow_ips),
+            env_file=env_file,
+        )
+
+
+def resolve_env_file() -> Path:
+    """返回当前生效的配置文件路径（都不存在时返回 .env）"""
+    for candidate in ENV_CANDIDATES:
+        if candidate.exists():
+            return candidate
+    return ENV_CANDIDATES[0]
+
+
+def _file_signature(path: Path) -> Optional[Tuple[str, int, int]]:
+    """用 (路径, mtime_ns, 大小) 标识文件版本，文件不存在时返回 None"""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def load_settings(env_file: Optional[Path] = None) -> Settings:
+    """
+    读取配置：.env 文件为底，进程环境变量优先（与 load_dotenv() 的默认行为一致），
+    systemd/gunicorn 中设置的密钥、TEST_MODE 等不会被 .env 中残留的旧值覆盖
+    """
+    path = env_file or resolve_env_file()
+    values: dict = {}
+    if path.exists():
+        values.update({k: v for k, v in dotenv_values(path).items() if v is not None})
+    values.update(os.environ)
+    return Settings.from_mapping(values, env_file=str(path))
+
+
+def env_overridden(keys: Iterable[str]) -> List[str]:
+    """由进程环境变量设置的配置项（修改 .env 中的这些项不会生效）"""
+    return [key for key in keys if key in os.environ]
+
+
+def _quote_env_value(value: str) -> str:
+    """与 dotenv.set_key 的默认引号规则保持一致"""
+    return "'{}'".format(value.replace("'", "\\'"))
+
+
+def write_env_file(env_file: Path, updates: Dict[str, str]) -> None:
+    """
+    一次性写入多个配置项：保留原有注释和顺序，写临时文件后 os.replace 原子替换，
+    读者（包括其他工作进程的 watch_settings）只会看到旧文件或新文件
+    """
+    path = Path(env_file)
+    lines = path.read_text(encoding="utf-8").splitlines() if path.exists() else []
+    pending = dict(updates)
+
+    for index, line in enumerate(lines):
+        match = re.match(r"^\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_]*)\s*=", line)
+        if match and match.group(1) in pending:
+            key = match.group(1)
+            lines[index] = f"{key}={_quote_env_value(pending.pop(key))}"
+
+    for key, value in pending.items():
+        lines.append(f"{key}={_quote_env_value(value)}")
+
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            os.chmod(tmp_path, path.stat().st_mode & 0o777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+# 当前快照与变更监听器（替换引用本身即为原子操作）
+_current: Optional[Settings] = None
+_signature: Optional[Tuple[str, int, int]] = None
+_listeners: List[Callable[[Settings, Settings], Any]] = []
+
+
+def get_settings() -> Settings:
+    """获取当前配置快照（首次调用时加载）"""
+    global _current, _signature
+    if _current is None:
+        path = resolve_env_file()
+        _signature = _file_signature(path)
+        _current = load_settings(path)
+    return _current
+
+
+def on_settings_change(callback: Callable[[Settings, Settings], Any]) -> Callable[[Settings, Settings], Any]:
+    """注册配置变更回调，参数为 (旧快照, 新快照)；可用作装饰器"""
+    _listeners.append(callback)
+    return callback
+
+
+def reload_settings(force: bool = False) -> bool:
+    """文件版本变化时重新加载并原子替换快照，返回是否发生了替换"""
+    global _current, _signature
+    old = get_settings()
+    path = resolve_env_file()
+    signature = _file_signature(path)
+    if not force and signature == _signature:
+        return False
+
+    new = load_settings(path)
+    _signature = signature
+    if new == old:
+        return False
+
+    _current = new
+    for callback in list(_listeners):
+        try:
+            callback(old, new)
+        except Exception as e:
+            logger.exception("配置变更回调失败: %s", e)
+    return True
+
+
+async def watch_settings(interval: float = 1.0):
+    """后台轮询 .env 的 mtime，每个工作进程各自运行，修改对所有进程生效"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            reload_settings()
+        except Exception as e:
+            logger.exception("配置重新加载失败: %s", e)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 - 发布统计汇总
+每次发布结束时按（日期, 用户, 结果, 发布类型）累加一行计数，另维护按（结果, 发布类型）的累计总数；
+/api/stats/summary 只读取这些汇总行，查询量只与天数窗口、用户数有关，不随发布历史增长
+
+统计保存在 data/publish_stats.sqlite3（WAL 模式），多个工作进程写同一个库，各页面看到的数字一致
+"""
+
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .storage import DATA_DIR, SQLiteStore
+
+STATS_DB = DATA_DIR / "publish_stats.sqlite3"
+
+# 发布结果分类（与 routes.publish_outcome、指标标签一致）
+OUTCOMES = ("success", "error", "wp_error", "audit_rejected")
+PUBLISH_TYPES = ("normal", "headline")
+
+# 按日汇总保留的天数，更早的行在每天第一次写入时清理（累计总数不受影响）
+RETENTION_DAYS = 400
+# 时间序列窗口上限（天）
+MAX_SERIES_DAYS = 90
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS publish_daily (
+    day TEXT NOT NULL,
+    username TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    publish_type TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, username, outcome, publish_type)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS publish_totals (
+    outcome TEXT NOT NULL,
+    publish_type TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (outcome, publish_type)
+) WITHOUT ROWID;
+"""
+
+
+class PublishStats(SQLiteStore):
+    """发布统计汇总"""
+
+    def __init__(self, path: Path):
+        super().__init__(path, SCHEMA)
+        self._pruned_day: Optional[date] = None
+
+    def record(self, username: str, publish_type: str, outcome: str, day: Optional[date] = None):
+        """累加一次发布（在线程池中调用，不阻塞事件循环）；未知的发布类型计入 normal，不新增汇总行"""
+        if publish_type not in PUBLISH_TYPES:
+            publish_type = "normal"
+        day_text = (day or date.today()).isoformat()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "INSERT INTO publish_daily (day, username, outcome, publish_type, count) VALUES (?, ?, ?, ?, 1) "
+                    "ON CONFLICT (day, username, outcome, publish_type) DO UPDATE SET count = count + 1",
+                    (day_text, username, outcome, publish_type)
+                )
+                conn.execute(
+                    "INSERT INTO publish_totals (outcome, publish_type, count) VALUES (?, ?, 1) "
+                    "ON CONFLICT (outcome, publish_type) DO UPDATE SET count = count + 1",
+                    (outcome, publish_type)
+                )
+                today = date.today()
+                if self._pruned_day != today:
+                    cutoff = (today - timedelta(days=RETENTION_DAYS)).isoformat()
+                    conn.execute("DELETE FROM publish_daily WHERE day < ?", (cutoff,))
+                    self._pruned_day = today
+
+    def summary(self, days: int = 7, today: Optional[date] = None) -> Dict[str, Any]:
+        """汇总：累计总数、今日、按结果/发布类型/用户的分布，以及最近 days 天的按日序列"""
+        days = max(1, min(days, MAX_SERIES_DAYS))
+        today = today or date.today()
+        start = today - timedelta(days=days - 1)
+        with self._lock:
+            conn = self._connect()
+            totals = conn.execute("SELECT outcome, publish_type, count FROM publish_totals").fetchall()
+            window = conn.execute(
+                "SELECT day, username, outcome, SUM(count) FROM publish_daily WHERE day BETWEEN ? AND ? "
+                "GROUP BY day, username, outcome",
+                (start.isoformat(), today.isoformat())
+            ).fetchall()
+
+        by_outcome = dict.fromkeys(OUTCOMES, 0)
+        by_publish_type = dict.fromkeys(PUBLISH_TYPES, 0)
+        for outcome, publish_type, count in totals:
+            by_outcome[outcome] = by_outcome.get(outcome, 0) + count
+            # 旧版本写入的未知类型计入 normal，响应中只有固定的几个键
+            by_publish_type["normal" if publish_type not in by_publish_type else publish_type] += count
+        total = sum(by_outcome.values())
+
+        labels = [(start + timedelta(days=i)).isoformat() for i in range(days)]
+        index = {day: i for i, day in enumerate(labels)}
+        series = {outcome: [0] * days for outcome in OUTCOMES}
+        users: Dict[str, Dict[str, int]] = {}
+        for day, username, outcome, count in window:
+            series.setdefault(outcome, [0] * days)[index[day]] += count
+            user = users.setdefault(username, {"total": 0, "success": 0})
+            user["total"] += count
+            if outcome == "success":
+                user["success"] += count
+
+        daily_total = [sum(counts) for counts in zip(*series.values())]
+        return {
+            "total": total,
+            "success": by_outcome["success"],
+            "success_rate": round(by_outcome["success"] * 100 / total, 1) if total else 0.0,
+            "audit_rejected": by_outcome["audit_rejected"],
+            "today": daily_total[-1],
+            "by_outcome": by_outcome,
+            "by_publish_type": by_publish_type,
+            "by_user": [
+                {"username": username, **counts}
+                for username, counts in sorted(users.items(), key=lambda item: -item[1]["total"])
+            ],
+            "series": {"days": labels, "total": daily_total, **series},
+        }
+
+
+publish_stats = PublishStats(STATS_DB)
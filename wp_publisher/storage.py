@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 - 本地 SQLite 存储
+发布统计汇总、草稿等需要在多个工作进程间共享的小量数据保存在 data/ 目录下的 SQLite 库中（WAL 模式）；
+所有读写都在线程池中执行，不阻塞事件循环
+"""
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+from .settings import BASE_DIR
+
+DATA_DIR = BASE_DIR / "data"
+
+
+class SQLiteStore:
+    """线程安全的 SQLite 连接（连接在首次使用时按进程打开，预加载 fork 后不共享连接）"""
+
+    def __init__(self, path: Path, schema: str):
+        self.path = path
+        self.schema = schema
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """在持有 self._lock 时调用"""
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # WAL 下 NORMAL 只在检查点时同步落盘，单次写入不等待 fsync
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.schema)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WordPress 软文发布中间件 - 请求追踪
+为每个请求分配请求ID，记录各阶段耗时，通过 Server-Timing 响应头返回并写入追踪日志
+"""
+
+import json
+import time
+import uuid
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+# 请求ID的请求/响应头，同时会转发给WordPress便于与插件的 error_log 对应
+REQUEST_ID_HEADER = "X-Request-ID"
+
+trace_logger = logging.getLogger("wp_publisher.trace")
+
+_current_trace: ContextVar[Optional["RequestTrace"]] = ContextVar("current_trace", default=None)
+
+
+class RequestTrace:
+    """单个请求的追踪记录"""
+
+    def __init__(self, request_id: str, method: str, path: str):
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self._last_lap = self.started
+        self.stages: List[Tuple[str, float]] = []
+
+    def lap(self, name: str):
+        """记录从上一个阶段结束（或请求开始）到现在的耗时"""
+        now = time.perf_counter()
+        self.stages.append((name, (now - self._last_lap) * 1000))
+        self._last_lap = now
+
+    @contextmanager
+    def stage(self, name: str):
+        """记录代码块的耗时；代码块之前未计入任何阶段的时间会被丢弃"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.stages.append((name, (end - start) * 1000))
+            self._last_lap = end
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self, total_ms: float) -> str:
+        """生成 Server-Timing 响应头，同名阶段（如多站点）取合计"""
+        merged = {}
+        for name, duration in self.stages:
+            merged[name] = merged.get(name, 0.0) + duration
+        parts = [f"{name};dur={duration:.1f}" for name, duration in merged.items()]
+        parts.append(f"total;dur={total_ms:.1f}")
+        return ", ".join(parts)
+
+    def to_record(self, status_code: int, total_ms: float) -> str:
+        """生成紧凑的单行JSON追踪记录；stages 按发生顺序保留每个阶段（同名阶段如多站点的 wp 各占一项）"""
+        return json.dumps({
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "rid": self.request_id,
+            "method": self.method,
+            "path": self.path,
+            "status": status_code,
+            "total_ms": round(total_ms, 1),
+            "stages": [[name, round(duration, 1)] for name, duration in self.stages],
+        }, ensure_ascii=False, separators=(",", ":"))
+
+
+def current_trace() -> Optional[RequestTrace]:
+    """当前请求的追踪记录（不在请求上下文中时为 None）"""
+    return _current_trace.get()
+
+
+def current_request_id() -> Optional[str]:
+    """当前请求ID"""
+    trace = _current_trace.get()
+    return trace.request_id if trace else None
+
+
+def lap(name: str):
+    """在当前请求上记录阶段耗时（不在请求上下文中时忽略）"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.lap(name)
+
+
+@contextmanager
+def stage(name: str):
+    """在当前请求上记录代码块耗时（不在请求上下文中时忽略）"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    with trace.stage(name):
+        yield
+
+
+async def tracing_middleware(request, call_next):
+    """分配请求ID并在响应中返回 X-Request-ID 和 Server-Timing"""
+    # 沿用上游（如Nginx）传入的请求ID，限制长度避免超长请求头被转发
+    request_id = (request.headers.get(REQUEST_ID_HEADER) or "")[:64] or uuid.uuid4().hex[:16]
+    trace = RequestTrace(request_id, request.method, request.url.path)
+    token = _current_trace.set(trace)
+    try:
+        response = await call_next(request)
+    finally:
+        _current_trace.reset(token)
+
+    total_ms = trace.total_ms()
+    response.headers[REQUEST_ID_HEADER] = request_id
+    response.headers["Server-Timing"] = trace.server_timing(total_ms)
+    trace_logger.info(trace.to_record(response.status_code, total_ms))
+    return response